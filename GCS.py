@@ -1,9 +1,28 @@
 from PyQt5.QtWidgets import QApplication
 from core.core_controller import CoreController
+from utils.data_fusion import DEFAULT_HOLD_MS
+import argparse
 import sys
 
 if __name__ == "__main__":
-    app = QApplication(sys.argv)
-    controller = CoreController()
+    parser = argparse.ArgumentParser(description="HJ GCS")
+    parser.add_argument("--replay", metavar="LOG", help="replay a recorded log (logs/*.csv, *.bin)")
+    parser.add_argument("--replay-source", default="UMB", choices=["UMB", "TLM"])
+    parser.add_argument("--speed", type=float, default=1.0, help="replay speed (1 = real time, 0 = as fast as possible)")
+    parser.add_argument("--relay", type=int, metavar="PORT", help="relay telemetry over TCP (UMB = PORT, TLM = PORT + 1)")
+    parser.add_argument("--relay-multicast", metavar="GROUP[:PORT]", help="also relay over UDP multicast")
+    parser.add_argument("--relay-command-host", metavar="HOST", help="subscriber address allowed to send commands")
+    parser.add_argument("--fusion-hold", type=float, default=DEFAULT_HOLD_MS, metavar="MS",
+                        help="hold merged UMB/TLM samples this long to fill gaps from the slower link")
+    args, qt_args = parser.parse_known_args()
+
+    app = QApplication(sys.argv[:1] + qt_args)
+    controller = CoreController(fusion_hold_ms=args.fusion_hold)
+    app.aboutToQuit.connect(controller.shutdown)
     controller.start()
+    if args.relay:
+        group, _, mport = (args.relay_multicast or "").partition(":")
+        controller.start_relay(args.relay, group or None, int(mport) if mport else None, args.relay_command_host)
+    if args.replay:
+        controller.start_replay(args.replay, args.replay_source, args.speed)
     sys.exit(app.exec_())
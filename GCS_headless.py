@@ -0,0 +1,122 @@
+from PyQt5.QtCore import QCoreApplication, QEventLoop, QTimer
+from core.core_pipeline import CorePipeline
+from utils.data_fusion import DEFAULT_HOLD_MS
+from utils.link_quality import format_link
+import argparse
+import signal
+import sys
+
+# 헤드리스 레코더: GUI 없이 수신 -> history -> 로그 파이프라인만 실행
+# 예) python GCS_headless.py --umb COM3 --tlm COM4
+#     python GCS_headless.py --replay logs/XXXXXXXX_XXXXXX_UMB.csv --speed 0 --no-log
+#     python GCS_headless.py --umb COM3 --log-compress gz --log-segment-min 10 --log-fsync 5
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="HJ GCS headless recorder")
+    parser.add_argument("--umb", metavar="PORT", help="UMB serial port (or tcp://host:port / udp://group:port of a relay)")
+    parser.add_argument("--umb-baud", type=int, default=115200)
+    parser.add_argument("--tlm", metavar="PORT", help="TLM serial port (or tcp://host:port / udp://group:port of a relay)")
+    parser.add_argument("--tlm-baud", type=int, default=115200)
+    parser.add_argument("--replay", metavar="LOG", help="replay a recorded log instead of a serial port")
+    parser.add_argument("--replay-source", default="UMB", choices=["UMB", "TLM"])
+    parser.add_argument("--speed", type=float, default=1.0, help="replay speed (1 = real time, 0 = as fast as possible)")
+    parser.add_argument("--sequence", metavar="SEQ", help="run a timed sequence script on the UMB link after start")
+    parser.add_argument("--fusion-hold", type=float, default=DEFAULT_HOLD_MS, metavar="MS",
+                        help="hold merged UMB/TLM samples this long to fill gaps from the slower link")
+    parser.add_argument("--log-format", default="csv", choices=["csv", "bin"])
+    parser.add_argument("--no-log", action="store_true", help="do not write log files")
+    parser.add_argument("--log-compress", default="none", choices=["none", "gz", "zst"],
+                        help="stream-compress log files (zst needs the zstandard package)")
+    parser.add_argument("--log-segment-mb", type=float, default=0, help="start a new log segment after N MB (0 = off)")
+    parser.add_argument("--log-segment-min", type=float, default=0, help="start a new log segment after N minutes (0 = off)")
+    parser.add_argument("--log-flush", type=float, default=1.0, metavar="SEC", help="log flush interval (0 = every batch)")
+    parser.add_argument("--log-fsync", type=float, default=None, metavar="SEC",
+                        help="fsync log files at this interval (0 = every flush, default = never)")
+    parser.add_argument("--log-index-rows", type=int, default=1000, metavar="N",
+                        help="write a sidecar seek/event index with a checkpoint every N rows (0 = off)")
+    parser.add_argument("--duration", type=float, default=0, help="stop after N seconds (0 = run until Ctrl+C)")
+    parser.add_argument("--status-interval", type=float, default=5, help="status print interval in seconds")
+    parser.add_argument("--latency-dump", metavar="JSON", help="write per-stage latency histograms to this file on exit")
+    parser.add_argument("--relay", type=int, metavar="PORT", help="relay telemetry over TCP (UMB = PORT, TLM = PORT + 1)")
+    parser.add_argument("--relay-multicast", metavar="GROUP[:PORT]", help="also relay over UDP multicast")
+    parser.add_argument("--relay-command-host", metavar="HOST", help="subscriber address allowed to send commands")
+    args, qt_args = parser.parse_known_args()
+
+    app = QCoreApplication(sys.argv[:1] + qt_args)
+    log_options = {
+        "compression": None if args.log_compress == "none" else args.log_compress,
+        "segment_bytes": int(args.log_segment_mb * 1e6) or None,
+        "segment_seconds": args.log_segment_min * 60 or None,
+        "flush_interval": args.log_flush,
+        "fsync_interval": args.log_fsync,
+        "index_every": args.log_index_rows or None,
+    }
+    try:
+        pipeline = CorePipeline(log_format=args.log_format, fusion_hold_ms=args.fusion_hold, log_options=log_options)
+    except ValueError as e:
+        sys.exit(str(e))
+    app.aboutToQuit.connect(pipeline.shutdown)
+
+    if args.umb and not pipeline.umb_handler.connect_serial(args.umb, args.umb_baud):
+        sys.exit(1)
+    if args.tlm and not pipeline.tlm_handler.connect_serial(args.tlm, args.tlm_baud):
+        sys.exit(1)
+    # tcp:// / udp:// 소스는 비동기로 연결되므로 결과를 기다림 (TCP는 최대 TCP_CONNECT_TIMEOUT_MS)
+    for handler in (pipeline.umb_handler, pipeline.tlm_handler):
+        if handler.connecting:
+            loop = QEventLoop()
+            handler.connect_finished.connect(loop.quit)
+            loop.exec_()
+            if not handler.serial_connected:
+                pipeline.shutdown()
+                sys.exit(1)
+    if args.relay:
+        group, _, mport = (args.relay_multicast or "").partition(":")
+        if not pipeline.start_relay(args.relay, group or None, int(mport) if mport else None, args.relay_command_host):
+            sys.exit(1)
+    if args.replay:
+        replay = pipeline.start_replay(args.replay, args.replay_source, args.speed)
+        replay.finished.connect(app.quit)
+
+    if not pipeline.connected_sources():
+        parser.error("no source given (use --umb, --tlm or --replay)")
+
+    if not args.no_log:
+        pipeline.start_logging()
+
+    if args.sequence:
+        if not pipeline.umb_handler.serial_connected:
+            parser.error("--sequence needs --umb")
+        # 텔레메트리 수신(프로토콜 감지)이 시작된 뒤 실행
+        QTimer.singleShot(500, lambda: pipeline.start_sequence(args.sequence, 'UMB'))
+
+    def print_status():
+        parts = []
+        for source, history in (('UMB', pipeline.umb_data_history), ('TLM', pipeline.tlm_data_history)):
+            handler = pipeline.umb_handler if source == 'UMB' else pipeline.tlm_handler
+            parts.append(f"{source}: {history.total} pkts, {handler.rate:.1f} Hz")
+            if handler.link:
+                parts.append(f"{source} link: {format_link(handler.link)}")
+        if len(pipeline.connected_sources()) > 1:
+            parts.append(f"fusion: {pipeline.fusion.stats()}")
+        if pipeline.log_handler.is_logging:
+            parts.append(f"log dropped: {pipeline.log_handler.dropped}")
+        pipeline._append_debug_message("[STATUS] " + " | ".join(parts))
+
+    status_timer = QTimer()
+    status_timer.timeout.connect(print_status)
+    status_timer.start(int(args.status_interval * 1000))
+
+    if args.duration > 0:
+        QTimer.singleShot(int(args.duration * 1000), app.quit)
+
+    # Ctrl+C로 종료 (Qt 이벤트 루프 중에도 파이썬 시그널 핸들러가 돌도록 주기적으로 깨움)
+    signal.signal(signal.SIGINT, lambda *_: app.quit())
+    wake_timer = QTimer()
+    wake_timer.timeout.connect(lambda: None)
+    wake_timer.start(200)
+
+    app.aboutToQuit.connect(print_status)
+    if args.latency_dump:
+        app.aboutToQuit.connect(lambda: pipeline.latency.dump(args.latency_dump))
+    sys.exit(app.exec_())
@@ -0,0 +1,283 @@
+from PyQt5.QtCore import QCoreApplication, QTimer
+from datetime import datetime
+import argparse
+import json
+import os
+import platform
+import sys
+import tempfile
+import threading
+import time
+import numpy as np
+
+from bench.telemetry_gen import TelemetryGenerator, burst_boot_times, burst_schedule, encode
+from core.core_pipeline import CorePipeline
+
+# 수신 -> 디코딩 -> 컨트롤러 -> 로그 파이프라인 처리량/지연 벤치마크
+# 예) python -m bench.bench_pipeline --mode inproc --rate 0 --duration 5
+#     python -m bench.bench_pipeline --mode pty --protocol binary --rate 2000 --burst 20 --output bench_output.json
+
+BENCH_VERSION = 1
+
+
+def percentiles(samples) -> dict:
+    """지연 샘플(초)을 ms 단위 p50/p95/p99/max로 요약"""
+    if len(samples) == 0:
+        return {"count": 0, "p50": None, "p95": None, "p99": None, "max": None}
+    a = np.asarray(samples) * 1000.0
+    p50, p95, p99 = np.percentile(a, [50, 95, 99])
+    return {"count": len(a), "p50": round(p50, 4), "p95": round(p95, 4),
+            "p99": round(p99, 4), "max": round(float(a.max()), 4)}
+
+
+def rss_kb():
+    """현재 프로세스 최대 RSS (KB), 지원하지 않는 플랫폼이면 None"""
+    try:
+        import resource
+    except ImportError:
+        return None
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return rss // 1024 if sys.platform == "darwin" else rss
+
+
+class BenchPipeline(CorePipeline):
+    """단계별 시간을 기록하는 CorePipeline"""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.t0 = time.monotonic()
+        self.received = 0
+        self.dispatch_times = []
+        self.e2e_latency = []
+        self.log_latency = []
+        self.debug_lines = 0
+
+        # 로그 writer: 수신 시각 -> 파일 기록 완료까지의 지연
+        log_write = self.log_handler._write
+
+        def timed_write(source, rows, timestamp, widen=False):
+            log_write(source, rows, timestamp, widen)
+            self.log_latency.append((time.time_ns() - timestamp) / 1e9)
+        self.log_handler._write = timed_write
+
+    def on_batch_received(self, rows, arrival_ns, source, decoded_ns=None, widen=False):
+        start = time.monotonic()
+        super().on_batch_received(rows, arrival_ns, source, decoded_ns, widen)
+        end = time.monotonic()
+        self.dispatch_times.append(end - start)
+        self.received += len(rows)
+        # boot_time에 샘플링 시각(ms, t0 기준)을 넣어두었으므로 종단 지연 계산 가능 (burst 대기 시간 포함)
+        sent = self.t0 + rows[:, 0] / 1000.0
+        self.e2e_latency.extend((end - sent).tolist())
+
+    def _append_debug_message(self, line):
+        self.debug_lines += 1
+
+
+class StandInPort:
+    """QSerialPort 대신 사용하는 메모리 버퍼 (in-process 모드)"""
+
+    def __init__(self):
+        self.data = b""
+
+    def readAll(self):
+        data, self.data = self.data, b""
+        return data
+
+    def isOpen(self):
+        return True
+
+    def close(self):
+        pass
+
+    def deleteLater(self):
+        pass
+
+
+def run_inproc(args, log_dir):
+    """같은 스레드에서 바이트를 직접 밀어 넣어 디코딩/디스패치/로그 비용을 측정"""
+    pipeline = BenchPipeline(log_format=args.log_format, threaded=False)
+    pipeline.log_handler.log_dir = log_dir
+    handler = pipeline.umb_handler
+    worker = handler.worker
+    worker.serial_port = StandInPort()
+    worker.serial_connected = True
+    worker.protocol = args.protocol
+    handler.serial_connected = True
+    if not args.no_log:
+        pipeline.log_handler.start_logging(['UMB'])
+
+    gen = TelemetryGenerator(seed=args.seed)
+    rate = args.rate if args.rate > 0 else 1000.0
+    schedule = burst_schedule(rate, args.duration, args.burst)
+    decode_times = []
+    busy = 0.0
+    sent = 0
+
+    rss_before = rss_kb()
+    start = time.monotonic()
+    for offset, n in schedule:
+        if args.rate > 0:
+            delay = start + offset - time.monotonic()
+            if delay > 0:
+                time.sleep(delay)
+        now_ms = (time.monotonic() - pipeline.t0) * 1000.0
+        rows = gen.rows(n, boot_times=burst_boot_times(now_ms, n, 1000.0 / rate))
+        worker.serial_port.data = encode(rows, args.protocol)
+        sent += n
+
+        n_dispatch = len(pipeline.dispatch_times)
+        t = time.monotonic()
+        worker._handle_ready_read()
+        elapsed = time.monotonic() - t
+        busy += elapsed
+        # decode 시간 = readyRead 처리 전체 - 그 안에서 호출된 dispatch 시간
+        decode_times.append(elapsed - sum(pipeline.dispatch_times[n_dispatch:]))
+    elapsed = time.monotonic() - start
+
+    log_drain = _stop_logging(pipeline, args)
+    result = _result(args, pipeline, sent, elapsed, log_drain, rss_before, decode=decode_times)
+    # 합성 데이터 생성 시간을 제외한 순수 처리 시간 기준 처리량
+    result["busy_s"] = round(busy, 4)
+    result["capacity_pps"] = round(pipeline.received / busy, 1) if busy > 0 else None
+    return result
+
+
+def run_pty(args, log_dir):
+    """의사 터미널(pty)로 실제 QSerialPort + 수신 스레드 경로를 측정 (Linux/macOS)"""
+    import pty
+    import tty
+
+    app = QCoreApplication.instance()
+    master, slave = pty.openpty()
+    tty.setraw(slave)
+    port_name = os.ttyname(slave)
+
+    pipeline = BenchPipeline(log_format=args.log_format, threaded=True)
+    pipeline.log_handler.log_dir = log_dir
+    if not pipeline.umb_handler.connect_serial(port_name, 921600):
+        raise RuntimeError(f"Failed to open {port_name}")
+    if not args.no_log:
+        pipeline.log_handler.start_logging(['UMB'])
+
+    gen = TelemetryGenerator(seed=args.seed)
+    rate = args.rate if args.rate > 0 else 1000.0
+    schedule = burst_schedule(rate, args.duration, args.burst)
+    state = {"sent": 0, "elapsed": 0.0}
+
+    def writer():
+        start = time.monotonic()
+        for offset, n in schedule:
+            if args.rate > 0:
+                delay = start + offset - time.monotonic()
+                if delay > 0:
+                    time.sleep(delay)
+            now_ms = (time.monotonic() - pipeline.t0) * 1000.0
+            data = encode(gen.rows(n, boot_times=burst_boot_times(now_ms, n, 1000.0 / rate)), args.protocol)
+            view = memoryview(data)
+            while view:
+                written = os.write(master, view)
+                view = view[written:]
+            state["sent"] += n
+        state["elapsed"] = time.monotonic() - start
+
+    rss_before = rss_kb()
+    thread = threading.Thread(target=writer, daemon=True)
+    thread.start()
+
+    def check_done():
+        if thread.is_alive():
+            return
+        # 송신이 끝난 뒤 남은 데이터가 처리될 때까지 잠시 대기
+        if pipeline.received >= state["sent"] or time.monotonic() - pipeline.t0 > args.duration + 5:
+            app.quit()
+
+    timer = QTimer()
+    timer.timeout.connect(check_done)
+    timer.start(50)
+    app.exec_()
+
+    log_drain = _stop_logging(pipeline, args)
+    pipeline.shutdown()
+    os.close(master)
+    os.close(slave)
+    return _result(args, pipeline, state["sent"], state["elapsed"], log_drain, rss_before)
+
+
+def _stop_logging(pipeline, args):
+    if args.no_log:
+        return None
+    start = time.monotonic()
+    pipeline.log_handler.stop_logging()
+    return time.monotonic() - start
+
+
+def _result(args, pipeline, sent, elapsed, log_drain, rss_before, decode=None):
+    rss_after = rss_kb()
+    latency = {
+        "dispatch": percentiles(pipeline.dispatch_times),
+        "end_to_end": percentiles(pipeline.e2e_latency),
+        "log_write": percentiles(pipeline.log_latency),
+    }
+    if decode is not None:
+        latency["decode"] = percentiles(decode)
+    return {
+        "bench_version": BENCH_VERSION,
+        "timestamp": datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "platform": platform.platform(),
+        "config": {
+            "mode": args.mode,
+            "protocol": args.protocol,
+            "rate_hz": args.rate,
+            "burst": args.burst,
+            "duration_s": args.duration,
+            "log_format": None if args.no_log else args.log_format,
+        },
+        "packets_sent": sent,
+        "packets_received": pipeline.received,
+        "packets_dropped": sent - pipeline.received,
+        "log_dropped": pipeline.log_handler.dropped,
+        "debug_messages": pipeline.debug_lines,
+        "elapsed_s": round(elapsed, 4),
+        "throughput_pps": round(pipeline.received / elapsed, 1) if elapsed > 0 else None,
+        "log_drain_s": None if log_drain is None else round(log_drain, 4),
+        "latency_ms": latency,
+        "stage_latency_ms": pipeline.latency.summary(),
+        "max_rss_kb": rss_after,
+        "max_rss_growth_kb": None if rss_before is None else rss_after - rss_before,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="HJ GCS pipeline benchmark")
+    parser.add_argument("--mode", default="inproc", choices=["inproc", "pty"])
+    parser.add_argument("--protocol", default="csv", choices=["csv", "binary"])
+    parser.add_argument("--rate", type=float, default=0, help="packets/s (0 = as fast as possible, inproc only)")
+    parser.add_argument("--burst", type=int, default=10, help="packets per write")
+    parser.add_argument("--duration", type=float, default=5.0, help="seconds of generated telemetry")
+    parser.add_argument("--log-format", default="csv", choices=["csv", "bin"])
+    parser.add_argument("--no-log", action="store_true")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", help="write JSON result to this file (default: stdout)")
+    args = parser.parse_args()
+
+    if args.mode == "pty" and args.rate <= 0:
+        parser.error("--mode pty needs --rate > 0")
+
+    app = QCoreApplication(sys.argv[:1])
+    with tempfile.TemporaryDirectory() as log_dir:
+        run = run_inproc if args.mode == "inproc" else run_pty
+        result = run(args, log_dir)
+
+    text = json.dumps(result, indent=2)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(text + "\n")
+    else:
+        print(text)
+
+
+if __name__ == "__main__":
+    main()
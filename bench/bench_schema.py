@@ -0,0 +1,162 @@
+from datetime import datetime
+import argparse
+import json
+import platform
+import sys
+import timeit
+import numpy as np
+
+from bench.telemetry_gen import TelemetryGenerator, encode
+from utils.data_types import DataVehicle, CSV_FIELD_COUNT, CSV_FIELD_SLICES, parse_csv_to_vehicle, vehicle_from_row
+from utils.clock import format_wall_ns, now_ns, to_wall_ns
+from utils.log_format import format_csv_rows
+from utils.telemetry_schema import FIELDS
+
+# 현재 디코더/스키마에서 생성한 로그 행 구성 함수와 이전 수작업 구현, 스키마를 매번 해석하는 구현 비교
+# 예) python -m bench.bench_schema
+#     python -m bench.bench_schema --rows 20000 --repeat 7 --output schema.json
+
+BENCH_VERSION = 1
+
+
+# ===== 이전 수작업 구현 (기본 스키마 기준, 비교용) =====
+def handwritten_vehicle_from_row(row: np.ndarray) -> DataVehicle:
+    values = row.tolist()
+    return DataVehicle(
+        boot_time = int(values[0]),
+        temp      = values[1],
+        voltage   = values[2],
+        sv        = [int(x) for x in values[3:11]],
+        mv        = values[11:15],
+        va        = values[15:23],
+        tc        = values[23:29],
+        ir        = values[29],
+        ip        = values[30],
+        iy        = values[31],
+        fault     = [int(x) for x in values[32:37]]
+    )
+
+
+def handwritten_parse_line(line: str) -> DataVehicle:
+    parts = line.strip().split(',')
+    return DataVehicle(
+        boot_time = int(parts[0]),
+        temp      = float(parts[1]),
+        voltage   = float(parts[2]),
+        sv        = [int(x) for x in parts[3:11]],
+        mv        = [float(x) for x in parts[11:15]],
+        va        = [float(x) for x in parts[15:23]],
+        tc        = [float(x) for x in parts[23:29]],
+        ir        = float(parts[29]),
+        ip        = float(parts[30]),
+        iy        = float(parts[31]),
+        fault     = [int(x) for x in parts[32:37]]
+    )
+
+
+def handwritten_format_rows(rows: np.ndarray, timestamp: float) -> list:
+    floats = rows.tolist()
+    ints = rows.astype(np.int64).tolist()
+    ts = format_wall_ns(timestamp)
+    return [[ts] + i[0:1] + f[1:3] + i[3:11] + f[11:32] + i[32:37] for f, i in zip(floats, ints)]
+
+
+# ===== 스키마를 패킷마다 해석하는 구현 (코드 생성 없이 스키마만 도입했을 때) =====
+def interpreted_vehicle_from_row(row: np.ndarray) -> DataVehicle:
+    values = row.tolist()
+    kwargs = {}
+    for item in FIELDS:
+        col = CSV_FIELD_SLICES[item.name]
+        value = values[col]
+        if item.kind == "int":
+            value = [int(x) for x in value] if item.count > 1 else int(value)
+        kwargs[item.name] = value
+    return DataVehicle(**kwargs)
+
+
+def interpreted_format_rows(rows: np.ndarray, timestamp: float) -> list:
+    floats = rows.tolist()
+    ints = rows.astype(np.int64).tolist()
+    ts = format_wall_ns(timestamp)
+    result = []
+    for f, i in zip(floats, ints):
+        row = [ts]
+        for item in FIELDS:
+            col = CSV_FIELD_SLICES[item.name]
+            src = i if item.kind == "int" else f
+            if item.count == 1:
+                row.append(src[col])
+            else:
+                row.extend(src[col])
+        result.append(row)
+    return result
+
+
+def best_us(func, n: int, repeat: int) -> float:
+    """한 번 호출(=n행 처리)의 최소 시간을 행당 µs로"""
+    return round(min(timeit.repeat(func, number=1, repeat=repeat)) / n * 1e6, 4)
+
+
+def run(args) -> dict:
+    rows = TelemetryGenerator(seed=args.seed).rows(args.rows)
+    lines = encode(rows, "csv").decode().splitlines()
+    timestamp = to_wall_ns(now_ns())
+
+    # 같은 결과를 내는지 먼저 확인
+    same = (
+        all(vehicle_from_row(r) == handwritten_vehicle_from_row(r) == interpreted_vehicle_from_row(r) for r in rows[:100])
+        and all(parse_csv_to_vehicle(line, "UMB").data == handwritten_parse_line(line) for line in lines[:100])
+        and format_csv_rows(rows, timestamp) == handwritten_format_rows(rows, timestamp)
+        == interpreted_format_rows(rows, timestamp)
+    )
+
+    n, repeat = len(rows), args.repeat
+    result = {
+        "vehicle_from_row_us": {
+            "current": best_us(lambda: [vehicle_from_row(r) for r in rows], n, repeat),
+            "handwritten": best_us(lambda: [handwritten_vehicle_from_row(r) for r in rows], n, repeat),
+            "interpreted": best_us(lambda: [interpreted_vehicle_from_row(r) for r in rows], n, repeat),
+        },
+        "parse_line_us": {
+            "current": best_us(lambda: [parse_csv_to_vehicle(line, "UMB") for line in lines], n, repeat),
+            "handwritten": best_us(lambda: [handwritten_parse_line(line) for line in lines], n, repeat),
+        },
+        "format_csv_row_us": {
+            "generated": best_us(lambda: format_csv_rows(rows, timestamp), n, repeat),
+            "handwritten": best_us(lambda: handwritten_format_rows(rows, timestamp), n, repeat),
+            "interpreted": best_us(lambda: interpreted_format_rows(rows, timestamp), n, repeat),
+        },
+    }
+    return {
+        "bench_version": BENCH_VERSION,
+        "timestamp": datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "platform": platform.platform(),
+        "config": {"rows": n, "repeat": repeat, "fields": CSV_FIELD_COUNT},
+        "same_output": bool(same),
+        **result,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="HJ GCS schema-generated codec benchmark")
+    parser.add_argument("--rows", type=int, default=10000)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", help="write JSON result to this file (default: stdout)")
+    args = parser.parse_args()
+
+    if CSV_FIELD_COUNT != 37:
+        sys.exit("bench_schema compares against the original 37-column layout (disable optional fields)")
+
+    text = json.dumps(run(args), indent=2)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(text + "\n")
+    else:
+        print(text)
+
+
+if __name__ == "__main__":
+    main()
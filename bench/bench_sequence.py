@@ -0,0 +1,94 @@
+from PyQt5.QtCore import QCoreApplication, QTimer
+import argparse
+import json
+import sys
+import tempfile
+
+from bench.sim_vehicle import SimulatedVehicle
+from core.core_pipeline import CorePipeline
+
+# 시퀀스 타이밍 확인: 모의 기체(pty)에 연결해 시퀀스를 실행하고 계획/전송/기체 수신 시각을 비교
+# 예) python -m bench.bench_sequence sequences/example.seq
+#     python -m bench.bench_sequence sequences/example.seq --protocol binary --period 5 --output seq.json
+
+
+def run(args, log_dir):
+    app = QCoreApplication.instance()
+    vehicle = SimulatedVehicle(period_ms=args.period, protocol=args.protocol, seed=args.seed)
+    vehicle.start()
+
+    pipeline = CorePipeline(threaded=True)
+    pipeline.log_handler.log_dir = log_dir
+    if not pipeline.umb_handler.connect_serial(vehicle.port_name, 921600):
+        raise RuntimeError(f"Failed to open {vehicle.port_name}")
+
+    state = {"sequence": None}
+
+    def start():
+        state["sequence"] = pipeline.start_sequence(args.sequence, 'UMB')
+        if state["sequence"] is None:
+            app.quit()
+            return
+        state["sequence"].finished.connect(lambda status: QTimer.singleShot(200, app.quit))
+
+    # 프로토콜 감지/열 모델 초기화를 위해 잠시 텔레메트리를 받은 뒤 시작
+    QTimer.singleShot(int(args.warmup * 1000), start)
+    QTimer.singleShot(int(args.timeout * 1000), app.quit)
+    app.exec_()
+
+    sequence = state["sequence"]
+    pipeline.shutdown()
+    vehicle.stop()
+    if sequence is None:
+        raise RuntimeError(f"Failed to start {args.sequence}")
+
+    # 기체 수신 시각을 전송 순서대로 매칭 (T0 기준 초)
+    received = iter(vehicle.received)
+    records = []
+    for record in sequence.records:
+        record = dict(record)
+        if not record["action"].startswith("HOLD"):
+            arrival = next(received, None)
+            record["vehicle_s"] = None if arrival is None else arrival[0] - sequence.t0
+            record["vehicle_command"] = None if arrival is None else arrival[1]
+        records.append(record)
+
+    delays = [r["vehicle_s"] - r["sent_s"] for r in records
+              if r.get("vehicle_s") is not None and r["sent_s"] is not None]
+    return {
+        "sequence": args.sequence,
+        "config": {"protocol": args.protocol, "period_ms": args.period},
+        "summary": sequence.summary(),
+        "link_delay_ms": {
+            "max": max(delays) * 1000.0 if delays else None,
+            "mean": sum(delays) / len(delays) * 1000.0 if delays else None,
+        },
+        "records": records,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="HJ GCS sequence timing check against a simulated vehicle")
+    parser.add_argument("sequence", help="sequence script (*.seq)")
+    parser.add_argument("--protocol", default="csv", choices=["csv", "binary"])
+    parser.add_argument("--period", type=float, default=10.0, help="telemetry period of the simulated vehicle (ms)")
+    parser.add_argument("--warmup", type=float, default=0.5, help="seconds of telemetry before starting")
+    parser.add_argument("--timeout", type=float, default=60.0)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", help="write JSON result to this file (default: stdout)")
+    args = parser.parse_args()
+
+    app = QCoreApplication(sys.argv[:1])
+    with tempfile.TemporaryDirectory() as log_dir:
+        result = run(args, log_dir)
+
+    text = json.dumps(result, indent=2)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(text + "\n")
+    else:
+        print(text)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,130 @@
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import List
+import argparse
+import gc
+import json
+import platform
+import sys
+import timeit
+import tracemalloc
+import numpy as np
+
+from bench.telemetry_gen import TelemetryGenerator
+from utils.data_types import CSV_FIELD_COUNT, vehicle_from_row
+
+# DataVehicle 메모리/할당 벤치마크: 이전 dataclass(필드별 리스트) 표현과 현재 __slots__ + 배열 표현 비교
+# 예) python -m bench.bench_vehicle
+#     python -m bench.bench_vehicle --count 100000 --output vehicle.json
+
+BENCH_VERSION = 1
+
+
+# ===== 이전 표현 (비교용) =====
+@dataclass
+class LegacyDataVehicle:
+    boot_time: int = 0
+    temp:      float = 0.0
+    voltage:   float = 0.0
+
+    sv: List[int]   = field(default_factory=lambda: [-1]   * 8)
+    mv: List[float] = field(default_factory=lambda: [-1.0] * 4)
+    va: List[float] = field(default_factory=lambda: [-1.0] * 8)
+    tc: List[float] = field(default_factory=lambda: [-1.0] * 6)
+
+    ir: float = 0.0
+    ip: float = 0.0
+    iy: float = 0.0
+
+    fault: List[int] = field(default_factory=lambda: [-1] * 5)
+
+
+def legacy_vehicle_from_row(row: np.ndarray) -> LegacyDataVehicle:
+    values = row.tolist()
+    return LegacyDataVehicle(
+        boot_time = int(values[0]),
+        temp      = values[1],
+        voltage   = values[2],
+        sv        = [int(x) for x in values[3:11]],
+        mv        = values[11:15],
+        va        = values[15:23],
+        tc        = values[23:29],
+        ir        = values[29],
+        ip        = values[30],
+        iy        = values[31],
+        fault     = [int(x) for x in values[32:37]]
+    )
+
+
+def retained(convert, rows) -> dict:
+    """rows 전체를 변환해 보관할 때 패킷당 남는 메모리(bytes)와 할당 블록 수"""
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.take_snapshot()
+    kept = [convert(row) for row in rows]
+    after = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+
+    stats = after.compare_to(before, "filename")
+    size = sum(stat.size_diff for stat in stats)
+    blocks = sum(stat.count_diff for stat in stats)
+    # 결과를 담는 리스트 자체(포인터 배열)는 제외
+    size -= sys.getsizeof(kept)
+    blocks -= 1
+    n = len(kept)
+    return {"bytes_per_packet": round(size / n, 1), "blocks_per_packet": round(blocks / n, 2)}
+
+
+def run(args) -> dict:
+    rows = TelemetryGenerator(seed=args.seed).rows(args.count)
+    n, repeat = len(rows), args.repeat
+
+    def best_us(func, number=n):
+        return round(min(timeit.repeat(func, number=1, repeat=repeat)) / number * 1e6, 4)
+
+    result = {}
+    for name, convert in (("legacy", legacy_vehicle_from_row), ("compact", vehicle_from_row)):
+        sample = convert(rows[-1])
+        result[name] = {
+            **retained(convert, rows),
+            "construct_us": best_us(lambda: [convert(row) for row in rows]),
+            # 화면 갱신에서 쓰는 접근 (라벨: va/tc 채널, 상태: 스칼라)
+            "read_va3_us": best_us(lambda: [sample.va[3] for _ in range(n)]),
+            "read_ir_us": best_us(lambda: [sample.ir for _ in range(n)]),
+        }
+
+    legacy, compact = result["legacy"], result["compact"]
+    return {
+        "bench_version": BENCH_VERSION,
+        "timestamp": datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "platform": platform.platform(),
+        "config": {"count": n, "repeat": repeat, "fields": CSV_FIELD_COUNT},
+        **result,
+        "memory_ratio": round(legacy["bytes_per_packet"] / compact["bytes_per_packet"], 2),
+        "blocks_ratio": round(legacy["blocks_per_packet"] / compact["blocks_per_packet"], 2),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="HJ GCS DataVehicle memory/allocation benchmark")
+    parser.add_argument("--count", type=int, default=20000, help="packets to convert and keep")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", help="write JSON result to this file (default: stdout)")
+    args = parser.parse_args()
+
+    if CSV_FIELD_COUNT != 37:
+        sys.exit("bench_vehicle compares against the original 37-column layout (disable optional fields)")
+
+    text = json.dumps(run(args), indent=2)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(text + "\n")
+    else:
+        print(text)
+
+
+if __name__ == "__main__":
+    main()
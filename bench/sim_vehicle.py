@@ -0,0 +1,108 @@
+import os
+import re
+import threading
+import time
+import numpy as np
+
+from bench.telemetry_gen import TelemetryGenerator, encode
+from utils.data_types import CSV_FIELD_SLICES
+
+_COMMAND_RE = re.compile(rb":(SV|MV|SEQ);([^#]*)#")
+
+
+class SimulatedVehicle:
+    """
+    하드웨어 없이 명령/시퀀스 타이밍을 확인하기 위한 모의 기체 (Linux/macOS pty)
+    - port_name으로 GCS가 연결하면 period_ms 주기로 텔레메트리 송신 (protocol: "csv" / "binary")
+    - :SV;idx;val# / :MV;idx;val# 명령을 받으면 밸브 상태를 바꿔 다음 텔레메트리에 반영
+    - 간단한 열 모델: SV1이 열려 있으면 TC1이 tc_rate[/s]로 상승, 닫히면 하강 (HOLD 조건 시험용)
+    - 받은 명령은 (수신 monotonic 시각, 명령 문자열)로 received에 기록
+    """
+
+    def __init__(self, period_ms: float = 10.0, protocol: str = "csv", seed: int = 0, tc_rate: float = 400.0):
+        import pty
+        import tty
+
+        self.master, self.slave = pty.openpty()
+        tty.setraw(self.slave)
+        self.port_name = os.ttyname(self.slave)
+        self.period_ms = period_ms
+        self.protocol = protocol
+        self.tc_rate = tc_rate
+
+        self.gen = TelemetryGenerator(seed=seed, period_ms=period_ms)
+        self.sv = np.zeros(8)
+        self.mv = np.zeros(4)
+        self.tc1 = 600.0
+        self.received = []
+
+        self._stop = threading.Event()
+        self._threads = []
+
+    def start(self):
+        for target in (self._rx_loop, self._tx_loop):
+            thread = threading.Thread(target=target, daemon=True)
+            thread.start()
+            self._threads.append(thread)
+
+    def stop(self):
+        self._stop.set()
+        for thread in self._threads:
+            thread.join(1.0)
+        os.close(self.master)
+        os.close(self.slave)
+
+    def _rx_loop(self):
+        import select
+
+        buffer = b""
+        while not self._stop.is_set():
+            ready, _, _ = select.select([self.master], [], [], 0.05)
+            if not ready:
+                continue
+            try:
+                data = os.read(self.master, 4096)
+            except OSError:
+                return
+            now = time.monotonic()
+            buffer += data
+            end = 0
+            for match in _COMMAND_RE.finditer(buffer):
+                self._apply(match.group(1).decode(), match.group(2).decode())
+                self.received.append((now, match.group(0).decode()))
+                end = match.end()
+            buffer = buffer[end:]
+
+    def _apply(self, kind: str, args: str):
+        fields = args.split(";")
+        try:
+            if kind == "SV":
+                self.sv[int(fields[0])] = int(fields[1])
+            elif kind == "MV":
+                self.mv[int(fields[0])] = float(fields[1])
+        except (ValueError, IndexError):
+            pass
+
+    def _tx_loop(self):
+        period = self.period_ms / 1000.0
+        start = time.monotonic()
+        sent = 0
+        while not self._stop.is_set():
+            due = start + sent * period
+            delay = due - time.monotonic()
+            if delay > 0:
+                time.sleep(delay)
+
+            target = 1100.0 if self.sv[0] else 600.0
+            step = self.tc_rate * period
+            self.tc1 = min(self.tc1 + step, target) if self.tc1 < target else max(self.tc1 - step, target)
+
+            rows = self.gen.rows(1)
+            rows[:, CSV_FIELD_SLICES["sv"]] = self.sv
+            rows[:, CSV_FIELD_SLICES["mv"]] = self.mv
+            rows[:, CSV_FIELD_SLICES["tc"].start] = round(self.tc1)
+            try:
+                os.write(self.master, encode(rows, self.protocol))
+            except OSError:
+                return
+            sent += 1
@@ -0,0 +1,91 @@
+import numpy as np
+
+from utils.data_types import CSV_FIELD_COUNT, CSV_FIELD_SLICES
+from utils.protocol_binary import encode_rows
+from utils.telemetry_schema import INT_COLUMNS
+
+
+class TelemetryGenerator:
+    """
+    벤치마크/시뮬레이션용 합성 텔레메트리 생성기
+    - 실제 로그와 비슷한 값 분포 (VA: ADC count + 노이즈, TC: 600~1100, 밸브는 가끔 토글)
+    - boot_time은 start_boot_time부터 period_ms 간격으로 증가
+    """
+
+    def __init__(self, seed: int = 0, period_ms: float = 10.0, start_boot_time: int = 0):
+        self.rng = np.random.default_rng(seed)
+        self.period_ms = period_ms
+        self.boot_time = float(start_boot_time)
+        self.sv = np.zeros(8, dtype=np.int64)
+        self.mv = np.zeros(4)
+        self.va_base = self.rng.uniform(0, 400, 8)
+        self.tc_base = self.rng.uniform(600, 1100, 6)
+
+    def rows(self, n: int, boot_times=None) -> np.ndarray:
+        """n개 패킷을 (n, CSV_FIELD_COUNT) 배열로 생성"""
+        rows = np.zeros((n, CSV_FIELD_COUNT), dtype=np.float64)
+        if boot_times is None:
+            boot_times = self.boot_time + np.arange(n) * self.period_ms
+            self.boot_time += n * self.period_ms
+        rows[:, CSV_FIELD_SLICES["boot_time"]] = np.floor(boot_times)
+        rows[:, CSV_FIELD_SLICES["temp"]] = np.round(25 + self.rng.normal(0, 0.2, n), 2)
+        rows[:, CSV_FIELD_SLICES["voltage"]] = np.round(12 + self.rng.normal(0, 0.05, n), 2)
+
+        # 밸브: 배치마다 낮은 확률로 하나씩 토글
+        if self.rng.random() < 0.05:
+            self.sv[self.rng.integers(8)] ^= 1
+        if self.rng.random() < 0.02:
+            idx = self.rng.integers(4)
+            self.mv[idx] = 180 - self.mv[idx]
+        rows[:, CSV_FIELD_SLICES["sv"]] = self.sv
+        rows[:, CSV_FIELD_SLICES["mv"]] = self.mv
+
+        rows[:, CSV_FIELD_SLICES["va"]] = np.round(self.va_base + self.rng.normal(0, 20, (n, 8)))
+        rows[:, CSV_FIELD_SLICES["tc"]] = np.round(self.tc_base + self.rng.normal(0, 15, (n, 6)))
+
+        t = boot_times / 1000.0
+        rows[:, CSV_FIELD_SLICES["ir"]] = np.round(5 * np.sin(t), 2)
+        rows[:, CSV_FIELD_SLICES["ip"]] = np.round(3 * np.sin(0.7 * t), 2)
+        rows[:, CSV_FIELD_SLICES["iy"]] = np.round(90 + 10 * np.sin(0.3 * t), 2)
+        return rows
+
+
+def rows_to_csv_bytes(rows: np.ndarray) -> bytes:
+    """펌웨어와 같은 CSV 라인 형식으로 인코딩 (스키마의 정수 컬럼(boot_time/sv/fault 등)은 정수)"""
+    values = rows.astype(object)
+    values[:, INT_COLUMNS] = rows[:, INT_COLUMNS].astype(np.int64).astype(object)
+    lines = [",".join(map(str, row)) for row in values.tolist()]
+    return ("\n".join(lines) + "\n").encode("ascii")
+
+
+def encode(rows: np.ndarray, protocol: str) -> bytes:
+    """protocol("csv" / "binary")에 맞게 바이트로 인코딩"""
+    if protocol == "binary":
+        return encode_rows(rows)
+    return rows_to_csv_bytes(rows)
+
+
+def burst_boot_times(send_ms: float, n: int, period_ms: float) -> np.ndarray:
+    """
+    한 번에 보내는 n개 패킷의 boot_time(ms): period_ms 간격으로 샘플링되어 마지막 패킷이 송신 시각(send_ms)
+    (burst 안의 패킷이 모두 같은 boot_time이면 링크 품질/fusion 지표가 중복으로 계산됨)
+    """
+    return send_ms - (n - 1 - np.arange(n)) * period_ms
+
+
+def burst_schedule(rate_hz: float, duration_s: float, burst: int = 1):
+    """
+    (전송 시각 오프셋[s], 패킷 수) 목록 생성
+    burst개씩 묶어 rate_hz / burst 주기로 전송 (burst=1이면 균일 전송)
+    """
+    if rate_hz <= 0:
+        raise ValueError("rate_hz must be positive")
+    interval = burst / rate_hz
+    total = int(rate_hz * duration_s)
+    schedule = []
+    sent = 0
+    while sent < total:
+        n = min(burst, total - sent)
+        schedule.append((len(schedule) * interval, n))
+        sent += n
+    return schedule
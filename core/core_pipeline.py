@@ -0,0 +1,288 @@
+from datetime import datetime
+
+from handler.handler_comm import HandlerComm
+from handler.handler_command import HandlerCommand
+from handler.handler_log import HandlerLog
+from handler.handler_relay import HandlerRelay
+from handler.handler_replay import HandlerReplay
+from handler.handler_sequence import HandlerSequence
+from utils.data_types import ReceivedPacket, vehicle_from_row, vehicle_to_row
+from utils.data_fusion import DataFusion, DEFAULT_HOLD_MS
+from utils.data_history import DataHistory, DEFAULT_HISTORY_CAPACITY
+from utils.calibration import Calibration
+from utils.clock import elapsed_s, now_ns
+from utils.latency import LatencyStats
+from utils.sequence import load_sequence
+
+
+
+class CorePipeline:
+    """
+    수신 -> 파싱 -> history -> 로그 파이프라인 (Qt 위젯 없이 동작)
+    - 헤드리스 레코더(GCS_headless.py), 벤치마크 등에서 단독으로 사용
+    - GUI(CoreController)는 이 클래스를 상속하여 화면 표시만 추가
+    - QTimer/QSerialPort를 사용하므로 QCoreApplication 이벤트 루프는 필요
+    """
+
+    def __init__(self, history_capacity: int = DEFAULT_HISTORY_CAPACITY, log_format: str = "csv",
+                 threaded: bool = True, fusion_hold_ms: float = DEFAULT_HOLD_MS, log_options: dict = None):
+        # ============================
+        # 수신/로그 핸들러 초기화
+        # ============================
+        self.umb_handler = HandlerComm(self, source="UMB", threaded=threaded)
+        self.tlm_handler = HandlerComm(self, source="TLM", threaded=threaded)
+        self.latency = LatencyStats()  # 단계별 지연 히스토그램 (readyRead 기준)
+        # log_options: HandlerLog 세그먼트/압축/flush 설정 (compression, segment_bytes, segment_seconds, ...)
+        self.log_handler = HandlerLog(log_format, latency=self.latency, **(log_options or {}))
+        self.replay_handler = None  # 로그 재생 소스 (start_replay로 생성)
+
+        # 링크별 텔레커맨드 큐 (우선순위/병합/텔레메트리 ack)
+        self.umb_commands = HandlerCommand(self, self.umb_handler)
+        self.tlm_commands = HandlerCommand(self, self.tlm_handler)
+        self.sequence_handler = None  # GCS 측 타이밍 시퀀스 (start_sequence로 생성)
+        self.relay_handler = None     # 네트워크 재송신 (start_relay로 생성)
+
+        # ============================
+        # 데이터 저장소
+        # ============================
+        # 마지막 수신된 데이터 저장
+        self.last_umb_data = None
+        self.last_tlm_data = None
+        self.last_vehicle_data = None
+
+        # 모든 데이터를 각각 저장 (고정 용량 컬럼형 링버퍼)
+        self.umb_data_history = DataHistory(history_capacity)      # UMB 데이터 저장소
+        self.tlm_data_history = DataHistory(history_capacity)      # TLM 데이터 저장소
+        self.vehicle_data_history = DataHistory(history_capacity)  # 통합된 데이터 저장소 (GUI 업데이트용)
+
+        # 데이터 소스 관리 변수 - 기본값을 'UMB'로 설정
+        self.active_source = 'UMB'
+        self.vehicle_arrival = None  # 통합 history 마지막 배치의 도착 시각 (time.monotonic_ns, 화면 지연 측정용)
+
+        # 두 링크를 boot_time 기준으로 합쳐 통합 history에 기록 (active_source는 같은 시각일 때 우선 링크)
+        self.fusion = DataFusion(self.vehicle_data_history, hold_ms=fusion_hold_ms, preferred=self.active_source)
+
+        # VA/TC 보정 계수 (GUI에서는 LineEdit 입력과 연결됨)
+        self.calibration = Calibration()
+        # 이미 보정된 로그(utils.log_export의 _cal.csv)를 재생할 때 쓰는 항등 보정 (A = 1, B = 0)
+        self.identity_calibration = Calibration()
+
+    def shutdown(self):
+        """프로그램 종료 시 로깅 중지 및 수신 스레드 정리"""
+        self.log_handler.stop_logging()
+        self.umb_handler.shutdown()
+        self.tlm_handler.shutdown()
+        if self.replay_handler:
+            self.replay_handler.shutdown()
+        if self.sequence_handler:
+            self.sequence_handler.abort()
+            self.sequence_handler.wait(1.0)
+        if self.relay_handler:
+            self.relay_handler.close()
+
+    def connected_sources(self) -> list:
+        """현재 데이터를 받고 있는 소스 목록 (시리얼 연결 또는 재생 중)"""
+        sources = []
+        for source, handler in (('UMB', self.umb_handler), ('TLM', self.tlm_handler)):
+            replaying = self.replay_handler is not None and self.replay_handler.source == source \
+                and self.replay_handler.serial_connected
+            if handler.serial_connected or replaying:
+                sources.append(source)
+        return sources
+
+    def start_logging(self, sources=None) -> bool:
+        """sources(기본: 연결된 소스 전체)에 대해 로깅 시작"""
+        if sources is None:
+            sources = self.connected_sources()
+        if not sources:
+            self._append_debug_message("[CORE] No connected sources to log")
+            return False
+        if not self.log_handler.start_logging(sources):
+            return False
+        self._append_debug_message(f"[CORE] Logging started for sources: {', '.join(sources)}")
+        return True
+
+    def stop_logging(self) -> bool:
+        if not self.log_handler.stop_logging():
+            return False
+        self._append_debug_message("[CORE] Logging stopped")
+        return True
+
+    def start_replay(self, path: str, source: str = 'UMB', speed: float = 1.0):
+        """
+        기록된 로그를 source 데이터로 재생
+        speed: 1.0 = 실시간, N = N배속, 0 = 최대 속도
+        """
+        if self.replay_handler:
+            self.replay_handler.shutdown()
+        self.replay_handler = HandlerReplay(self, source=source, path=path, speed=speed)
+        self.replay_handler.finished.connect(self._on_replay_finished)
+        self.resync_source(source)
+        self._append_debug_message(f"[CORE] Replaying {path} as {source} (speed: {speed or 'max'})")
+        self.replay_handler.start()
+        return self.replay_handler
+
+    def _on_replay_finished(self):
+        """재생이 끝나면 fusion이 보류 중인 마지막 샘플(hold_ms 구간)까지 통합 history에 반영"""
+        committed = self.fusion.flush()
+        if len(committed):
+            self.last_vehicle_data = vehicle_from_row(committed[-1])
+
+    def start_relay(self, port: int, multicast: str = None, multicast_port: int = None, command_host: str = None):
+        """
+        수신한 텔레메트리를 TCP(UMB = port, TLM = port + 1)와 선택적으로 UDP 멀티캐스트로 재송신
+        command_host: 명령 전송을 허용할 구독 GCS 주소 (없으면 모든 구독자가 읽기 전용)
+        """
+        if self.relay_handler:
+            self.relay_handler.close()
+        try:
+            self.relay_handler = HandlerRelay(self, port=port, multicast=multicast, multicast_port=multicast_port,
+                                              command_host=command_host)
+        except OSError as e:
+            self.relay_handler = None
+            self._append_debug_message(f"[RELAY] {e}")
+            return None
+        target = f"tcp {port}/{port + 1}" + (f", udp {multicast}" if multicast else "")
+        self._append_debug_message(f"[RELAY] Relaying telemetry ({target}), command station: {command_host or 'none'}")
+        return self.relay_handler
+
+    def start_sequence(self, path: str, source: str = 'UMB'):
+        """
+        시퀀스 스크립트(*.seq, utils/sequence.py 참고)를 source 링크로 실행
+        실행 중인 시퀀스가 있으면 시작하지 않음, 스크립트 오류는 디버그 메시지로 알리고 None 반환
+        """
+        if self.sequence_handler and self.sequence_handler.running:
+            self._append_debug_message("[SEQ] Another sequence is running")
+            return None
+        try:
+            sequence = load_sequence(path)
+        except (OSError, ValueError) as e:
+            self._append_debug_message(f"[SEQ] Failed to load {path}: {e}")
+            return None
+        self.sequence_handler = HandlerSequence(self, sequence, source=source, calibration=self.calibration)
+        self._append_debug_message(f"[SEQ] Starting {path} on {source} ({len(sequence.steps)} steps)")
+        self.sequence_handler.start()
+        return self.sequence_handler
+
+    def abort_sequence(self) -> bool:
+        if not self.sequence_handler or not self.sequence_handler.running:
+            return False
+        self.sequence_handler.abort()
+        return True
+
+    def on_data_received(self, packet: ReceivedPacket, source: str):
+        if source == 'UMB':
+            self.last_umb_data = packet.data
+            self.umb_data_history.append(packet.data, packet.timestamp)
+        elif source == 'TLM':
+            self.last_tlm_data = packet.data
+            self.tlm_data_history.append(packet.data, packet.timestamp)
+
+        self._log_data(packet, source)
+
+        self.process_vehicle_data(packet.data, packet.timestamp, source)
+
+    def on_batch_received(self, rows, arrival_ns: int, source: str, decoded_ns: int = None, widen: bool = False):
+        """
+        한 번의 readyRead에서 파싱된 여러 패킷(N x CSV_FIELD_COUNT)을 한 번에 처리
+        DataVehicle은 마지막 행에 대해서만 생성 (라벨/버튼 표시용)
+        arrival_ns: 도착 시각 (time.monotonic_ns), history/로그의 수신 시각으로 그대로 저장
+                    (벽시계 문자열은 로그 기록/표시 시점에 utils.clock으로 변환)
+        decoded_ns: 디코딩 완료 시각, 없으면(재생 등) 도착 시각과 같다고 봄
+        widen: 바이너리 링크에서 float32로 수신한 배치 (CSV 로그 기록 시 10진 표현 정리)
+        """
+        if len(rows) == 0:
+            return
+
+        now = now_ns()
+        if decoded_ns is None:
+            decoded_ns = arrival_ns
+        self.latency.record(source, "decode", elapsed_s(arrival_ns, decoded_ns), len(rows))
+        self.latency.record(source, "dispatch", elapsed_s(arrival_ns, now), len(rows))
+
+        last_data = vehicle_from_row(rows[-1])
+        if source == 'UMB':
+            self.last_umb_data = last_data
+            self.umb_data_history.extend(rows, arrival_ns)
+        elif source == 'TLM':
+            self.last_tlm_data = last_data
+            self.tlm_data_history.extend(rows, arrival_ns)
+
+        self.log_handler.append_rows(rows, arrival_ns, source, widen)
+
+        # 보낸 명령이 텔레메트리에 반영되었는지 확인
+        commands = {'UMB': self.umb_commands, 'TLM': self.tlm_commands}.get(source)
+        if commands is not None:
+            commands.on_batch(rows, arrival_ns)
+        if self.sequence_handler is not None and self.sequence_handler.running:
+            self.sequence_handler.on_batch(rows, source)
+        if self.relay_handler is not None:
+            self.relay_handler.publish(rows, source)
+
+        committed = self.fusion.ingest(rows, arrival_ns, source)
+        if len(committed):
+            self.last_vehicle_data = vehicle_from_row(committed[-1])
+            self.vehicle_arrival = arrival_ns
+
+    def calibrated(self, source: str = None, n: int = None) -> dict:
+        """
+        source history(기본: 통합 history)의 최근 n개에 대한 VA ideal/calibrated, TC calibrated 배열
+        패킷 단위 전체 해상도로 계산되므로 플롯/알람/로그 등에서 그대로 사용 가능
+        """
+        history = {'UMB': self.umb_data_history, 'TLM': self.tlm_data_history}.get(source, self.vehicle_data_history)
+        return self.display_calibration().apply_history(history, n)
+
+    def display_calibration(self) -> Calibration:
+        """표시에 적용할 보정 (보정된 로그를 재생 중이면 다시 보정하지 않도록 항등 보정)"""
+        if self.replay_handler is not None and self.replay_handler.reader.calibrated:
+            return self.identity_calibration
+        return self.calibration
+
+    def _log_data(self, packet: ReceivedPacket, source: str):
+        """
+        모든 데이터를 로깅하는 내부 메서드
+        """
+        self.log_handler.append(packet, source)
+
+    def process_vehicle_data(self, vehicle_data, recv_ns: int = None, source: str = None):
+        """
+        통합된 DataVehicle 처리 - 데이터 관리
+        수신된 데이터를 fusion을 거쳐 vehicle_data_history에 저장하는 역할 (중복/역순 boot_time은 버려짐)
+        실제 GUI 업데이트는 타이머에 의해 CoreController.update_plots에서 처리됨
+        """
+        # 데이터 저장 (링버퍼 용량만큼 유지, 오래된 데이터는 자동으로 덮어씀)
+        if recv_ns is None:
+            recv_ns = now_ns()
+        committed = self.fusion.ingest(vehicle_to_row(vehicle_data), recv_ns, source or self.active_source)
+        if len(committed):
+            self.last_vehicle_data = vehicle_from_row(committed[-1])
+
+    def resync_source(self, source: str, clear_history: bool = False):
+        """
+        source 링크가 이어지지 않는 위치에서 다시 시작됨 (포트 재연결, replay seek/시작)
+        fusion 확정 기준을 초기화해 되돌아간 boot_time도 통합 history에 기록되게 함
+        clear_history: source/통합 history도 비움 (replay seek처럼 이전 구간 표시가 의미 없을 때)
+        """
+        self.fusion.resync(source)
+        if clear_history:
+            {'UMB': self.umb_data_history, 'TLM': self.tlm_data_history}[source].clear()
+            self.vehicle_data_history.clear()
+            self.last_vehicle_data = None
+
+    def set_active_source(self, source):
+        """
+        액티브 소스(같은 boot_time을 두 링크에서 받았을 때 우선 링크)를 변경
+        통합 history는 두 링크를 항상 합쳐 기록하므로, 전환 시 이전 데이터를 다시 넣지 않음
+        (예전처럼 last_*_data를 다시 넣으면 같은 boot_time이 현재 시각으로 중복 기록됨)
+        """
+        if source in ['UMB', 'TLM']:
+            self.active_source = source
+            self.fusion.preferred = source
+            self._append_debug_message(f"[CORE] Active Source changed to: {source}")
+
+    def _append_debug_message(self, line):
+        """
+        디버그 메시지 출력 (헤드리스: 콘솔, GUI: CoreController에서 TE_GCS_DEBUG로 재정의)
+        """
+        curr_time = datetime.now().strftime("%H:%M:%S.%f")[:-3]
+        print(f"{curr_time} : {line}", flush=True)
@@ -1,34 +1,41 @@
 from PyQt5.QtWidgets import QWidget, QPushButton
 
-from handler.handler_comm import HandlerComm
+from handler.handler_command import HandlerCommand
 from utils.data_types import DataVehicle
 
 
 
 class HandlerButtonGroup:
-    def __init__(self, ui: QWidget, *, comm: HandlerComm):
+    def __init__(self, ui: QWidget, *, commands: HandlerCommand):
         
-        self.comm = comm
+        self.commands = commands
 
         self.handlers = {
-            "PB_PNID_SV_1": HandlerButton(ui.PB_PNID_SV_1, kind="SV", idx=0, comm=self.comm),
-            "PB_PNID_SV_2": HandlerButton(ui.PB_PNID_SV_2, kind="SV", idx=1, comm=self.comm),
-            "PB_PNID_SV_3": HandlerButton(ui.PB_PNID_SV_3, kind="SV", idx=2, comm=self.comm),
-            "PB_PNID_SV_4": HandlerButton(ui.PB_PNID_SV_4, kind="SV", idx=3, comm=self.comm),
-            "PB_PNID_SV_5": HandlerButton(ui.PB_PNID_SV_5, kind="SV", idx=4, comm=self.comm),
-            "PB_PNID_SV_6": HandlerButton(ui.PB_PNID_SV_6, kind="SV", idx=5, comm=self.comm),
-            "PB_PNID_SV_7": HandlerButton(ui.PB_PNID_SV_7, kind="SV", idx=6, comm=self.comm),
-            "PB_PNID_SV_8": HandlerButton(ui.PB_PNID_SV_8, kind="SV", idx=7, comm=self.comm),
-
-            "PB_PNID_MV_1": HandlerButton(ui.PB_PNID_MV_1, kind="MV", idx=0, comm=self.comm),
-            "PB_PNID_MV_2": HandlerButton(ui.PB_PNID_MV_2, kind="MV", idx=1, comm=self.comm),
-            "PB_PNID_MV_3": HandlerButton(ui.PB_PNID_MV_3, kind="MV", idx=2, comm=self.comm),
-            "PB_PNID_MV_4": HandlerButton(ui.PB_PNID_MV_4, kind="MV", idx=3, comm=self.comm),
-
-            "PB_SEQUENCE": HandlerButton(ui.PB_SEQUENCE, kind="SEQ", idx=0, comm=self.comm),
+            "PB_PNID_SV_1": HandlerButton(ui.PB_PNID_SV_1, kind="SV", idx=0, commands=self.commands),
+            "PB_PNID_SV_2": HandlerButton(ui.PB_PNID_SV_2, kind="SV", idx=1, commands=self.commands),
+            "PB_PNID_SV_3": HandlerButton(ui.PB_PNID_SV_3, kind="SV", idx=2, commands=self.commands),
+            "PB_PNID_SV_4": HandlerButton(ui.PB_PNID_SV_4, kind="SV", idx=3, commands=self.commands),
+            "PB_PNID_SV_5": HandlerButton(ui.PB_PNID_SV_5, kind="SV", idx=4, commands=self.commands),
+            "PB_PNID_SV_6": HandlerButton(ui.PB_PNID_SV_6, kind="SV", idx=5, commands=self.commands),
+            "PB_PNID_SV_7": HandlerButton(ui.PB_PNID_SV_7, kind="SV", idx=6, commands=self.commands),
+            "PB_PNID_SV_8": HandlerButton(ui.PB_PNID_SV_8, kind="SV", idx=7, commands=self.commands),
+
+            "PB_PNID_MV_1": HandlerButton(ui.PB_PNID_MV_1, kind="MV", idx=0, commands=self.commands),
+            "PB_PNID_MV_2": HandlerButton(ui.PB_PNID_MV_2, kind="MV", idx=1, commands=self.commands),
+            "PB_PNID_MV_3": HandlerButton(ui.PB_PNID_MV_3, kind="MV", idx=2, commands=self.commands),
+            "PB_PNID_MV_4": HandlerButton(ui.PB_PNID_MV_4, kind="MV", idx=3, commands=self.commands),
+
+            "PB_SEQUENCE": HandlerButton(ui.PB_SEQUENCE, kind="SEQ", idx=0, commands=self.commands, sequence_edit=ui.LE_SEQUENCE),
         }
+        self.last_frame_updates = 0  # 마지막 update_all에서 갱신된 버튼 수
+
+    def widget_update_count(self) -> int:
+        """지금까지 실제로 setStyleSheet가 호출된 총 횟수"""
+        return sum(handler.update_count for handler in self.handlers.values())
 
     def update_all(self, data: DataVehicle):
+        before = self.widget_update_count()
+
         # Update QPushButton colors based on data.sv
         for i, state in enumerate(data.sv):
             label_name = f"PB_PNID_SV_{i+1}"
@@ -41,56 +48,72 @@ class HandlerButtonGroup:
             if label_name in self.handlers:
                 self.handlers[label_name].update_state(kind="MV", state=state)
 
+        # 이번 프레임에서 실제로 갱신된 버튼 수 (프로파일링용)
+        self.last_frame_updates = self.widget_update_count() - before
+
 
 
 class HandlerButton:
-    def __init__(self, button_widget, *, kind: str, idx: int, comm: HandlerComm):
+    def __init__(self, button_widget, *, kind: str, idx: int, commands: HandlerCommand, sequence_edit=None):
         """
         button_widget: QPushButton 인스턴스
+        commands: 명령을 보낼 링크의 텔레커맨드 큐 (전송/재전송/ack 확인은 큐가 담당)
+        sequence_edit: SEQ 버튼이 읽을 QLineEdit (LE_SEQUENCE)
         """
         self.button = button_widget
         self.kind = kind.upper()
         self.idx = idx
-        self.comm = comm
+        self.commands = commands
+        self.sequence_edit = sequence_edit
+        self.last_color = None  # 마지막으로 적용한 배경색
+        self.update_count = 0   # 실제 setStyleSheet 호출 횟수
 
         self.button.setCheckable(True)
         self.button.clicked.connect(self.on_clicked)
 
     def on_clicked(self):
-        if not self.comm.serial_connected:
+        if not self.commands.comm.serial_connected:
             return
 
         if self.kind == "SV":
             next_val = 1 if self.button.isChecked() else 0
-            line = f":SV;{self.idx};{next_val}#\n"
-            self.comm.send_str(line)
+            self.commands.submit("SV", self.idx, next_val)
 
         elif self.kind == "MV":
             next_val = 180 if self.button.isChecked() else 0
-            line = f":MV;{self.idx};{next_val}#\n"
-            self.comm.send_str(line)
+            self.commands.submit("MV", self.idx, next_val)
         
         elif self.kind == "SEQ":
             # LE_SEQUENCE 텍스트 값 읽어서 전송
-            value = self.comm.controller.ui.LE_SEQUENCE.text().strip()
-            sequence_line = f":SEQ;{value}#\n"
+            value = self.sequence_edit.text().strip()
+            if value.lower().endswith(".seq"):
+                # 시퀀스 스크립트 경로면 GCS 측 시퀀스 실행 (실행 중이면 중단)
+                controller = self.commands.controller
+                if not controller.abort_sequence():
+                    controller.start_sequence(value, self.commands.source)
+                return
             print('--------------------------------')
-            print(sequence_line)
+            print(f":SEQ;{value}#")
             print('--------------------------------')
-            self.comm.send_str(sequence_line)
+            self.commands.submit("SEQ", 0, value)
 
-    def update_state(self, kind: str, state: int):
+    def update_state(self, kind: str, state: int) -> bool:
+        """
+        QPushButton의 배경색을 상태에 따라 변경
+        - SV: 0이면 빨간색, 1이면 초록색
+        - MV: 90도 이하이면 빨간색, 90도 초과이면 초록색
+        setStyleSheet는 스타일 재계산/레이아웃을 유발하므로 색이 바뀔 때만 호출 (변경 시 True 반환)
+        """
         if kind == "SV":
-            """
-            QPushButton의 배경색을 상태에 따라 변경
-            state: 0이면 빨간색, 1이면 초록색
-            """
             color = "green" if state == 1 else "red"
-            self.button.setStyleSheet(f"background-color: {color};")
         elif kind == "MV":
-            """
-            QPushButton의 배경색을 상태에 따라 변경
-            state: 90도 이하이면 빨간색, 90도 초과이면 초록색
-            """
             color = "red" if state < 90 else "green"
-            self.button.setStyleSheet(f"background-color: {color};")
+        else:
+            return False
+
+        if color == self.last_color:
+            return False
+        self.button.setStyleSheet(f"background-color: {color};")
+        self.last_color = color
+        self.update_count += 1
+        return True
@@ -1,92 +1,233 @@
-from PyQt5.QtCore import QIODevice, QObject, QTimer
-from PyQt5.QtSerialPort import QSerialPort
+from PyQt5.QtCore import QObject, QThread, QTimer, QMetaObject, Qt, Q_ARG, Q_RETURN_ARG, pyqtSignal, pyqtSlot
 from PyQt5.QtWidgets import QMessageBox
-from datetime import datetime
-import json
+import time
 
 
-from utils.data_types import DataVehicle, parse_csv_to_vehicle, ReceivedPacket
+from utils.data_types import DataVehicle, parse_csv_batch, ReceivedPacket
+from utils.protocol_binary import BinaryFrameDecoder, FRAME_SIZE, find_frame
+from utils.link_quality import LinkQuality, format_link
+from handler.handler_transport import (TCP_CONNECT_TIMEOUT_MS, is_connecting, is_network, is_read_only,
+                                       open_transport, read_transport)
 
 
 
-class HandlerComm(QObject):
-    def __init__(self, controller, *, source: str, btn_connect, label_rate):
+class CommWorker(QObject):
+    """
+    시리얼 수신 담당 객체
+    - 수신 장치(QSerialPort, 또는 릴레이 구독용 QTcpSocket/QUdpSocket)를 소유하고
+      읽기/프로토콜 감지/디코딩/수신 속도 계산까지 수행
+    - 디코딩된 배치만 batch_ready 시그널로 전달 (스레드 모드에서는 queued 연결)
+    - 장치와 QTimer는 반드시 이 객체가 속한 스레드에서 생성해야 하므로
+      슬롯 호출 시 지연 생성함
+    """
+    batch_ready = pyqtSignal(object, object, object, bool)  # rows (N x CSV_FIELD_COUNT), 도착 시각, 디코딩 완료 시각 (time.monotonic_ns), float32 수신 여부
+    debug_message = pyqtSignal(str)
+    rate_updated = pyqtSignal(float)
+    link_updated = pyqtSignal(object)  # LinkQuality.snapshot() dict (1초마다)
+    port_opened = pyqtSignal(bool, str)  # open_port_async 결과 (성공 여부, 실패 사유)
+
+    PROTOCOLS = ("auto", "csv", "binary")
+    # 자동 감지 중 판정 없이 모을 최대 바이트 (넘으면 CSV로 간주)
+    DETECT_MAX_BYTES = 4096
+    # 자동 감지 모드에서 정상 행 없이 오류만 난 readyRead가 연속으로 이만큼이면 프로토콜 재감지
+    REDETECT_AFTER_ERRORS = 5
+
+    def __init__(self, source: str, protocol: str = "auto"):
         super().__init__()
-        self.controller = controller
         self.source = source
-        self.btn_connect = btn_connect
-        self.label_rate = label_rate
 
-        self.serial_port = QSerialPort()
+        self.serial_port = None
         self.serial_connected = False
+        self.pending_device = None  # 연결 중인 TCP 소켓 (open_port_async)
         self.buffer = b""
 
+        # 수신 프로토콜 ("auto"이면 연결 후 첫 데이터로 CSV/바이너리 자동 감지)
+        if protocol not in self.PROTOCOLS:
+            raise ValueError(f"Unknown protocol: {protocol}")
+        self.protocol_setting = protocol
+        self.protocol = protocol
+        self.frame_decoder = BinaryFrameDecoder()
+        self.error_streak = 0  # 정상 행 없이 오류만 난 연속 readyRead 수 (재감지 기준)
+        self.last_crc_errors = 0
+        self.last_resyncs = 0
+
         # 수신 속도(Hz) 측정
         self.packet_count = 0
         self.last_packet_count = 0
-        self.last_update_time = datetime.now()
+        self.last_update_time = time.monotonic()
+        self.rate_timer = None
 
-        self.rate_timer = QTimer()
-        self.rate_timer.timeout.connect(self._update_rate)
-        self.rate_timer.start(1000)  # 1초 간격
+        # 마지막 readyRead 시각 (time.monotonic_ns): 배치의 수신 시각으로 history/로그/지연 측정에 사용
+        self.arrival = 0
 
-    # ---------- public ----------
-    def connect_serial(self, port_name, baudrate):
+        # 링크 품질 (바이트 속도, 파싱 오류, boot_time 기반 누락/중복/순서/지터)
+        self.link = LinkQuality()
+
+    def _ensure_objects(self):
+        if self.rate_timer is None:
+            self.rate_timer = QTimer()
+            self.rate_timer.timeout.connect(self._update_rate)
+            self.rate_timer.start(1000)  # 1초 간격
+
+    # ---------- slots (worker 스레드에서 실행) ----------
+    @pyqtSlot(str, int, result=bool)
+    def open_port(self, port_name, baudrate):
+        """시리얼 포트 열기 (port_name 형식은 handler_transport 참고), 바로 결과 반환"""
+        self._ensure_objects()
+        device = self._open_device(port_name, baudrate)
+        if device is None:
+            return False
+        if is_connecting(device):
+            # 연결 완료를 기다리지 않는 호출 경로 -> open_port_async 사용
+            device.abort()
+            device.deleteLater()
+            self.debug_message.emit(f"[{self.source}] {port_name} must be opened with open_port_async")
+            return False
+        self._attach(device)
+        return True
+
+    @pyqtSlot(str, int)
+    def open_port_async(self, port_name, baudrate):
         """
-        시리얼 포트 연결/해제 처리 (토글)
+        네트워크 장치 열기 (HandlerComm이 queued로 호출하므로 GUI 스레드를 막지 않음)
+        결과는 port_opened로 알림, TCP는 연결 완료/오류/TCP_CONNECT_TIMEOUT_MS 경과 시점
         """
-        if not self.serial_connected:
-            self.serial_port.setPortName(port_name)
-            self.serial_port.setBaudRate(baudrate)
-            self.serial_port.setDataBits(QSerialPort.Data8)
-            self.serial_port.setParity(QSerialPort.NoParity)
-            self.serial_port.setStopBits(QSerialPort.OneStop)
-            self.serial_port.setFlowControl(QSerialPort.NoFlowControl)
-
-            if self.serial_port.open(QIODevice.ReadWrite):
-                self.serial_connected = True
-                self.btn_connect.setText("Connected!")
-                self.serial_port.readyRead.connect(self._handle_ready_read)
-
-                # 속도 카운터 초기화
-                self.packet_count = 0
-                self.last_packet_count = 0
-                self.last_update_time = datetime.now()
-                return True
-            else:
-                QMessageBox.critical(self.controller.ui, "Error",
-                                     f"Failed to open {self.source} serial port.")
-                return False
-        else:
-            # 이미 연결된 경우 -> 해제
-            self.serial_connected = False
-            try:
-                self.serial_port.readyRead.disconnect(self._handle_ready_read)
-            except Exception:
-                pass
-            self.serial_port.close()
-            self.btn_connect.setText("Connect\nSerial")
-            self.label_rate.setText("0.0 Hz")
-            return False
+        self._ensure_objects()
+        self._cancel_pending()
+        device = self._open_device(port_name, baudrate)
+        if device is None:
+            self.port_opened.emit(False, f"Failed to open {port_name}")
+            return
+        if not is_connecting(device):
+            self._attach(device)
+            self.port_opened.emit(True, "")
+            return
+
+        self.pending_device = device
+        device.connected.connect(self._on_device_connected)
+        device.errorOccurred.connect(self._on_device_error)
+        QTimer.singleShot(TCP_CONNECT_TIMEOUT_MS, lambda: self._on_connect_timeout(device, port_name))
+
+    def _open_device(self, port_name, baudrate):
+        try:
+            return open_transport(port_name, baudrate)
+        except ValueError as e:
+            self.debug_message.emit(f"[{self.source}] {e}")
+            return None
+
+    def _on_device_connected(self):
+        device, self.pending_device = self.pending_device, None
+        if device is None:
+            return
+        device.connected.disconnect(self._on_device_connected)
+        device.errorOccurred.disconnect(self._on_device_error)
+        self._attach(device)
+        self.port_opened.emit(True, "")
+
+    def _on_device_error(self, _error):
+        device = self.pending_device
+        if device is None:
+            return
+        message = device.errorString()
+        self._cancel_pending()
+        self.port_opened.emit(False, message)
+
+    def _on_connect_timeout(self, device, port_name):
+        if device is not self.pending_device:
+            return  # 이미 연결/실패/취소됨
+        self._cancel_pending()
+        self.port_opened.emit(False, f"Connection to {port_name} timed out")
+
+    def _cancel_pending(self):
+        device, self.pending_device = self.pending_device, None
+        if device is None:
+            return
+        try:
+            device.connected.disconnect(self._on_device_connected)
+            device.errorOccurred.disconnect(self._on_device_error)
+        except TypeError:
+            pass
+        device.abort()
+        device.deleteLater()
+
+    def _attach(self, device):
+        """열린 장치로 수신 시작"""
+        self.serial_port = device
+        self.serial_connected = True
+        self.serial_port.readyRead.connect(self._handle_ready_read)
+        self.buffer = b""
+        self.protocol = self.protocol_setting
+        self.frame_decoder.reset()
+        self.error_streak = 0
+
+        # 속도 카운터 초기화
+        self.packet_count = 0
+        self.last_packet_count = 0
+        self.last_update_time = time.monotonic()
+        self.link.reset()
+        self.link.snapshot(self.last_update_time)
+
+    @pyqtSlot()
+    def close_port(self):
+        self._cancel_pending()
+        self.serial_connected = False
+        if self.serial_port is None:
+            return
+        try:
+            self.serial_port.readyRead.disconnect(self._handle_ready_read)
+        except Exception:
+            pass
+        self.serial_port.close()
+        self.serial_port.deleteLater()
+        self.serial_port = None
+
+    @pyqtSlot(bytes)
+    def write_bytes(self, data: bytes):
+        if not self.serial_connected or not self.serial_port.isOpen():
+            self.debug_message.emit(f"[{self.source}] Not connected. Cannot send bytes.")
+            return
+        if is_read_only(self.serial_port):
+            self.debug_message.emit(f"[{self.source}] UDP subscription is read-only. Cannot send bytes.")
+            return
+        try:
+            # flush()는 쓰기 완료까지 블로킹하므로 호출하지 않음 (이벤트 루프가 전송)
+            self.serial_port.write(data)
+        except Exception as e:
+            self.debug_message.emit(f"[{self.source}] Send error: {e}")
+
+    @pyqtSlot()
+    def shutdown(self):
+        self.close_port()
+        if self.rate_timer is not None:
+            self.rate_timer.stop()
 
     # ---------- internal ----------
     def _update_rate(self):
         """
-        1초마다 호출되어 데이터 수신 속도를 계산하고 UI에 표시
+        1초마다 호출되어 데이터 수신 속도를 계산하여 rate_updated로 전달
         """
         if not self.serial_connected:
-            self.label_rate.setText("0.0 Hz")
             return
 
-        current_time = datetime.now()
-        elapsed = (current_time - self.last_update_time).total_seconds()
+        current_time = time.monotonic()
+        elapsed = current_time - self.last_update_time
         if elapsed <= 0:
             return
 
         # 지난 1초간 처리된 패킷 수
         delta = self.packet_count - self.last_packet_count
-        rate = delta / elapsed
-        self.label_rate.setText(f"{rate:.1f} Hz")
+        self.rate_updated.emit(delta / elapsed)
+        self.link_updated.emit(self.link.snapshot(current_time))
+
+        # 바이너리 모드: 지난 1초간 손상 프레임/재동기화가 있었으면 알림
+        decoder = self.frame_decoder
+        crc_errors = decoder.crc_errors - self.last_crc_errors
+        resyncs = decoder.resyncs - self.last_resyncs
+        if crc_errors or resyncs:
+            self.debug_message.emit(
+                f"[{self.source}] Binary link: {crc_errors} corrupted frames, {resyncs} resyncs")
+        self.last_crc_errors = decoder.crc_errors
+        self.last_resyncs = decoder.resyncs
 
         # 다음 계산을 위해 기준 갱신
         self.last_packet_count = self.packet_count
@@ -95,38 +236,276 @@ class HandlerComm(QObject):
     def _handle_ready_read(self):
         """
         시리얼 버퍼에 데이터가 있을 때 호출됨
+        한 번에 도착한 모든 데이터를 프로토콜에 맞게 배치로 파싱
+        """
+        self.arrival = time.monotonic_ns()
+        try:
+            raw = read_transport(self.serial_port)
+        except Exception as e:
+            self.debug_message.emit(f"[{self.source}] Error while reading serial data: {e}")
+            return
+        self.link.add_bytes(len(raw))
+
+        if self.protocol == "auto":
+            raw = self._detect_protocol(raw)
+            if self.protocol == "auto":
+                return
+
+        if self.protocol == "binary":
+            self._handle_binary_bytes(raw)
+        else:
+            self._handle_text_bytes(raw)
+
+    def _detect_protocol(self, raw: bytes) -> bytes:
+        """
+        수신 데이터로 프로토콜 감지
+        - CRC가 맞는 바이너리 프레임이 있으면 binary
+        - 완성된 라인 중 parse_csv_batch가 받아들이는 행이 있으면 csv
+          (ASCII 부트 메시지 등 텔레메트리가 아닌 라인만으로는 결정하지 않음)
+        - DETECT_MAX_BYTES를 넘도록 판정이 안 되면 csv로 간주 (오류가 계속되면 다시 감지)
+        감지되면 지금까지 모은 데이터를 반환, 아직이면 b"" 반환
+        """
+        self.buffer += raw
+        if find_frame(self.buffer):
+            self.protocol = "binary"
+        elif self._has_csv_row(self.buffer):
+            self.protocol = "csv"
+        elif len(self.buffer) > max(self.DETECT_MAX_BYTES, 4 * FRAME_SIZE):
+            self.protocol = "csv"
+            self.debug_message.emit(f"[{self.source}] Protocol not recognized, falling back to CSV")
+        else:
+            return b""
+
+        self.debug_message.emit(f"[{self.source}] Protocol detected: {self.protocol}")
+        pending, self.buffer = self.buffer, b""
+        return pending
+
+    @staticmethod
+    def _has_csv_row(data: bytes) -> bool:
+        """완성된 라인 중 parse_csv_batch가 받아들이는 텔레메트리 행이 있는지"""
+        end = data.rfind(b"\n")
+        if end < 0:
+            return False
+        lines = [line for line in data[:end].decode("utf-8", errors="replace").split("\n") if ',' in line]
+        if not lines:
+            return False
+        rows, _ = parse_csv_batch(lines)
+        return len(rows) > 0
+
+    def _check_errors(self, n_rows: int, n_errors: int):
+        """
+        자동 감지 모드에서 정상 행 없이 오류만 계속되면 프로토콜을 다시 감지
+        (감지 직후 송신측 모드가 바뀌었거나 잘못 감지한 경우)
         """
+        if n_rows or not n_errors:
+            self.error_streak = 0
+            return
+        self.error_streak += 1
+        if self.protocol_setting != "auto" or self.error_streak < self.REDETECT_AFTER_ERRORS:
+            return
+        self.debug_message.emit(f"[{self.source}] Repeated {self.protocol} errors, detecting protocol again")
+        self.protocol = "auto"
+        self.buffer = b""
+        self.frame_decoder.reset()
+        self.error_streak = 0
+
+    def _handle_binary_bytes(self, raw: bytes):
+        """바이너리 프레임 모드: 도착한 모든 프레임을 한 번에 디코딩"""
+        try:
+            crc_errors, resyncs = self.frame_decoder.crc_errors, self.frame_decoder.resyncs
+            rows = self.frame_decoder.feed(raw)
+            crc_errors = self.frame_decoder.crc_errors - crc_errors
+            self.link.add_errors(crc_errors)
+            # SYNC를 못 찾고 건너뛴 경우도 재감지 기준에는 포함 (CSV 스트림이면 CRC 오류 없이 resync만 증가)
+            self._check_errors(len(rows), crc_errors + self.frame_decoder.resyncs - resyncs)
+            if len(rows) == 0:
+                return
+            self._emit_batch(rows)
+        except Exception as e:
+            self.debug_message.emit(f"[{self.source}] Unexpected binary frame error: {e}")
+
+    def _handle_text_bytes(self, raw: bytes):
+        """CSV 모드: 완성된 라인을 모아 배치로 파싱"""
         # line 단위 수신을 전제(송신측에서 \n로 라인 종료)
-        while self.serial_port.canReadLine():
-            try:
-                raw = self.serial_port.readLine()
-                # PyQt5 일부 플랫폼에서 readLine()이 QByteArray를 반환
-                if hasattr(raw, "data"):
-                    raw = raw.data()
-                line = raw.decode("utf-8", errors="replace").strip()
-                if not line:
-                    continue
-
-                if ',' in line:
-                    self._handle_csv_packet(line)
-                else:
-                    self._append_debug_message(line)
-            except Exception as e:
-                self._append_debug_message(f"[{self.source}] Error while reading serial data: {e}")
-
-    def _handle_csv_packet(self, line: str):
+        self.buffer += raw
+        end = self.buffer.rfind(b"\n")
+        if end < 0:
+            return
+        complete, self.buffer = self.buffer[:end], self.buffer[end + 1:]
+
+        csv_lines = []
+        for line in complete.decode("utf-8", errors="replace").split("\n"):
+            line = line.strip()
+            if not line:
+                continue
+            if ',' in line:
+                csv_lines.append(line)
+            else:
+                self.debug_message.emit(line)
+
+        if csv_lines:
+            self._handle_csv_batch(csv_lines)
+
+    def _handle_csv_batch(self, lines: list):
         """
         CSV 형식: 예) 1.23,2.34,3.45,...,13.37
+        잘못된 행은 건너뛰고 나머지는 한 번에 전달
         """
         try:
-            packet = parse_csv_to_vehicle(line, source=self.source)
-            self.packet_count += 1
-            # 컨트롤러가 공통 콜백으로 데이터 처리
-            self.controller.on_data_received(packet, source=self.source)
-        except ValueError as e:
-            self._append_debug_message(f"[{self.source}] {e}")
+            rows, errors = parse_csv_batch(lines)
+            self.link.add_errors(len(errors))
+            self._check_errors(len(rows), len(errors))
+            for error in errors:
+                self.debug_message.emit(f"[{self.source}] {error}")
+            if len(rows) == 0:
+                return
+            self._emit_batch(rows)
         except Exception as e:
-            self._append_debug_message(f"[{self.source}] Unexpected CSV error: {e}")
+            self.debug_message.emit(f"[{self.source}] Unexpected CSV error: {e}")
+
+    def _emit_batch(self, rows):
+        self.packet_count += len(rows)
+        self.link.add_batch(rows[:, 0], self.arrival)
+        self.batch_ready.emit(rows, self.arrival, time.monotonic_ns(), self.protocol == "binary")
+
+
+
+class HandlerComm(QObject):
+    connect_finished = pyqtSignal(bool)  # 비동기(네트워크) 연결 결과
+
+    def __init__(self, controller, *, source: str, btn_connect=None, label_rate=None,
+                 protocol: str = "auto", threaded: bool = True):
+        """
+        threaded: True이면 전용 QThread에서 수신/디코딩 (GUI 스레드는 디코딩된 배치만 처리)
+        btn_connect, label_rate: 헤드리스 모드에서는 None (bind_widgets로 나중에 연결 가능)
+        """
+        super().__init__()
+        self.controller = controller
+        self.source = source
+        self.btn_connect = btn_connect
+        self.label_rate = label_rate
+        self.serial_connected = False
+        self.rate = 0.0
+        self.link = {}  # 마지막 링크 품질 snapshot (utils.link_quality)
+
+        self.worker = CommWorker(source, protocol)
+        self.worker.batch_ready.connect(self._on_batch_ready)
+        self.worker.debug_message.connect(self._append_debug_message)
+        self.worker.rate_updated.connect(self._on_rate_updated)
+        self.worker.link_updated.connect(self._on_link_updated)
+        self.worker.port_opened.connect(self._on_port_opened)
+        self.connecting = False  # 네트워크 장치 연결 대기 중
+
+        self.thread = None
+        if threaded:
+            self.thread = QThread()
+            self.thread.setObjectName(f"{source}-comm")
+            self.worker.moveToThread(self.thread)
+            self.thread.start()
+
+    def _invoke(self, method: str, *args, ret=None):
+        """
+        worker 슬롯 호출 (스레드 모드면 worker 스레드에서 실행)
+        반환값 없는 호출은 worker가 속한 스레드가 아니면 항상 queued (시퀀스 스레드 등에서 호출해도 안전)
+        """
+        if ret is not None:
+            conn = Qt.BlockingQueuedConnection if self.thread else Qt.DirectConnection
+            return QMetaObject.invokeMethod(self.worker, method, conn, Q_RETURN_ARG(ret), *args)
+        conn = Qt.DirectConnection if QThread.currentThread() == self.worker.thread() else Qt.QueuedConnection
+        QMetaObject.invokeMethod(self.worker, method, conn, *args)
+
+    # ---------- public ----------
+    def bind_widgets(self, *, btn_connect, label_rate):
+        """GUI 위젯 연결 (연결 버튼, 수신 속도 라벨)"""
+        self.btn_connect = btn_connect
+        self.label_rate = label_rate
+
+    def connect_serial(self, port_name, baudrate):
+        """
+        시리얼 포트 연결/해제 처리 (토글)
+        tcp:// / udp:// 는 worker에서 비동기로 연결하고 바로 True 반환 (연결 결과는 _on_port_opened)
+        """
+        if not self.serial_connected and not self.connecting:
+            if is_network(port_name):
+                self.connecting = True
+                if self.btn_connect:
+                    self.btn_connect.setText("Connecting...")
+                self._invoke("open_port_async", Q_ARG(str, port_name), Q_ARG(int, baudrate))
+                return True
+            if self._invoke("open_port", Q_ARG(str, port_name), Q_ARG(int, baudrate), ret=bool):
+                self._on_connected()
+                return True
+            self._on_connect_failed(f"Failed to open serial port {port_name}.")
+            return False
+        else:
+            # 이미 연결된 경우(또는 연결 중) -> 해제
+            self.connecting = False
+            self.serial_connected = False
+            self.rate = 0.0
+            self._invoke("close_port")
+            if self.btn_connect:
+                self.btn_connect.setText("Connect\nSerial")
+                self.label_rate.setText("0.0 Hz")
+            return False
+
+    def shutdown(self):
+        """프로그램 종료 시 포트를 닫고 수신 스레드 정리"""
+        self.serial_connected = False
+        if self.thread:
+            QMetaObject.invokeMethod(self.worker, "shutdown", Qt.BlockingQueuedConnection)
+            self.thread.quit()
+            self.thread.wait()
+            self.thread = None
+        else:
+            self.worker.shutdown()
+
+    # ---------- internal ----------
+    def _on_connected(self):
+        self.serial_connected = True
+        # 끊긴 동안의 boot_time과 이어지지 않으므로 fusion 기준을 새로 잡음
+        self.controller.resync_source(self.source)
+        if self.btn_connect:
+            self.btn_connect.setText("Connected!")
+
+    def _on_connect_failed(self, message: str):
+        if self.btn_connect:
+            self.btn_connect.setChecked(False)
+            self.btn_connect.setText("Connect\nSerial")
+            QMessageBox.critical(self.btn_connect.window(), "Error", f"[{self.source}] {message}")
+        else:
+            self._append_debug_message(f"[{self.source}] {message}")
+
+    def _on_port_opened(self, ok: bool, message: str):
+        """open_port_async 결과 (GUI 스레드)"""
+        if not self.connecting:
+            return  # 연결 중에 해제함
+        self.connecting = False
+        if ok:
+            self._on_connected()
+            self._append_debug_message(f"[{self.source}] Connected")
+        else:
+            self._on_connect_failed(message)
+        self.connect_finished.emit(ok)
+
+    def _on_rate_updated(self, rate: float):
+        """worker에서 1초마다 계산된 수신 속도를 UI에 표시"""
+        self.rate = rate if self.serial_connected else 0.0
+        if self.label_rate:
+            self.label_rate.setText(f"{self.rate:.1f} Hz")
+
+    def _on_link_updated(self, stats: dict):
+        """링크 품질 snapshot 저장, 수신 속도 라벨 툴팁으로 표시"""
+        if not self.serial_connected:
+            return
+        self.link = stats
+        if self.label_rate:
+            self.label_rate.setToolTip(format_link(stats))
+
+    def _on_batch_ready(self, rows, arrival_ns, decoded_ns, widen):
+        """디코딩 완료된 배치를 컨트롤러로 전달 (GUI 스레드)"""
+        if not self.serial_connected:
+            return
+        self.controller.on_batch_received(rows, arrival_ns, source=self.source, decoded_ns=decoded_ns, widen=widen)
 
     def _append_debug_message(self, line: str):
         """
@@ -137,17 +516,13 @@ class HandlerComm(QObject):
     def send_bytes(self, data: bytes) -> bool:
         """
         시리얼로 raw bytes 전송. (프로토콜/인코딩은 상위에서 결정)
+        실제 쓰기는 worker가 수행하므로 GUI 스레드를 블로킹하지 않음
         """
-        if not self.serial_connected or not self.serial_port.isOpen():
+        if not self.serial_connected:
             self._append_debug_message(f"[{self.source}] Not connected. Cannot send bytes.")
             return False
-        try:
-            self.serial_port.write(data)
-            self.serial_port.flush()
-            return True
-        except Exception as e:
-            self._append_debug_message(f"[{self.source}] Send error: {e}")
-            return False
+        self._invoke("write_bytes", Q_ARG(bytes, data))
+        return True
 
     def send_str(self, s: str, add_newline: bool = True) -> bool:
         return self.send_bytes((s + ("\n" if add_newline else "")).encode("utf-8"))
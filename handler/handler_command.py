@@ -0,0 +1,251 @@
+from PyQt5.QtCore import QObject, Qt, QTimer, pyqtSignal
+import heapq
+import itertools
+import time
+
+from utils.clock import elapsed_s
+from utils.data_types import CSV_FIELD_SLICES
+
+# 우선순위 (작을수록 먼저 전송)
+PRIORITY_ABORT = 0
+PRIORITY_NORMAL = 10
+
+# 이 값으로 시작하는 SEQ/명령은 대기 중인 다른 명령보다 먼저 전송
+ABORT_KEYWORDS = ("ABORT", "SAFE")
+
+
+class Telecommand:
+    __slots__ = ("kind", "idx", "value", "priority", "seq", "line",
+                 "attempts", "sent_at", "submitted_at", "acked_at", "superseded", "done")
+
+    def __init__(self, kind: str, idx, value, priority: int, seq: int):
+        self.kind = kind
+        self.idx = idx
+        self.value = value
+        self.priority = priority
+        self.seq = seq
+        self.attempts = 0
+        self.sent_at = None       # 마지막 전송 시각 (time.monotonic_ns)
+        self.submitted_at = time.monotonic_ns()
+        self.acked_at = None      # ack를 확인한 텔레메트리 배치 도착 시각 (time.monotonic_ns)
+        self.superseded = False   # 같은 밸브에 대한 새 명령으로 대체됨
+        self.done = False
+
+    @property
+    def key(self):
+        """같은 밸브 명령 병합 키 (SV/MV만 병합)"""
+        return (self.kind, self.idx) if self.kind in ("SV", "MV") else None
+
+    def text(self) -> str:
+        if self.kind == "SEQ":
+            return f":SEQ;{self.value}#\n"
+        return f":{self.kind};{self.idx};{self.value}#\n"
+
+    def describe(self) -> str:
+        return f"SEQ {self.value}" if self.kind == "SEQ" else f"{self.kind}{self.idx + 1}={self.value}"
+
+    def acked_by(self, rows) -> bool:
+        """텔레메트리 배치에서 명령한 상태가 관측되었는지 (rows는 전송 후 도착한 배치만 넘겨야 함)"""
+        if self.kind == "SV":
+            return bool((rows[:, CSV_FIELD_SLICES["sv"]][:, self.idx] == self.value).any())
+        if self.kind == "MV":
+            return bool(((rows[:, CSV_FIELD_SLICES["mv"]][:, self.idx] >= 90) == (self.value >= 90)).any())
+        return True
+
+
+class HandlerCommand(QObject):
+    """
+    링크(HandlerComm)별 비동기 텔레커맨드 큐
+    - submit은 큐에 넣기만 하고 즉시 반환, 전송은 tick_ms 타이머에서 tick당 max_per_tick개까지
+    - 우선순위 큐: ABORT/SAFE는 대기 중인 일반 명령보다 먼저 전송
+    - 같은 밸브(SV/MV idx)에 대한 명령은 마지막 값만 남김 (전송 전이면 값 교체, 전송 후면 이전 명령 추적 중단)
+    - ack: 전송 후 도착한 같은 링크 텔레메트리에서 sv/mv가 명령한 상태가 되면 확인, 명령->상태 변화 지연을 기록
+      ack_timeout 안에 확인되지 않으면 max_retries까지 재전송, 그래도 안 되면 command_failed
+    - SEQ는 텔레메트리로 확인할 상태가 없으므로 전송만 함
+    """
+    command_acked = pyqtSignal(object)   # Telecommand
+    command_failed = pyqtSignal(object)  # Telecommand
+    _sent_directly = pyqtSignal(object)  # send_now로 다른 스레드에서 보낸 Telecommand -> ack 추적 등록
+
+    def __init__(self, controller, comm, *, tick_ms: int = 10, max_per_tick: int = 4,
+                 ack_timeout: float = 1.0, max_retries: int = 2):
+        super().__init__()
+        self.controller = controller
+        self.comm = comm
+        self.source = comm.source
+        self.max_per_tick = max_per_tick
+        self.ack_timeout = ack_timeout
+        self.max_retries = max_retries
+
+        self.queue = []      # (priority, seq, Telecommand) 힙
+        self.pending = {}    # key -> 전송 대기 중인 Telecommand
+        self.inflight = {}   # key -> ack 대기 중인 Telecommand
+        self._seq = itertools.count()
+
+        # 통계
+        self.sent = 0
+        self.acked = 0
+        self.retried = 0
+        self.failed = 0
+        self.superseded = 0
+
+        self.timer = QTimer()
+        self.timer.timeout.connect(self._tick)
+        self.tick_ms = tick_ms
+        self._sent_directly.connect(self._track_sent, Qt.QueuedConnection)
+
+    def submit(self, kind: str, idx=0, value=0, priority: int = None) -> Telecommand:
+        """명령을 큐에 추가 (GUI 스레드를 막지 않음), 연결되지 않았으면 None"""
+        if not self.comm.serial_connected:
+            self._append_debug_message(f"[{self.source}] Not connected. Command {kind} dropped.")
+            return None
+
+        command = self._create(kind, idx, value, priority)
+        key = command.key
+        if key is not None:
+            waiting = self.pending.get(key)
+            if waiting is not None:
+                # 아직 전송 전: 값만 교체 (큐 위치 유지, 우선순위는 높은 쪽)
+                waiting.value = value
+                self.superseded += 1
+                if priority < waiting.priority:
+                    waiting.superseded = True
+                    self.pending[key] = command
+                    heapq.heappush(self.queue, (command.priority, command.seq, command))
+                    return command
+                return waiting
+            self.pending[key] = command
+        heapq.heappush(self.queue, (command.priority, command.seq, command))
+        if not self.timer.isActive():
+            self.timer.start(self.tick_ms)
+        return command
+
+    def send_now(self, kind: str, idx=0, value=0, priority: int = None) -> Telecommand:
+        """
+        큐를 거치지 않고 호출한 스레드에서 바로 전송 (시퀀스 실행 스레드처럼 전송 시각이 중요한 경우)
+        - 쓰기는 HandlerComm.send_str로 comm worker에 바로 넘기므로 GUI 이벤트 루프 부하와 무관
+        - ack 추적/재전송/타임아웃은 GUI 스레드에 queued로 등록한 뒤 submit한 명령과 같게 처리
+        - 연결되지 않았으면 None
+        """
+        if not self.comm.serial_connected:
+            return None
+        command = self._create(kind, idx, value, priority)
+        command.attempts = 1
+        command.sent_at = time.monotonic_ns()
+        self.comm.send_str(command.text())
+        self._sent_directly.emit(command)
+        return command
+
+    def _create(self, kind: str, idx, value, priority: int = None) -> Telecommand:
+        kind = kind.upper()
+        if priority is None:
+            is_abort = kind in ABORT_KEYWORDS or (kind == "SEQ" and str(value).upper().startswith(ABORT_KEYWORDS))
+            priority = PRIORITY_ABORT if is_abort else PRIORITY_NORMAL
+        return Telecommand(kind, idx, value, priority, next(self._seq))
+
+    def _track_sent(self, command: Telecommand):
+        """send_now로 보낸 명령을 ack 대기 목록에 추가 (GUI 스레드)"""
+        self.sent += 1
+        key = command.key
+        if key is None:
+            command.done = True
+            return
+        previous = self.inflight.pop(key, None)
+        if previous is not None:
+            previous.superseded = True
+            self.superseded += 1
+        self.inflight[key] = command
+        if not self.timer.isActive():
+            self.timer.start(self.tick_ms)
+
+    def clear(self):
+        """대기/추적 중인 명령 모두 취소 (연결 해제 등)"""
+        self.queue = []
+        self.pending = {}
+        self.inflight = {}
+        self.timer.stop()
+
+    def on_batch(self, rows, arrival_ns: int):
+        """
+        같은 링크의 텔레메트리 배치로 ack 확인 (CorePipeline.on_batch_received에서 호출)
+        마지막 전송보다 먼저 도착한 배치는 전송 전 상태이므로 ack로 보지 않음
+        (큐에 남아 있던 이전 배치가 전송 직후 처리되어도 오판하지 않고, ack 지연은 항상 0 이상)
+        """
+        if not self.inflight:
+            return
+        for key, command in list(self.inflight.items()):
+            if command.sent_at is None or arrival_ns < command.sent_at:
+                continue
+            if command.acked_by(rows):
+                del self.inflight[key]
+                command.done = True
+                command.acked_at = arrival_ns
+                self.acked += 1
+                self.controller.latency.record(self.source, "command_ack", elapsed_s(command.sent_at, arrival_ns))
+                self.command_acked.emit(command)
+
+    def _tick(self):
+        now = time.monotonic_ns()
+        if not self.comm.serial_connected:
+            self.clear()
+            return
+
+        # 전송: 우선순위 순서로 tick당 max_per_tick개
+        for _ in range(self.max_per_tick):
+            if not self.queue:
+                break
+            _, _, command = heapq.heappop(self.queue)
+            if command.superseded:
+                continue
+            key = command.key
+            if key is not None:
+                self.pending.pop(key, None)
+                previous = self.inflight.pop(key, None)
+                if previous is not None:
+                    previous.superseded = True
+                    self.superseded += 1
+            self._send(command, now)
+            if key is not None:
+                self.inflight[key] = command
+            else:
+                command.done = True
+
+        # ack 타임아웃: 재전송 또는 실패 처리
+        for key, command in list(self.inflight.items()):
+            if elapsed_s(command.sent_at, now) < self.ack_timeout:
+                continue
+            if command.attempts <= self.max_retries:
+                self.retried += 1
+                self._append_debug_message(
+                    f"[{self.source}] No ack for {command.describe()}, retry {command.attempts}/{self.max_retries}")
+                self._send(command, now)
+            else:
+                del self.inflight[key]
+                command.done = True
+                self.failed += 1
+                self._append_debug_message(
+                    f"[{self.source}] Command {command.describe()} failed: not acknowledged after {command.attempts} attempts")
+                self.command_failed.emit(command)
+
+        if not self.queue and not self.inflight:
+            self.timer.stop()
+
+    def _send(self, command: Telecommand, now: int):
+        command.attempts += 1
+        command.sent_at = now
+        self.sent += 1
+        self.comm.send_str(command.text())
+
+    def stats(self) -> dict:
+        return {
+            "queued": len(self.queue),
+            "inflight": len(self.inflight),
+            "sent": self.sent,
+            "acked": self.acked,
+            "retried": self.retried,
+            "failed": self.failed,
+            "superseded": self.superseded,
+        }
+
+    def _append_debug_message(self, line: str):
+        self.controller._append_debug_message(line)
@@ -0,0 +1,127 @@
+from PyQt5.QtCore import QTimer
+from PyQt5.QtGui import QTextCursor
+from collections import deque
+from datetime import datetime
+
+DEBUG_LEVELS = {"DEBUG": 10, "INFO": 20, "WARNING": 30, "ERROR": 40}
+
+# 메시지 문자열만 전달되므로 키워드로 심각도를 추정
+_LEVEL_KEYWORDS = (
+    ("ERROR", ("error", "failed", "fail ")),
+    ("WARNING", ("warning", "dropped", "not connected", "not recognized", "read-only", "no ack")),
+)
+
+
+def guess_level(line: str) -> str:
+    lower = line.lower()
+    for level, keywords in _LEVEL_KEYWORDS:
+        if any(keyword in lower for keyword in keywords):
+            return level
+    return "INFO"
+
+
+class DebugEntry:
+    __slots__ = ("time", "level", "line", "count")
+
+    def __init__(self, time: str, level: str, line: str):
+        self.time = time
+        self.level = level
+        self.line = line
+        self.count = 1
+
+    def text(self) -> str:
+        text = f"{self.time} : {self.line}"
+        return text if self.count == 1 else f"{text} ×{self.count}"
+
+
+class HandlerDebugConsole:
+    """
+    TE_GCS_DEBUG 출력 콘솔
+    - 메시지는 고정 길이 링(deque)에 보관, 위젯에는 새 줄만 덧붙임 (document 블록 수 제한)
+    - append는 버퍼에만 넣고, flush_ms 주기로 모인 메시지를 한 번에 출력 (프레임당 1회 repaint)
+    - 같은 메시지가 연속되면 한 줄로 합치고 "×N"으로 표시
+    - min_level 미만 메시지는 링에만 남기고 표시하지 않음 (set_min_level로 변경 시 링에서 다시 그림)
+    """
+
+    def __init__(self, text_edit, max_lines: int = 500, flush_ms: int = 100, min_level: str = "INFO"):
+        self.text_edit = text_edit
+        self.text_edit.setReadOnly(True)
+        self.text_edit.document().setMaximumBlockCount(max_lines)
+        self.entries = deque(maxlen=max_lines)   # 최근 메시지 (필터와 무관하게 보관)
+        self.pending = deque(maxlen=max_lines)   # 아직 위젯에 출력하지 않은 메시지
+        self.displayed_last = None               # 위젯의 마지막 줄에 해당하는 메시지
+        self.last_changed = False                # displayed_last의 ×N이 바뀌었는지
+        self.min_level = DEBUG_LEVELS[min_level]
+        self.received = 0   # append된 전체 메시지 수
+        self.collapsed = 0  # 중복으로 합쳐진 메시지 수
+
+        self.flush_timer = QTimer()
+        self.flush_timer.timeout.connect(self.flush)
+        self.flush_timer.start(flush_ms)
+
+    def append(self, line: str, level: str = None):
+        """O(1): 링/대기열에만 추가하고 위젯은 flush에서 갱신"""
+        if level is None:
+            level = guess_level(line)
+        curr_time = datetime.now().strftime("%H:%M:%S.%f")[:-3]
+        self.received += 1
+
+        last = self.entries[-1] if self.entries else None
+        if last is not None and last.line == line and last.level == level:
+            last.time = curr_time
+            last.count += 1
+            self.collapsed += 1
+            if last is self.displayed_last:
+                self.last_changed = True
+            return
+
+        entry = DebugEntry(curr_time, level, line)
+        self.entries.append(entry)
+        if DEBUG_LEVELS[level] >= self.min_level:
+            self.pending.append(entry)
+
+    def flush(self):
+        """대기 중인 메시지를 한 번의 insertText로 출력"""
+        if not self.pending and not self.last_changed:
+            return
+        scrollbar = self.text_edit.verticalScrollBar()
+        at_bottom = scrollbar.value() >= scrollbar.maximum()
+
+        cursor = QTextCursor(self.text_edit.document())
+        cursor.beginEditBlock()
+        if self.last_changed and self.displayed_last is not None:
+            # 마지막 줄만 다시 씀 (×N 갱신)
+            cursor.movePosition(QTextCursor.End)
+            cursor.movePosition(QTextCursor.StartOfBlock, QTextCursor.KeepAnchor)
+            cursor.insertText(self.displayed_last.text())
+        if self.pending:
+            text = "\n".join(entry.text() for entry in self.pending)
+            cursor.movePosition(QTextCursor.End)
+            if not self.text_edit.document().isEmpty():
+                text = "\n" + text
+            cursor.insertText(text)
+            self.displayed_last = self.pending[-1]
+            self.pending.clear()
+        cursor.endEditBlock()
+        self.last_changed = False
+
+        # 사용자가 위로 스크롤해 둔 경우에는 위치를 유지
+        if at_bottom:
+            scrollbar.setValue(scrollbar.maximum())
+
+    def set_min_level(self, level: str):
+        """표시 심각도 변경: 링에 남아 있는 메시지로 위젯을 다시 그림"""
+        self.min_level = DEBUG_LEVELS[level]
+        visible = [entry for entry in self.entries if DEBUG_LEVELS[entry.level] >= self.min_level]
+        self.text_edit.setPlainText("\n".join(entry.text() for entry in visible))
+        self.displayed_last = visible[-1] if visible else None
+        self.pending.clear()
+        self.last_changed = False
+        self.text_edit.verticalScrollBar().setValue(self.text_edit.verticalScrollBar().maximum())
+
+    def clear(self):
+        self.entries.clear()
+        self.pending.clear()
+        self.displayed_last = None
+        self.last_changed = False
+        self.text_edit.clear()
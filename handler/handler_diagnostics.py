@@ -0,0 +1,70 @@
+from PyQt5.QtCore import QTimer
+from PyQt5.QtGui import QFontDatabase
+from PyQt5.QtWidgets import QHBoxLayout, QPlainTextEdit, QPushButton, QVBoxLayout, QWidget
+from datetime import datetime
+import os
+
+from utils.link_quality import format_link
+
+
+class HandlerDiagnostics(QWidget):
+    """
+    파이프라인 진단 패널 (F12로 열기)
+    - 소스/단계별 지연 히스토그램 요약(p50/p95/p99/max)과 링크 품질을 1초마다 갱신 (창이 보일 때만)
+    - Dump: logs/latency_YYYYmmdd_HHMMSS.json으로 저장, Reset: 히스토그램 초기화
+    """
+
+    def __init__(self, controller, refresh_ms: int = 1000):
+        super().__init__()
+        self.controller = controller
+        self.setWindowTitle("HJ GCS Diagnostics")
+        self.resize(640, 360)
+
+        self.text = QPlainTextEdit()
+        self.text.setReadOnly(True)
+        self.text.setFont(QFontDatabase.systemFont(QFontDatabase.FixedFont))
+
+        self.btn_reset = QPushButton("Reset")
+        self.btn_reset.clicked.connect(self.on_reset_clicked)
+        self.btn_dump = QPushButton("Dump")
+        self.btn_dump.clicked.connect(self.on_dump_clicked)
+
+        buttons = QHBoxLayout()
+        buttons.addStretch()
+        buttons.addWidget(self.btn_reset)
+        buttons.addWidget(self.btn_dump)
+        layout = QVBoxLayout(self)
+        layout.addWidget(self.text)
+        layout.addLayout(buttons)
+
+        self.refresh_timer = QTimer()
+        self.refresh_timer.timeout.connect(self.refresh)
+        self.refresh_timer.start(refresh_ms)
+
+    def refresh(self):
+        if not self.isVisible():
+            return
+        controller = self.controller
+        lines = [
+            controller.latency.format_table(),
+            "",
+            f"UMB link: {format_link(controller.umb_handler.link)}",
+            f"TLM link: {format_link(controller.tlm_handler.link)}",
+            f"UMB commands: {controller.umb_commands.stats()}",
+            f"TLM commands: {controller.tlm_commands.stats()}",
+            f"fusion: {controller.fusion.stats()}",
+            "",
+            f"widgets updated last frame: {controller.last_frame_widget_updates}",
+            f"log dropped: {controller.log_handler.dropped}",
+        ]
+        self.text.setPlainText("\n".join(lines))
+
+    def on_reset_clicked(self):
+        self.controller.latency.reset()
+        self.refresh()
+
+    def on_dump_clicked(self):
+        path = os.path.join(self.controller.log_handler.log_dir,
+                            f"latency_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json")
+        self.controller.latency.dump(path)
+        self.controller._append_debug_message(f"[CORE] Latency stats saved to {path}")
@@ -1,67 +1,67 @@
-from PyQt5.QtCore import QObject, QTimer
+from PyQt5.QtCore import QObject
 from datetime import datetime
-import csv
+import json
 import os
+import queue
+import threading
+import time
 
-from utils.data_types import DataVehicle, ReceivedPacket
+from utils.clock import elapsed_s, now_ns, to_wall_ns
+from utils.data_types import DataVehicle, ReceivedPacket, vehicle_to_row
+from utils.log_index import INDEX_EVERY_ROWS
+from utils.log_format import LOG_CSV_HEADER, LOG_VERSION, LOG_WRITERS, SegmentedLogWriter, check_compression
+from utils.latency import LatencyStats
 
 
 
 class HandlerLog(QObject):
-    def __init__(self):
+    def __init__(self, log_format: str = "csv", queue_size: int = 1000, latency: LatencyStats = None,
+                 compression: str = None, segment_bytes: int = None, segment_seconds: float = None,
+                 flush_interval: float = 1.0, fsync_interval: float = None, index_every: int = INDEX_EVERY_ROWS):
+        """
+        log_format: "csv" (기존 형식) 또는 "bin" (고정 폭 바이너리, utils.log_format으로 CSV 변환 가능)
+        queue_size: writer 스레드로 넘기는 배치 큐 크기 (가득 차면 해당 배치는 버리고 dropped 증가)
+        latency: 지정하면 log_enqueue/log_write/log_flush 단계 지연을 기록
+        compression: None / "gz" / "zst" (writer 스레드에서 스트리밍 압축, zst는 zstandard 패키지 필요)
+        segment_bytes / segment_seconds: 세그먼트 파일 최대 크기(압축 후) / 길이, 둘 다 None이면 세션당 파일 하나
+        flush_interval: 파일 flush 주기(초), 0이면 배치마다 flush (비정상 종료 시 이 시간만큼의 데이터 유실 가능)
+        fsync_interval: fsync 주기(초), None이면 fsync 안 함(OS에 맡김), 0이면 flush할 때마다
+        index_every: 세그먼트마다 sidecar 인덱스 기록 (checkpoint 간격 행 수, None/0이면 기록 안 함)
+        """
         super().__init__()
+        if log_format not in LOG_WRITERS:
+            raise ValueError(f"Unknown log format: {log_format}")
+        check_compression(compression)
+        self.log_format = log_format
+        self.compression = compression
+        self.segment_bytes = segment_bytes
+        self.segment_seconds = segment_seconds
+        self.fsync_interval = fsync_interval
+        self.index_every = index_every
+        self.manifest_path = None
+        self.session = None
         self.is_logging = False
-        self.log_files = {
-            'UMB': None,
-            'TLM': None
-        }
         self.log_writers = {
             'UMB': None,
             'TLM': None
         }
-        
-        # 버퍼 관련 변수
-        self.buffers = {
-            'UMB': [],
-            'TLM': []
-        }
-        self.buffer_size = 100  # 버퍼 크기 (100개 데이터)
-        self.flush_timer = QTimer()
-        self.flush_timer.timeout.connect(self._flush_buffers)
-        self.flush_interval = 1000  # 1초마다 버퍼 비우기
-        
+
+        # writer 스레드 관련 변수
+        self.queue = queue.Queue(maxsize=queue_size)
+        self.writer_thread = None
+        self.flush_interval = flush_interval
+        self.dropped = 0           # 큐가 가득 차서 버린 패킷 수
+
+        # 단계별 지연 측정 (arrival: 시리얼 도착 time.monotonic_ns)
+        self.latency = latency
+        self.unflushed = {}        # source -> (flush 전 가장 오래된 arrival, 패킷 수)
+
         # 각 소스별 CSV 헤더 정의
         self.headers = {
-            'UMB': [
-                'timestamp',
-                'boot_time',
-                'temp',
-                'voltage',
-                'sv1', 'sv2', 'sv3', 'sv4', 'sv5', 'sv6', 'sv7', 'sv8',
-                'mv1', 'mv2', 'mv3', 'mv4',
-                'va1', 'va2', 'va3', 'va4', 'va5', 'va6', 'va7', 'va8',
-                'tc1', 'tc2', 'tc3', 'tc4', 'tc5', 'tc6',
-                'ir',
-                'ip',
-                'iy',
-                'fault'
-            ],
-            'TLM': [
-                'timestamp',
-                'boot_time',
-                'temp',
-                'voltage',
-                'sv1', 'sv2', 'sv3', 'sv4', 'sv5', 'sv6', 'sv7', 'sv8',
-                'mv1', 'mv2', 'mv3', 'mv4',
-                'va1', 'va2', 'va3', 'va4', 'va5', 'va6', 'va7', 'va8',
-                'tc1', 'tc2', 'tc3', 'tc4', 'tc5', 'tc6',
-                'ir',
-                'ip',
-                'iy',
-                'fault'
-            ]
+            'UMB': LOG_CSV_HEADER,
+            'TLM': LOG_CSV_HEADER,
         }
-        
+
         # 로그 디렉토리 생성
         self.log_dir = "logs"
         if not os.path.exists(self.log_dir):
@@ -72,28 +72,33 @@ class HandlerLog(QObject):
         if self.is_logging:
             return False
 
-        self.is_logging = True
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        
+        self.session = timestamp
+        self.manifest_path = os.path.join(self.log_dir, f"{timestamp}_session.json")
+
         # 연결된 소스에 대해서만 로그 파일 생성
         for source in connected_sources:
-            filename = os.path.join(self.log_dir, f"{timestamp}_{source}.csv")
-            self.log_files[source] = open(filename, 'w', newline='')
-            self.log_writers[source] = csv.writer(self.log_files[source])
-            
-            # 소스별 헤더 작성
-            if source in self.headers and self.headers[source]:
-                self.log_writers[source].writerow(self.headers[source])
-            else:
+            if source not in self.headers:
                 # TODO: GSE 헤더가 정의되지 않은 경우 처리
                 self._append_debug_message(f"[LOG] Warning: No header defined for {source}")
-            
-            # 버퍼 초기화
-            self.buffers[source] = []
-        
-        # 버퍼 플러시 타이머 시작
-        self.flush_timer.start(self.flush_interval)
-        
+                continue
+            self.log_writers[source] = SegmentedLogWriter(
+                os.path.join(self.log_dir, f"{timestamp}_{source}"),
+                log_format=self.log_format,
+                compression=self.compression,
+                segment_bytes=self.segment_bytes,
+                segment_seconds=self.segment_seconds,
+                sync_on_close=self.fsync_interval is not None,
+                on_segment=self._write_manifest,
+                index_every=self.index_every,
+            )
+        self._write_manifest()
+
+        self.dropped = 0
+        self.is_logging = True
+        self.writer_thread = threading.Thread(target=self._writer_loop, name="log-writer", daemon=True)
+        self.writer_thread.start()
+
         return True
 
     def stop_logging(self):
@@ -101,70 +106,148 @@ class HandlerLog(QObject):
         if not self.is_logging:
             return False
 
-        # 버퍼 플러시 타이머 중지
-        self.flush_timer.stop()
-        
-        # 남은 데이터 모두 파일에 쓰기
-        self._flush_buffers(force=True)
-        
         self.is_logging = False
-        
-        # 모든 로그 파일 닫기
-        for source in ['UMB', 'TLM']:
-            if self.log_files[source]:
-                self.log_files[source].close()
-                self.log_files[source] = None
-                self.log_writers[source] = None
-        
+
+        # writer 스레드가 남은 데이터를 모두 쓰고 종료할 때까지 대기
+        self.queue.put(None)
+        self.writer_thread.join()
+        self.writer_thread = None
+
+        # 모든 로그 파일 닫기 (manifest에 마지막 세그먼트 정보 기록)
+        for source in self.log_writers:
+            if self.log_writers[source]:
+                self.log_writers[source].close()
+        self._write_manifest(closed=True)
+        for source in self.log_writers:
+            self.log_writers[source] = None
+
+        if self.dropped:
+            self._append_debug_message(f"[LOG] {self.dropped} packets dropped (writer queue full)")
+
         return True
 
     def append(self, packet: ReceivedPacket, source: str):
-        """데이터를 버퍼에 추가"""
-        if not self.is_logging or source not in self.log_writers or not self.log_writers[source]:
-            return
-
-        # 소스별 데이터 처리
+        """데이터를 writer 큐에 추가"""
         if source in ['UMB', 'TLM']:
             # UMB와 TLM은 동일한 DataVehicle 구조 사용
-            self._append_vehicle_data(packet, source)
-
-    def _append_vehicle_data(self, packet: ReceivedPacket, source: str):
-        """Vehicle 데이터를 버퍼에 추가"""
-        data = packet.data
-        self.buffers[source].append([
-            packet.timestamp.strftime("%Y-%m-%d %H:%M:%S.%f"),
-            data.boot_time,
-            data.temp,
-            data.voltage,
-            data.sv[0], data.sv[1], data.sv[2], data.sv[3], data.sv[4], data.sv[5], data.sv[6], data.sv[7],
-            data.mv[0], data.mv[1], data.mv[2], data.mv[3],
-            data.va[0], data.va[1], data.va[2], data.va[3], data.va[4], data.va[5], data.va[6], data.va[7],
-            data.tc[0], data.tc[1], data.tc[2], data.tc[3], data.tc[4], data.tc[5],
-            data.ir,
-            data.ip,
-            data.iy,
-            data.fault[0], data.fault[1], data.fault[2], data.fault[3], data.fault[4]
-        ])
-
-        # 버퍼가 가득 차면 파일에 쓰기
-        if len(self.buffers[source]) >= self.buffer_size:
-            self._flush_buffer(source)
-
-    def _flush_buffer(self, source):
-        """특정 소스의 버퍼를 파일에 쓰기"""
-        if not self.buffers[source]:
+            self._enqueue(source, vehicle_to_row(packet.data), packet.timestamp)
+
+    def append_rows(self, rows, arrival_ns: int, source: str, widen: bool = False):
+        """
+        parse_csv_batch 결과(N x CSV_FIELD_COUNT)를 writer 큐에 한 번에 추가
+        arrival_ns: 배치 도착 시각 (time.monotonic_ns, 한 배치는 같은 readyRead에서 수신되었으므로 공통 사용)
+        widen: 바이너리 링크에서 float32로 수신한 배치 (CSV 로그는 writer 스레드에서 10진 표현 정리)
+        """
+        self._enqueue(source, rows, arrival_ns, widen)
+
+    def _enqueue(self, source, rows, arrival_ns: int, widen: bool = False):
+        if not self.is_logging or not self.log_writers.get(source):
             return
-
-        # 버퍼의 모든 데이터를 파일에 쓰기
-        self.log_writers[source].writerows(self.buffers[source])
-        # 버퍼 비우기
-        self.buffers[source] = []
-
-    def _flush_buffers(self, force=False):
-        """모든 버퍼를 파일에 쓰기"""
-        for source in self.buffers:
-            if force or len(self.buffers[source]) > 0:
-                self._flush_buffer(source)
+        try:
+            self.queue.put_nowait((source, rows, arrival_ns, widen))
+        except queue.Full:
+            self.dropped += len(rows)
+            return
+        if self.latency is not None:
+            self.latency.record(source, "log_enqueue", elapsed_s(arrival_ns), len(rows))
+
+    def _writer_loop(self):
+        """
+        writer 스레드: 큐에서 배치를 꺼내 파일에 기록
+        벽시계 변환/포맷팅(타임스탬프 문자열 변환 포함), 압축, 세그먼트 전환, flush/fsync도 모두 이 스레드에서 수행
+        """
+        last_flush = last_sync = time.monotonic()
+        while True:
+            try:
+                item = self.queue.get(timeout=self.flush_interval or 1.0)
+            except queue.Empty:
+                item = ()
+
+            if item is None:
+                break
+            if item:
+                self._write_item(item)
+
+            now = time.monotonic()
+            if now - last_flush >= self.flush_interval:
+                sync = self.fsync_interval is not None and now - last_sync >= self.fsync_interval
+                self._flush_writers(sync)
+                last_flush = now
+                if sync:
+                    last_sync = now
+
+        # 종료 신호 전에 들어온 데이터까지 모두 기록
+        while True:
+            try:
+                item = self.queue.get_nowait()
+            except queue.Empty:
+                break
+            if item:
+                self._write_item(item)
+        self._flush_writers(self.fsync_interval is not None)
+
+    def _write_item(self, item):
+        source, rows, arrival_ns, widen = item
+        self._write(source, rows, to_wall_ns(arrival_ns), widen)
+        if self.latency is not None:
+            self.latency.record(source, "log_write", elapsed_s(arrival_ns), len(rows))
+            oldest, count = self.unflushed.get(source, (arrival_ns, 0))
+            self.unflushed[source] = (oldest, count + len(rows))
+
+    def _write(self, source, rows, timestamp: int, widen: bool = False):
+        """timestamp: 수신 시각 (epoch ns)"""
+        writer = self.log_writers.get(source)
+        if writer is None:
+            return
+        try:
+            writer.write(rows, timestamp, widen)
+        except Exception as e:
+            self._append_debug_message(f"[LOG] Write error ({source}): {e}")
+
+    def _flush_writers(self, sync: bool = False):
+        """모든 writer의 버퍼를 파일에 쓰기 (sync: fsync로 디스크 기록까지 보장)"""
+        for writer in self.log_writers.values():
+            if writer:
+                try:
+                    writer.sync() if sync else writer.flush()
+                except Exception as e:
+                    self._append_debug_message(f"[LOG] Flush error: {e}")
+        if self.latency is not None and self.unflushed:
+            now = now_ns()
+            for source, (oldest, count) in self.unflushed.items():
+                self.latency.record(source, "log_flush", elapsed_s(oldest, now), count)
+            self.unflushed = {}
+
+    def _write_manifest(self, closed: bool = False):
+        """
+        세션 manifest ({timestamp}_session.json): 소스별 세그먼트 목록과 기록 설정
+        세그먼트를 열고 닫을 때마다 임시 파일에 쓴 뒤 교체하므로 비정상 종료 후에도 완성된 파일이 남음
+        """
+        if self.manifest_path is None:
+            return
+        manifest = {
+            "session": self.session,
+            "log_version": LOG_VERSION,
+            "format": self.log_format,
+            "compression": self.compression,
+            "segment_bytes": self.segment_bytes,
+            "segment_seconds": self.segment_seconds,
+            "flush_interval": self.flush_interval,
+            "fsync_interval": self.fsync_interval,
+            "index_every": self.index_every,
+            "closed": closed,
+            "sources": {
+                source: writer.segments
+                for source, writer in self.log_writers.items() if writer is not None
+            },
+        }
+        tmp_path = self.manifest_path + ".tmp"
+        try:
+            with open(tmp_path, 'w') as f:
+                json.dump(manifest, f, indent=2)
+            os.replace(tmp_path, self.manifest_path)
+        except OSError as e:
+            self._append_debug_message(f"[LOG] Manifest write error: {e}")
 
     def _append_debug_message(self, message):
         """디버그 메시지 출력 (TODO: 실제 구현 필요)"""
@@ -0,0 +1,141 @@
+from PyQt5.QtCore import QObject, QTimer
+from PyQt5.QtNetwork import QAbstractSocket, QHostAddress, QTcpServer, QUdpSocket
+import numpy as np
+
+from utils.protocol_binary import FRAME_SIZE, encode_rows
+
+RELAY_SOURCES = ('UMB', 'TLM')  # 포트 번호: base_port + 인덱스 (UMB = base, TLM = base + 1)
+MAX_DATAGRAM_FRAMES = 12        # UDP datagram당 프레임 수 (12 x 114 bytes < 1500 MTU)
+
+
+class HandlerRelay(QObject):
+    """
+    디코딩된 텔레메트리를 네트워크로 재송신하는 릴레이 (시리얼이 연결된 GCS에서 실행)
+    - 소스별 TCP 서버: UMB = port, TLM = port + 1
+      구독 GCS는 "tcp://host:port"를 시리얼 포트 대신 연결 (바이너리 프레임, 프로토콜 자동 감지)
+    - multicast 지정 시 같은 프레임을 UDP로도 송신 (UMB = multicast_port, TLM = multicast_port + 1)
+    - publish는 배치를 모아두기만 하고, tick_ms마다 소스별로 한 번 인코딩해 모든 구독자에게 write
+    - write는 비동기(QTcpSocket 버퍼)이며, 송신 대기량이 max_backlog를 넘은 구독자에게는
+      그 tick의 배치를 버림 (느린 구독자가 수신 파이프라인을 막지 않음)
+    - 구독자가 보낸 명령은 command_host에서 접속한 구독자만 해당 소스 링크로 전달, 나머지는 무시
+    """
+
+    def __init__(self, controller, *, port: int, host: str = "0.0.0.0", multicast: str = None,
+                 multicast_port: int = None, command_host: str = None, tick_ms: int = 20,
+                 max_backlog: int = 256 * 1024):
+        super().__init__()
+        self.controller = controller
+        self.port = port
+        self.command_host = QHostAddress(command_host) if command_host else None
+        self.max_backlog = max_backlog
+
+        self.pending = {source: [] for source in RELAY_SOURCES}
+        self.clients = {source: [] for source in RELAY_SOURCES}
+        self.servers = {}
+
+        # 통계
+        self.bytes_sent = 0
+        self.frames_sent = 0
+        self.dropped = 0         # 느린 구독자에게 버린 패킷 수
+        self.rejected = 0        # 명령 권한이 없는 구독자가 보낸 바이트 수
+
+        for offset, source in enumerate(RELAY_SOURCES):
+            server = QTcpServer()
+            if not server.listen(QHostAddress(host), port + offset):
+                raise OSError(f"Relay: cannot listen on {host}:{port + offset} ({server.errorString()})")
+            server.newConnection.connect(lambda source=source: self._on_new_connection(source))
+            self.servers[source] = server
+
+        self.udp = None
+        if multicast:
+            self.udp = QUdpSocket()
+            self.multicast = QHostAddress(multicast)
+            self.multicast_port = multicast_port if multicast_port else port
+
+        self.timer = QTimer()
+        self.timer.timeout.connect(self._tick)
+        self.timer.start(tick_ms)
+
+    # ---------- public ----------
+    def publish(self, rows, source: str):
+        """디코딩된 배치 추가 (CorePipeline.on_batch_received에서 호출)"""
+        if source in self.pending and (self.clients[source] or self.udp is not None):
+            self.pending[source].append(rows)
+
+    def close(self):
+        self.timer.stop()
+        for source in RELAY_SOURCES:
+            for client in self.clients[source]:
+                client.abort()
+            self.clients[source] = []
+            self.servers[source].close()
+        if self.udp is not None:
+            self.udp.close()
+
+    def stats(self) -> dict:
+        return {
+            "clients": {source: len(clients) for source, clients in self.clients.items()},
+            "bytes_sent": self.bytes_sent,
+            "frames_sent": self.frames_sent,
+            "dropped": self.dropped,
+            "rejected_bytes": self.rejected,
+        }
+
+    # ---------- internal ----------
+    def _on_new_connection(self, source: str):
+        server = self.servers[source]
+        while server.hasPendingConnections():
+            client = server.nextPendingConnection()
+            client.setSocketOption(QAbstractSocket.LowDelayOption, 1)
+            allowed = self.command_host is not None and client.peerAddress().isEqual(
+                self.command_host, QHostAddress.TolerantConversion)
+            client.readyRead.connect(lambda client=client, allowed=allowed: self._on_client_read(source, client, allowed))
+            client.disconnected.connect(lambda client=client: self._on_client_disconnected(source, client))
+            self.clients[source].append(client)
+            role = "command station" if allowed else "read-only"
+            self._append_debug_message(
+                f"[RELAY] {source} subscriber {client.peerAddress().toString()}:{client.peerPort()} ({role})")
+
+    def _on_client_disconnected(self, source: str, client):
+        if client in self.clients[source]:
+            self.clients[source].remove(client)
+            self._append_debug_message(f"[RELAY] {source} subscriber {client.peerAddress().toString()} left")
+        client.deleteLater()
+
+    def _on_client_read(self, source: str, client, allowed: bool):
+        data = client.readAll().data()
+        if not allowed:
+            if self.rejected == 0:
+                self._append_debug_message(
+                    f"[RELAY] Ignoring commands from {client.peerAddress().toString()} (not the command station)")
+            self.rejected += len(data)
+            return
+        handler = {'UMB': self.controller.umb_handler, 'TLM': self.controller.tlm_handler}[source]
+        handler.send_bytes(data)
+
+    def _tick(self):
+        for source in RELAY_SOURCES:
+            batches = self.pending[source]
+            if not batches:
+                continue
+            self.pending[source] = []
+            rows = batches[0] if len(batches) == 1 else np.concatenate(batches)
+            data = encode_rows(rows)
+            n = len(rows)
+
+            for client in self.clients[source]:
+                if client.bytesToWrite() > self.max_backlog:
+                    self.dropped += n
+                    continue
+                client.write(data)
+                self.bytes_sent += len(data)
+                self.frames_sent += n
+
+            if self.udp is not None:
+                port = self.multicast_port + RELAY_SOURCES.index(source)
+                step = MAX_DATAGRAM_FRAMES * FRAME_SIZE
+                for start in range(0, len(data), step):
+                    self.udp.writeDatagram(data[start:start + step], self.multicast, port)
+
+    def _append_debug_message(self, line: str):
+        self.controller._append_debug_message(line)
@@ -0,0 +1,153 @@
+from PyQt5.QtCore import QObject, QTimer, pyqtSignal
+import time
+import numpy as np
+
+from utils.data_types import CSV_FIELD_COUNT
+from utils.log_reader import open_log_reader
+
+
+
+class HandlerReplay(QObject):
+    """
+    기록된 로그(logs/*.csv, *.bin)를 HandlerComm 대신 컨트롤러에 공급하는 재생 소스
+    - HandlerComm과 같은 계약: controller.on_batch_received(rows, arrival_ns, source[, decoded_ns])
+    - 로그는 mmap/memmap으로 chunk 단위로 읽으므로 파일 전체를 메모리에 올리지 않음
+    - speed: 1.0 = 실시간, N = N배속, 0 = 최대 속도 (처리량 벤치마크 용도)
+    """
+    finished = pyqtSignal()
+
+    def __init__(self, controller, *, source: str, path: str, speed: float = 1.0,
+                 tick_ms: int = 10, max_batch: int = 5000):
+        super().__init__()
+        self.controller = controller
+        self.source = source
+        self.path = path
+        self.speed = speed
+        self.tick_ms = tick_ms
+        self.max_batch = max_batch
+
+        self.reader = open_log_reader(path)
+        if self.reader.calibrated:
+            controller._append_debug_message(
+                f"[REPLAY] {path} has calibrated VA/TC columns, shown without applying calibration again")
+        self.pending = np.empty((0, CSV_FIELD_COUNT), dtype=np.float64)
+
+        # HandlerComm 호환용 상태 (재생 중이면 연결된 것으로 간주)
+        self.serial_connected = False
+
+        # 재생 시계 기준점 (monotonic 시각 <-> boot_time)
+        self.anchor_wall = 0.0
+        self.anchor_boot = None
+        self.current_boot_time = None
+
+        # 통계
+        self.packet_count = 0
+        self.started_at = 0.0
+
+        self.timer = QTimer()
+        self.timer.timeout.connect(self._on_tick)
+
+    # ---------- public ----------
+    def start(self):
+        """재생 시작 (일시정지 상태에서는 이어서 재생)"""
+        self.serial_connected = True
+        if not self.started_at:
+            self.started_at = time.monotonic()
+        self._reset_anchor()
+        self.timer.start(0 if self.speed <= 0 else self.tick_ms)
+
+    def pause(self):
+        self.timer.stop()
+
+    def stop(self):
+        self.timer.stop()
+        self.serial_connected = False
+
+    def shutdown(self):
+        self.stop()
+        self.reader.close()
+
+    def set_speed(self, speed: float):
+        self.speed = speed
+        self._reset_anchor()
+        if self.timer.isActive():
+            self.timer.start(0 if self.speed <= 0 else self.tick_ms)
+
+    def seek(self, boot_time: int):
+        """boot_time(ms) 위치로 이동 (앞/뒤 모두, 이전 구간 표시는 비우고 fusion 기준을 새로 잡음)"""
+        self.reader.seek_boot_time(boot_time)
+        self.pending = self.pending[:0]
+        self.current_boot_time = None
+        self._reset_anchor()
+        self.controller.resync_source(self.source, clear_history=True)
+
+    def send_bytes(self, data: bytes) -> bool:
+        self.controller._append_debug_message(f"[{self.source}] Replay source is read-only. Cannot send bytes.")
+        return False
+
+    def send_str(self, s: str, add_newline: bool = True) -> bool:
+        return self.send_bytes(s.encode("utf-8"))
+
+    # ---------- internal ----------
+    def _reset_anchor(self):
+        self.anchor_wall = time.monotonic()
+        self.anchor_boot = self.current_boot_time
+
+    def _fill_pending(self) -> bool:
+        """pending이 비어 있으면 reader에서 다음 chunk를 읽음. 더 읽을 것이 없으면 False"""
+        while len(self.pending) == 0:
+            if self.reader.eof:
+                return False
+            self.pending = self.reader.read()
+        return True
+
+    def _on_tick(self):
+        if self.speed <= 0:
+            self._emit_fast()
+        else:
+            self._emit_timed()
+
+    def _emit_fast(self):
+        """최대 속도: tick마다 max_batch개씩 전달"""
+        if not self._fill_pending():
+            self._finish()
+            return
+        batch, self.pending = self.pending[:self.max_batch], self.pending[self.max_batch:]
+        self._emit(batch)
+
+    def _emit_timed(self):
+        """실시간/N배속: 재생 시계가 가리키는 boot_time까지의 행을 한 번에 전달"""
+        if not self._fill_pending():
+            self._finish()
+            return
+
+        if self.anchor_boot is None:
+            self.anchor_boot = self.pending[0, 0]
+            self.anchor_wall = time.monotonic()
+        target = self.anchor_boot + (time.monotonic() - self.anchor_wall) * 1000.0 * self.speed
+
+        batches = []
+        while self._fill_pending():
+            n = int(np.searchsorted(self.pending[:, 0], target, side="right"))
+            if n == 0:
+                break
+            batches.append(self.pending[:n])
+            self.pending = self.pending[n:]
+            if len(self.pending) > 0:
+                break
+
+        if batches:
+            self._emit(batches[0] if len(batches) == 1 else np.vstack(batches))
+
+    def _emit(self, rows):
+        self.current_boot_time = rows[-1, 0]
+        self.packet_count += len(rows)
+        self.controller.on_batch_received(rows, time.monotonic_ns(), source=self.source)
+
+    def _finish(self):
+        self.stop()
+        elapsed = time.monotonic() - self.started_at
+        rate = self.packet_count / elapsed if elapsed > 0 else 0.0
+        self.controller._append_debug_message(
+            f"[REPLAY] {self.source} finished: {self.packet_count} packets in {elapsed:.2f}s ({rate:.0f} pkt/s)")
+        self.finished.emit()
@@ -0,0 +1,218 @@
+from PyQt5.QtCore import QObject, Qt, pyqtSignal, pyqtSlot
+from datetime import datetime
+import csv
+import os
+import threading
+import time
+
+from handler.handler_command import PRIORITY_ABORT
+from utils.sequence import Sequence, SequenceStep
+
+# 목표 시각 직전까지는 Event.wait로 잠들고, 마지막 SPIN_S 초는 monotonic 시계를 보며 대기
+SPIN_S = 0.002
+
+
+class HandlerSequence(QObject):
+    """
+    GCS 측 타이밍 시퀀스 실행기
+    - 전용 파이썬 스레드에서 time.monotonic 기준으로 단계를 실행하므로 GUI 갱신 부하와 무관하게 동작
+    - 명령은 실행 스레드에서 source 링크의 HandlerCommand.send_now로 바로 전송
+      (쓰기는 comm worker 스레드로 queued, GUI 이벤트 루프를 거치지 않음)
+      ack 확인/재전송/타임아웃은 HandlerCommand가 처리, ABORT 단계는 ABORT 우선순위로 전송
+    - HOLD: on_batch로 들어오는 텔레메트리가 조건을 만족할 때까지 대기, 대기한 만큼 이후 단계가 밀림
+      TIMEOUT을 넘기면 시퀀스 중단 후 ABORT 단계 전송
+    - 단계마다 계획 시각/실행 시각/링크 전송 시각(T0 기준 초)과 ack 지연(ms)을 records에 기록, save_report로 CSV 저장
+      전송 오차(error_ms)는 링크 전송 시각 기준
+    """
+    step_dispatched = pyqtSignal(object)  # record dict
+    finished = pyqtSignal(str)            # "completed" / "aborted" / "hold timeout"
+
+    def __init__(self, controller, sequence: Sequence, *, source: str = 'UMB', commands=None, calibration=None):
+        super().__init__()
+        self.controller = controller
+        self.sequence = sequence
+        self.source = source
+        if commands is None:
+            commands = {'UMB': controller.umb_commands, 'TLM': controller.tlm_commands}[source]
+        self.commands = commands
+        self.calibration = calibration
+        self._tracked = {}  # Telecommand -> record (ack 대기 중)
+
+        self.records = []
+        self.status = "idle"
+        self.t0 = None
+
+        self._thread = None
+        self._stop = threading.Event()
+        self._hold = None                 # 대기 중인 HoldCondition
+        self._latest = None               # 마지막 텔레메트리 행 (1 x CSV_FIELD_COUNT)
+        self._hold_met = threading.Event()
+        self._lock = threading.Lock()
+
+        # 완료 처리는 GUI 스레드에서 (실행 스레드에서 emit -> queued)
+        self.finished.connect(self._on_finished, Qt.QueuedConnection)
+        self.commands.command_acked.connect(self._on_command_acked)
+        self.commands.command_failed.connect(self._on_command_failed)
+
+    # ---------- public ----------
+    def start(self):
+        if self._thread is not None:
+            return
+        self.status = "running"
+        self._thread = threading.Thread(target=self._run, name="sequence", daemon=True)
+        self._thread.start()
+
+    def abort(self):
+        """수동 중단 (ABORT 단계는 실행 스레드에서 전송)"""
+        self._stop.set()
+        self._hold_met.set()
+
+    def wait(self, timeout: float = None) -> bool:
+        if self._thread is None:
+            return True
+        self._thread.join(timeout)
+        return not self._thread.is_alive()
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def on_batch(self, rows, source: str):
+        """텔레메트리 배치 (CorePipeline.on_batch_received에서 호출, GUI 스레드)"""
+        if source != self.source:
+            return
+        self._latest = rows[-1:]
+        with self._lock:
+            hold = self._hold
+        if hold is not None and hold.satisfied(rows, self.calibration):
+            self._hold_met.set()
+
+    # ---------- 실행 스레드 ----------
+    def _run(self):
+        self.t0 = time.monotonic()
+        shift = 0.0  # HOLD로 밀린 시간
+        status = "completed"
+
+        for index, step in enumerate(self.sequence.steps):
+            planned = step.offset + shift
+            if not self._sleep_until(self.t0 + planned):
+                status = "aborted"
+                break
+
+            if step.kind == "HOLD":
+                met, waited = self._wait_hold(step)
+                self._record(index, step, planned, planned + waited, f"held {waited * 1000:.1f} ms")
+                if not met:
+                    status = "aborted" if self._stop.is_set() else "hold timeout"
+                    break
+                shift += waited
+                continue
+
+            self._dispatch(index, step, planned)
+
+        if status != "completed":
+            for step in self.sequence.abort_steps:
+                self._dispatch(-1, step, None, "abort")
+
+        self.status = status
+        self.finished.emit(status)
+
+    @pyqtSlot(str)
+    def _on_finished(self, status: str):
+        summary = self.summary()
+        error = "" if summary["max_abs_error_ms"] is None else f", max dispatch error {summary['max_abs_error_ms']:.2f} ms"
+        ack = "" if summary["max_ack_ms"] is None else f", max ack {summary['max_ack_ms']:.1f} ms"
+        self.controller._append_debug_message(f"[SEQ] {self.sequence.name or 'sequence'} {status}{error}{ack}")
+
+    def _on_command_acked(self, command):
+        record = self._tracked.pop(command, None)
+        if record is not None:
+            record["ack_ms"] = (command.acked_at - command.sent_at) * 1e-6
+
+    def _on_command_failed(self, command):
+        record = self._tracked.pop(command, None)
+        if record is not None:
+            record["note"] = (record["note"] + ", " if record["note"] else "") + "no ack"
+
+    def _sleep_until(self, due: float) -> bool:
+        """due(monotonic)까지 대기, 중단되면 False"""
+        remaining = due - time.monotonic()
+        if remaining > SPIN_S and self._stop.wait(remaining - SPIN_S):
+            return False
+        while time.monotonic() < due:
+            if self._stop.is_set():
+                return False
+        return not self._stop.is_set()
+
+    def _wait_hold(self, step: SequenceStep):
+        """(만족 여부, 대기 시간)"""
+        start = time.monotonic()
+        self._hold_met.clear()
+        with self._lock:
+            self._hold = step.condition
+        # 이미 만족한 상태면 최근 텔레메트리로 바로 통과
+        latest = self._latest
+        if latest is not None and step.condition.satisfied(latest, self.calibration):
+            self._hold_met.set()
+        met = self._hold_met.wait(step.condition.timeout)
+        with self._lock:
+            self._hold = None
+        return met and not self._stop.is_set(), time.monotonic() - start
+
+    def _dispatch(self, index, step: SequenceStep, planned, note=""):
+        """명령 단계 실행: 실행 스레드에서 바로 전송하고 ack는 HandlerCommand가 추적"""
+        actual = time.monotonic() - self.t0
+        kind, idx, value = step.command()
+        command = self.commands.send_now(kind, idx, value, PRIORITY_ABORT if note == "abort" else None)
+        if command is None:
+            self._record(index, step, planned, actual, (note + ", " if note else "") + "not sent")
+            return
+        sent = command.sent_at * 1e-9 - self.t0
+        record = self._record(index, step, planned, actual, note, sent)
+        if command.key is not None:
+            self._tracked[command] = record
+
+    def _record(self, index, step, planned, actual, note="", sent=None):
+        # 전송 오차는 링크로 넘긴 시각 기준 (전송하지 않은 단계/HOLD는 실행 시각 기준)
+        at = actual if sent is None else sent
+        record = {
+            "step": index,
+            "line": step.line_no,
+            "action": step.describe(),
+            "planned_s": planned,
+            "actual_s": actual,
+            "error_ms": None if planned is None else (at - planned) * 1000.0,
+            "sent_s": sent,   # 링크로 전송한 시각
+            "ack_ms": None,   # 전송 -> 텔레메트리 상태 반영 (SV/MV만)
+            "note": note,
+        }
+        self.records.append(record)
+        self.step_dispatched.emit(record)
+        return record
+
+    def summary(self) -> dict:
+        """명령 단계의 계획 대비 전송 오차 (ms)"""
+        errors = [abs(r["error_ms"]) for r in self.records
+                  if r["error_ms"] is not None and r["sent_s"] is not None]
+        acks = [r["ack_ms"] for r in self.records if r["ack_ms"] is not None]
+        return {
+            "status": self.status,
+            "steps": len(errors),
+            "max_abs_error_ms": max(errors) if errors else None,
+            "mean_abs_error_ms": sum(errors) / len(errors) if errors else None,
+            "acked": len(acks),
+            "max_ack_ms": max(acks) if acks else None,
+            "mean_ack_ms": sum(acks) / len(acks) if acks else None,
+        }
+
+    def save_report(self, path: str = None) -> str:
+        """계획/실제 전송 시각을 CSV로 저장 (기본: logs/YYYYMMDD_HHMMSS_SEQ.csv)"""
+        if path is None:
+            path = os.path.join(self.controller.log_handler.log_dir,
+                                f"{datetime.now().strftime('%Y%m%d_%H%M%S')}_SEQ.csv")
+        with open(path, "w", newline="") as f:
+            writer = csv.DictWriter(f, fieldnames=["step", "line", "action", "planned_s", "actual_s", "error_ms",
+                                                   "sent_s", "ack_ms", "note"])
+            writer.writeheader()
+            writer.writerows(self.records)
+        return path
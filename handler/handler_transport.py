@@ -0,0 +1,90 @@
+from PyQt5.QtCore import QIODevice
+from PyQt5.QtNetwork import QAbstractSocket, QHostAddress, QTcpSocket, QUdpSocket
+from PyQt5.QtSerialPort import QSerialPort
+
+# CommWorker가 사용하는 수신 장치 (모두 QIODevice: readyRead / write / isOpen / close)
+# - "COM3", "/dev/ttyUSB0"      : 시리얼 포트
+# - "tcp://host:port"           : 다른 GCS의 릴레이(HandlerRelay)에 TCP로 구독 (명령 전송 가능)
+# - "udp://group:port"          : 릴레이의 UDP 멀티캐스트 구독 (수신 전용)
+#                                 group이 멀티캐스트 주소가 아니면 해당 주소/포트에 bind만 함
+
+# 네트워크 장치는 GUI 스레드를 막지 않도록 비동기로 연결 (CommWorker.open_port_async, 결과는 port_opened 시그널)
+TCP_CONNECT_TIMEOUT_MS = 3000
+
+
+def parse_transport(port_name: str):
+    """(scheme, host, port) 반환, 시리얼 포트면 ("serial", port_name, None)"""
+    for scheme in ("tcp", "udp"):
+        prefix = scheme + "://"
+        if port_name.lower().startswith(prefix):
+            host, _, port = port_name[len(prefix):].rpartition(":")
+            if not host or not port.isdigit():
+                raise ValueError(f"Expected {prefix}host:port, got {port_name}")
+            return scheme, host, int(port)
+    return "serial", port_name, None
+
+
+def is_network(port_name: str) -> bool:
+    """tcp:// / udp:// 장치인지 (잘못된 주소도 네트워크로 보고 여는 쪽에서 오류 처리)"""
+    return port_name.lower().startswith(("tcp://", "udp://"))
+
+
+def open_transport(port_name: str, baudrate: int):
+    """
+    port_name에 맞는 장치를 만들어 열기 (실패 시 None)
+    반드시 장치를 사용할 스레드(CommWorker 스레드)에서 호출해야 함
+    TCP는 연결을 시작만 하고 바로 반환 (is_connecting이 True인 동안 connected / errorOccurred 시그널로 결과 확인)
+    """
+    scheme, host, port = parse_transport(port_name)
+
+    if scheme == "tcp":
+        device = QTcpSocket()
+        device.setSocketOption(QAbstractSocket.LowDelayOption, 1)
+        device.connectToHost(host, port)
+        return device
+
+    if scheme == "udp":
+        device = QUdpSocket()
+        address = QHostAddress(host)
+        if address.isMulticast():
+            if not device.bind(QHostAddress(QHostAddress.AnyIPv4), port,
+                               QUdpSocket.ShareAddress | QUdpSocket.ReuseAddressHint):
+                return None
+            if not device.joinMulticastGroup(address):
+                device.close()
+                return None
+        elif not device.bind(address, port):
+            return None
+        return device
+
+    device = QSerialPort()
+    device.setPortName(port_name)
+    device.setBaudRate(baudrate)
+    device.setDataBits(QSerialPort.Data8)
+    device.setParity(QSerialPort.NoParity)
+    device.setStopBits(QSerialPort.OneStop)
+    device.setFlowControl(QSerialPort.NoFlowControl)
+    return device if device.open(QIODevice.ReadWrite) else None
+
+
+def read_transport(device) -> bytes:
+    """도착한 데이터를 모두 읽기 (UDP는 datagram 단위로 읽어 이어 붙임)"""
+    if isinstance(device, QUdpSocket):
+        chunks = []
+        while device.hasPendingDatagrams():
+            chunks.append(device.receiveDatagram().data().data())
+        return b"".join(chunks)
+    raw = device.readAll()
+    # PyQt5 일부 플랫폼에서 readAll()이 QByteArray를 반환
+    if hasattr(raw, "data"):
+        raw = raw.data()
+    return raw
+
+
+def is_connecting(device) -> bool:
+    """연결 완료를 기다리는 중인 TCP 소켓인지"""
+    return isinstance(device, QTcpSocket) and device.state() != QAbstractSocket.ConnectedState
+
+
+def is_read_only(device) -> bool:
+    return isinstance(device, QUdpSocket)
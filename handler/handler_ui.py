@@ -3,10 +3,13 @@ from PyQt5.QtWidgets import QMainWindow, QVBoxLayout, QWidget
 from PyQt5.QtSerialPort import QSerialPortInfo
 from PyQt5.QtWidgets import QWidget
 import pyqtgraph as pg
+import numpy as np
 import os
-import time
 
 from utils.data_types import DataVehicle
+from utils.data_history import DataHistory
+from utils.calibration import Calibration, parse_coefficient_name
+from utils.telemetry_schema import FIELDS
 
 # TODO : plot clear method
 
@@ -43,6 +46,10 @@ class HandlerUI(QMainWindow, form_class):
         self.PB_UMB_SOURCE.clicked.connect(self.on_umb_source_clicked)
         self.PB_TLM_SOURCE.clicked.connect(self.on_tlm_source_clicked)
 
+        # 포트 콤보박스에 릴레이 주소(tcp://host:port, udp://group:port)도 직접 입력 가능
+        self.CB_UMB_SER_PORT.setEditable(True)
+        self.CB_TLM_SER_PORT.setEditable(True)
+
         # 버튼 초기 상태 설정
         self.PB_UMB_SER_CONN.setCheckable(True)
         self.PB_TLM_SER_CONN.setCheckable(True)
@@ -55,7 +62,7 @@ class HandlerUI(QMainWindow, form_class):
     def on_umb_serial_connect_clicked(self):
         if self.controller:
             if self.PB_UMB_SER_CONN.isChecked():
-                port = self.CB_UMB_SER_PORT.currentData()
+                port = self._port_name(self.CB_UMB_SER_PORT)
                 baud = int(self.LE_UMB_SER_BAUD.text())
                 success = self.controller.umb_handler.connect_serial(port, baud)
                 if not success:
@@ -67,7 +74,7 @@ class HandlerUI(QMainWindow, form_class):
     def on_tlm_serial_connect_clicked(self):
         if self.controller:
             if self.PB_TLM_SER_CONN.isChecked():
-                port = self.CB_TLM_SER_PORT.currentData()
+                port = self._port_name(self.CB_TLM_SER_PORT)
                 baud = int(self.LE_TLM_SER_BAUD.text())
                 success = self.controller.tlm_handler.connect_serial(port, baud)
                 if not success:
@@ -75,6 +82,13 @@ class HandlerUI(QMainWindow, form_class):
             else:
                 self.controller.tlm_handler.connect_serial("", 0)  # 연결 해제
 
+    # ===== 콤보박스에서 포트 이름 읽기 (목록 항목이면 포트 이름, 직접 입력이면 입력값) =====
+    def _port_name(self, combo):
+        text = combo.currentText().strip()
+        if combo.currentIndex() >= 0 and text == combo.itemText(combo.currentIndex()) and combo.currentData():
+            return combo.currentData()
+        return text
+
     # ===== UMB 시리얼 포트 목록 갱신 =====
     def refresh_umb_ports(self):
         self.CB_UMB_SER_PORT.clear()
@@ -129,9 +143,14 @@ class HandlerUI(QMainWindow, form_class):
 
 
 class HandlerPlot:
-    def __init__(self, plot_widget, title, unit=None, window=500, data_field=None):
+    def __init__(self, plot_widget, title, unit=None, window=500, data_field=None, index=None):
+        """
+        data_field: history 컬럼 이름 (예: "ir", "va")
+        index: 배열 컬럼(va, tc 등)의 채널 번호 (0부터)
+        """
         self.window = window
         self.data_field = data_field
+        self.index = index
 
         self.plot_widget = plot_widget
         self.plot_widget.setBackground('w')
@@ -149,19 +168,82 @@ class HandlerPlot:
 
         self.curve = self.plot_widget.plot(pen='b')
 
-        # class 내부 초기화용
-        self._last_plot_time = time.time()  # 처음엔 대충 현재시간
+        # 마지막으로 plot에 반영한 history.total
+        self.last_plot_index = 0
+
+        # 표시용 버퍼 (매 프레임 할당하지 않도록 미리 생성)
+        self.x_axis = np.arange(window, dtype=np.float64)
+        self.y_buffer = np.zeros(window, dtype=np.float64)
+
+        # min/max 데시메이션 캐시: 절대 샘플 인덱스 기준 bin (bin_index % 길이 위치에 저장)
+        self.bin_size = 1
+        self.bin_min = np.zeros(0)
+        self.bin_max = np.zeros(0)
 
-    def update_plot_from_history(self, data_list: list[DataVehicle]):
-        # 최근 100개만 사용
-        recent_data = data_list[-self.window:]
+    def _column(self, history: DataHistory, n: int) -> np.ndarray:
+        values = history.column(self.data_field, n)
+        return values if self.index is None else values[:, self.index]
 
-        # 타이틀에 따라 해당 속성 추출
-        y_data = [getattr(d, self.data_field) for d in recent_data]
+    def _pixel_width(self) -> int:
+        return max(1, int(self.plot_widget.width()))
 
-        x_data = list(range(len(y_data)))
+    def _reset_bins(self, bin_size: int):
+        self.bin_size = bin_size
+        n_bins = self.window // bin_size + 2
+        self.bin_min = np.zeros(n_bins)
+        self.bin_max = np.zeros(n_bins)
+        self.last_plot_index = 0  # 캐시를 다시 채우도록 전체 window 재계산
 
-        self.curve.setData(x_data, y_data)
+    def update_plot_from_history(self, history: DataHistory):
+        """
+        새 샘플이 있고 plot이 보일 때만 갱신
+        - window가 픽셀 폭보다 크면 픽셀당 min/max(피크 보존) 데시메이션
+        - bin은 절대 샘플 인덱스에 고정되어 있으므로 새 샘플이 들어온 bin만 다시 계산
+        """
+        total = history.total
+        if total == self.last_plot_index or not self.plot_widget.isVisible():
+            return
+
+        # 2점(min, max)/픽셀 이하가 되도록 bin 크기 결정
+        bin_size = max(1, -(-self.window // self._pixel_width()))
+        if bin_size != self.bin_size or total < self.last_plot_index:
+            # history가 비워진 경우(재생 seek 등 DataHistory.clear) 캐시된 bin도 처음부터 다시 계산
+            self._reset_bins(bin_size)
+        if len(history) == 0:
+            self.curve.setData([], [])
+            self.last_plot_index = total
+            return
+
+        n_visible = min(self.window, len(history))
+        if bin_size == 1:
+            n = n_visible
+            np.copyto(self.y_buffer[:n], self._column(history, n))
+            self.curve.setData(self.x_axis[:n], self.y_buffer[:n], skipFiniteCheck=True)
+            self.last_plot_index = total
+            return
+
+        # 새 샘플이 포함된 bin부터 다시 계산 (history에 남아 있는 범위 안에서)
+        first_abs = max(self.last_plot_index, total - n_visible)
+        first_bin = first_abs // bin_size
+        start_abs = max(first_bin * bin_size, total - len(history))
+        values = self._column(history, total - start_abs)
+        offsets = np.arange(0, len(values), bin_size)
+        bins = (start_abs + offsets) // bin_size
+        slots = bins % len(self.bin_min)
+        self.bin_min[slots] = np.minimum.reduceat(values, offsets)
+        self.bin_max[slots] = np.maximum.reduceat(values, offsets)
+        self.last_plot_index = total
+
+        # 화면에 보이는 bin들을 (min, max) 쌍으로 펼쳐서 표시
+        window_start = total - n_visible
+        visible = np.arange(window_start // bin_size, (total - 1) // bin_size + 1)
+        slots = visible % len(self.bin_min)
+        x = np.repeat(visible * bin_size - window_start, 2).astype(np.float64)
+        x[1::2] += bin_size / 2
+        y = np.empty(len(x))
+        y[0::2] = self.bin_min[slots]
+        y[1::2] = self.bin_max[slots]
+        self.curve.setData(x, y, skipFiniteCheck=True)
 
 
 
@@ -179,104 +261,76 @@ class HandlerPlotGroup:
             # "imu_acc_x": HandlerPlot(ui.PLOT_IMU_ACC_X, "Acc X", "m/s²", data_field="imu_acc_x"),
             # "imu_acc_y": HandlerPlot(ui.PLOT_IMU_ACC_Y, "Acc Y", "m/s²", data_field="imu_acc_y"),
             # "imu_acc_z": HandlerPlot(ui.PLOT_IMU_ACC_Z, "Acc Z", "m/s²", data_field="imu_acc_z"),
+
+            # 배열 채널은 index로 지정
+            # "va_1": HandlerPlot(ui.PLOT_VA_1, "VA 1", data_field="va", index=0),
+            # "tc_1": HandlerPlot(ui.PLOT_TC_1, "TC 1", data_field="tc", index=0),
         }
 
-    def update_plot_from_history_all(self, data_list: list[DataVehicle]):
-        self.handlers["ir"].update_plot_from_history(data_list)
-        self.handlers["ip"].update_plot_from_history(data_list)
-        self.handlers["iy"].update_plot_from_history(data_list)
+    def update_plot_from_history_all(self, history: DataHistory):
+        # 숨겨진 plot이나 새 데이터가 없는 plot은 각 핸들러에서 건너뜀
+        for handler in self.handlers.values():
+            handler.update_plot_from_history(history)
 
-        # self.handlers["imu_gyr_x"].update_plot_from_history(data_list)
-        # self.handlers["imu_gyr_y"].update_plot_from_history(data_list)
-        # self.handlers["imu_gyr_z"].update_plot_from_history(data_list)
 
-        # self.handlers["imu_acc_x"].update_plot_from_history(data_list)
-        # self.handlers["imu_acc_y"].update_plot_from_history(data_list)
-        # self.handlers["imu_acc_z"].update_plot_from_history(data_list)
 
+def label_names(item, stages=("RAW", "IDEAL", "CALIBRATED")) -> list:
+    """스키마 필드의 라벨 이름 (배열: {label}_{채널}_{stage}, 스칼라: {label}_{stage})"""
+    if item.count == 1:
+        return [f"{item.label}_{stage}" for stage in stages]
+    return [f"{item.label}_{i + 1}_{stage}" for i in range(item.count) for stage in stages]
 
 
 class HandlerLabelGroup:
-    def __init__(self, ui: QWidget):
-        self.line_edit_group = HandlerLineEditGroup(ui)
-        self.handlers = {
-            "LB_PNID_VA_1_RAW":        HandlerLabel(ui.LB_PNID_VA_1_RAW, "{:.2f}"),
-            "LB_PNID_VA_2_RAW":        HandlerLabel(ui.LB_PNID_VA_2_RAW, "{:.2f}"),
-            "LB_PNID_VA_3_RAW":        HandlerLabel(ui.LB_PNID_VA_3_RAW, "{:.2f}"),
-            "LB_PNID_VA_4_RAW":        HandlerLabel(ui.LB_PNID_VA_4_RAW, "{:.2f}"),
-            "LB_PNID_VA_5_RAW":        HandlerLabel(ui.LB_PNID_VA_5_RAW, "{:.2f}"),
-            "LB_PNID_VA_6_RAW":        HandlerLabel(ui.LB_PNID_VA_6_RAW, "{:.2f}"),
-            "LB_PNID_VA_7_RAW":        HandlerLabel(ui.LB_PNID_VA_7_RAW, "{:.2f}"),
-            "LB_PNID_VA_8_RAW":        HandlerLabel(ui.LB_PNID_VA_8_RAW, "{:.2f}"),
-            "LB_PNID_VA_1_IDEAL":      HandlerLabel(ui.LB_PNID_VA_1_IDEAL, "{:.2f}"),
-            "LB_PNID_VA_2_IDEAL":      HandlerLabel(ui.LB_PNID_VA_2_IDEAL, "{:.2f}"),
-            "LB_PNID_VA_3_IDEAL":      HandlerLabel(ui.LB_PNID_VA_3_IDEAL, "{:.2f}"),
-            "LB_PNID_VA_4_IDEAL":      HandlerLabel(ui.LB_PNID_VA_4_IDEAL, "{:.2f}"),
-            "LB_PNID_VA_5_IDEAL":      HandlerLabel(ui.LB_PNID_VA_5_IDEAL, "{:.2f}"),
-            "LB_PNID_VA_6_IDEAL":      HandlerLabel(ui.LB_PNID_VA_6_IDEAL, "{:.2f}"),
-            "LB_PNID_VA_7_IDEAL":      HandlerLabel(ui.LB_PNID_VA_7_IDEAL, "{:.2f}"),
-            "LB_PNID_VA_8_IDEAL":      HandlerLabel(ui.LB_PNID_VA_8_IDEAL, "{:.2f}"),
-            "LB_PNID_VA_1_CALIBRATED": HandlerLabel(ui.LB_PNID_VA_1_CALIBRATED, "{:.2f}"),
-            "LB_PNID_VA_2_CALIBRATED": HandlerLabel(ui.LB_PNID_VA_2_CALIBRATED, "{:.2f}"),
-            "LB_PNID_VA_3_CALIBRATED": HandlerLabel(ui.LB_PNID_VA_3_CALIBRATED, "{:.2f}"),
-            "LB_PNID_VA_4_CALIBRATED": HandlerLabel(ui.LB_PNID_VA_4_CALIBRATED, "{:.2f}"),
-            "LB_PNID_VA_5_CALIBRATED": HandlerLabel(ui.LB_PNID_VA_5_CALIBRATED, "{:.2f}"),
-            "LB_PNID_VA_6_CALIBRATED": HandlerLabel(ui.LB_PNID_VA_6_CALIBRATED, "{:.2f}"),
-            "LB_PNID_VA_7_CALIBRATED": HandlerLabel(ui.LB_PNID_VA_7_CALIBRATED, "{:.2f}"),
-            "LB_PNID_VA_8_CALIBRATED": HandlerLabel(ui.LB_PNID_VA_8_CALIBRATED, "{:.2f}"),
-
-            "LB_PNID_TC_1_RAW":        HandlerLabel(ui.LB_PNID_TC_1_RAW, "{:.2f}"),
-            "LB_PNID_TC_2_RAW":        HandlerLabel(ui.LB_PNID_TC_2_RAW, "{:.2f}"),
-            "LB_PNID_TC_3_RAW":        HandlerLabel(ui.LB_PNID_TC_3_RAW, "{:.2f}"),
-            "LB_PNID_TC_4_RAW":        HandlerLabel(ui.LB_PNID_TC_4_RAW, "{:.2f}"),
-            "LB_PNID_TC_5_RAW":        HandlerLabel(ui.LB_PNID_TC_5_RAW, "{:.2f}"),
-            "LB_PNID_TC_6_RAW":        HandlerLabel(ui.LB_PNID_TC_6_RAW, "{:.2f}"),
-            "LB_PNID_TC_1_IDEAL":      HandlerLabel(ui.LB_PNID_TC_1_IDEAL, "{:.2f}"),
-            "LB_PNID_TC_2_IDEAL":      HandlerLabel(ui.LB_PNID_TC_2_IDEAL, "{:.2f}"),
-            "LB_PNID_TC_3_IDEAL":      HandlerLabel(ui.LB_PNID_TC_3_IDEAL, "{:.2f}"),
-            "LB_PNID_TC_4_IDEAL":      HandlerLabel(ui.LB_PNID_TC_4_IDEAL, "{:.2f}"),
-            "LB_PNID_TC_5_IDEAL":      HandlerLabel(ui.LB_PNID_TC_5_IDEAL, "{:.2f}"),
-            "LB_PNID_TC_6_IDEAL":      HandlerLabel(ui.LB_PNID_TC_6_IDEAL, "{:.2f}"),
-            "LB_PNID_TC_1_CALIBRATED": HandlerLabel(ui.LB_PNID_TC_1_CALIBRATED, "{:.2f}"),
-            "LB_PNID_TC_2_CALIBRATED": HandlerLabel(ui.LB_PNID_TC_2_CALIBRATED, "{:.2f}"),
-            "LB_PNID_TC_3_CALIBRATED": HandlerLabel(ui.LB_PNID_TC_3_CALIBRATED, "{:.2f}"),
-            "LB_PNID_TC_4_CALIBRATED": HandlerLabel(ui.LB_PNID_TC_4_CALIBRATED, "{:.2f}"),
-            "LB_PNID_TC_5_CALIBRATED": HandlerLabel(ui.LB_PNID_TC_5_CALIBRATED, "{:.2f}"),
-            "LB_PNID_TC_6_CALIBRATED": HandlerLabel(ui.LB_PNID_TC_6_CALIBRATED, "{:.2f}"),
-        }
+    def __init__(self, ui: QWidget, calibration: Calibration = None):
+        self.calibration = calibration if calibration is not None else Calibration()
+        self.line_edit_group = HandlerLineEditGroup(ui, self.calibration)
+        self.last_frame_updates = 0  # 마지막 update_all에서 갱신된 라벨 수
+        # 스키마에서 label이 지정된 필드마다 UI에 있는 라벨을 찾아 연결 (예: LB_PNID_VA_1_RAW)
+        self.handlers = {}
+        for item in FIELDS:
+            if item.label is None:
+                continue
+            for name in label_names(item):
+                widget = getattr(ui, name, None)
+                if widget is not None:
+                    self.handlers[name] = HandlerLabel(widget, item.fmt)
+        # 보정 표시가 없는 필드 (IMU/GPS 등): raw 값만 표시
+        self.raw_fields = [item for item in FIELDS if item.label is not None and item.name not in ("va", "tc")]
+
+    def widget_update_count(self) -> int:
+        """지금까지 실제로 setText가 호출된 총 횟수"""
+        return sum(handler.update_count for handler in self.handlers.values())
+
+    def update_all(self, data: DataVehicle, calibration: Calibration = None):
+        """calibration: 표시에 적용할 보정 (기본: LineEdit과 연결된 self.calibration)"""
+        before = self.widget_update_count()
+
+        # 보정 계수는 LineEdit 입력이 끝날 때만 갱신되고, 여기서는 채널 전체를 벡터 연산으로 계산
+        values = (calibration or self.calibration).apply(data.va, data.tc)
 
-    def update_all(self, data: DataVehicle):
         # Update QLabel values based on data.va
         for i, value in enumerate(data.va):
             label_name_base = f"LB_PNID_VA_{i+1}"
-            label_name_raw = f"{label_name_base}_RAW"
-            label_name_ideal = f"{label_name_base}_IDEAL"
-            label_name_calibrated = f"{label_name_base}_CALIBRATED"
-            
-            if label_name_raw in self.handlers:
-                self.handlers[label_name_raw].update(value)
-                
-                max_value = self.line_edit_group.handlers[f"LE_PNID_VA_{i+1}_RANGE"].get_value()
-                value_ideal = 1 + (((value / 65536) * 22) - 4) * ((max_value - 1) / 16)
-                self.handlers[label_name_ideal].update(value_ideal)
-                
-                value_calibrated = self.line_edit_group.handlers[f"LE_PNID_VA_{i+1}_PARAM_A"].get_value() * value + self.line_edit_group.handlers[f"LE_PNID_VA_{i+1}_PARAM_B"].get_value()
-                self.handlers[label_name_calibrated].update(value_calibrated)
+            self.handlers[f"{label_name_base}_RAW"].update(value)
+            self.handlers[f"{label_name_base}_IDEAL"].update(values["va_ideal"][i])
+            self.handlers[f"{label_name_base}_CALIBRATED"].update(values["va_calibrated"][i])
 
         # Update QLabel values based on data.tc
         for i, value in enumerate(data.tc):
             label_name_base = f"LB_PNID_TC_{i+1}"
-            label_name_raw = f"{label_name_base}_RAW"
-            label_name_ideal = f"{label_name_base}_IDEAL"
-            label_name_calibrated = f"{label_name_base}_CALIBRATED"
-            
-            if label_name_raw in self.handlers:
-                self.handlers[label_name_raw].update(value)
-                
-                # self.handlers[label_name_ideal].update(value * int(self.line_edit_group.handlers[f"LE_PNID_TC_{i+1}_RANGE"].get_value()) / 4096)
-                
-                value_calibrated = self.line_edit_group.handlers[f"LE_PNID_TC_{i+1}_PARAM_A"].get_value() * value + self.line_edit_group.handlers[f"LE_PNID_TC_{i+1}_PARAM_B"].get_value()
-                self.handlers[label_name_calibrated].update(value_calibrated)
+            self.handlers[f"{label_name_base}_RAW"].update(value)
+            # TC ideal은 RANGE 입력이 없으므로 표시하지 않음
+            self.handlers[f"{label_name_base}_CALIBRATED"].update(values["tc_calibrated"][i])
+
+        for item in self.raw_fields:
+            value = getattr(data, item.name)
+            for name, v in zip(label_names(item, ("RAW",)), value if item.count > 1 else [value]):
+                if name in self.handlers:
+                    self.handlers[name].update(v)
+
+        # 이번 프레임에서 실제로 갱신된 위젯 수 (프로파일링용)
+        self.last_frame_updates = self.widget_update_count() - before
 
 class HandlerLabel:
     def __init__(self, label_widget, fmt="{:}"):
@@ -286,18 +340,28 @@ class HandlerLabel:
         """
         self.label = label_widget
         self.fmt = fmt
+        self.last_text = None   # 마지막으로 표시한 문자열
+        self.update_count = 0   # 실제 setText 호출 횟수
 
-    def update(self, value):
+    def update(self, value) -> bool:
         """
         QLabel에 값을 포맷하여 출력
+        포맷된 문자열이 이전과 같으면 위젯을 건드리지 않음 (변경 시 True 반환)
         """
         try:
-            self.label.setText(self.fmt.format(value))
+            text = self.fmt.format(value) if value == value else "ERR"  # NaN: 잘못된 보정 계수
         except Exception as e:
-            self.label.setText("ERR")
+            text = "ERR"
+        if text == self.last_text:
+            return False
+        self.label.setText(text)
+        self.last_text = text
+        self.update_count += 1
+        return True
 
 class HandlerLineEditGroup:
-    def __init__(self, ui: QWidget):
+    def __init__(self, ui: QWidget, calibration: Calibration):
+        self.calibration = calibration
         self.handlers = {
             "LE_PNID_VA_1_RANGE": HandlerLineEdit(ui.LE_PNID_VA_1_RANGE),
             "LE_PNID_VA_2_RANGE": HandlerLineEdit(ui.LE_PNID_VA_2_RANGE),
@@ -344,9 +408,45 @@ class HandlerLineEditGroup:
             "LE_PNID_TC_6_PARAM_B": HandlerLineEdit(ui.LE_PNID_TC_6_PARAM_B),
         }
 
+
+        # "LE_PNID_VA_1_PARAM_A" -> ("VA", 0, "PARAM_A")로 보정 계수와 연결하고 현재 입력값을 반영
+        for name, handler in self.handlers.items():
+            handler.bind(calibration, *parse_coefficient_name(name))
+
 class HandlerLineEdit:
     def __init__(self, line_edit_widget):
         self.line_edit = line_edit_widget
+        self.calibration = None
+        self.key = None
+        self.invalid = False
 
     def get_value(self):
         return float(self.line_edit.text())
+
+    def bind(self, calibration: Calibration, kind: str, idx: int, coefficient: str):
+        """editingFinished 시에만 값을 파싱해 calibration에 반영"""
+        self.calibration = calibration
+        self.key = (kind, idx, coefficient)
+        self.line_edit.editingFinished.connect(self.apply)
+        self.apply(initial=True)
+
+    def apply(self, initial: bool = False):
+        """
+        입력값을 보정 계수로 반영
+        숫자가 아니면 이전 계수를 유지 (초기값이 잘못된 경우에는 NaN -> 라벨에 ERR 표시)
+        """
+        try:
+            value = self.get_value()
+        except ValueError:
+            if not self.invalid:
+                self.line_edit.setStyleSheet("background-color: #ffcccc;")
+                self.invalid = True
+            if not initial:
+                return
+            value = float("nan")
+        else:
+            if self.invalid:
+                self.line_edit.setStyleSheet("")
+                self.invalid = False
+        kind, idx, coefficient = self.key
+        self.calibration.set_coefficient(kind, idx, coefficient, value)
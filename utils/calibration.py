@@ -0,0 +1,110 @@
+import json
+import numpy as np
+
+from utils.data_history import DataHistory
+from utils.telemetry_schema import FIELDS_BY_NAME
+
+VA_CHANNELS = FIELDS_BY_NAME["va"].count
+TC_CHANNELS = FIELDS_BY_NAME["tc"].count
+
+
+def parse_coefficient_name(name: str):
+    """UI 입력 이름 (예: LE_PNID_VA_3_PARAM_A) -> ("VA", 2, "PARAM_A")"""
+    _, _, kind, channel, coefficient = name.split("_", 4)
+    return kind, int(channel) - 1, coefficient
+
+
+class Calibration:
+    """
+    VA/TC 채널 보정 계수 (채널별 배열로 보관)
+    - VA ideal: 1 + (((raw / 65536) * 22) - 4) * ((range - 1) / 16)
+    - calibrated: A * raw + B (VA, TC 공통)
+    - 모든 계산은 (..., 채널 수) 배열에 대한 벡터 연산이라 한 패킷이든 history 창 전체든 같은 비용 구조
+    - 계수는 UI 입력(editingFinished)이 바뀔 때만 set_*로 갱신, 매 tick마다 문자열을 파싱하지 않음
+    """
+
+    def __init__(self):
+        self.va_range = np.ones(VA_CHANNELS)
+        self.va_a = np.ones(VA_CHANNELS)
+        self.va_b = np.zeros(VA_CHANNELS)
+        self.tc_a = np.ones(TC_CHANNELS)
+        self.tc_b = np.zeros(TC_CHANNELS)
+        self.version = 0  # 계수가 바뀔 때마다 증가 (캐시 무효화용)
+        self._update_va()
+
+    def _update_va(self):
+        # ideal = 1 + (raw * 22 / 65536 - 4) * k = raw * (22 * k / 65536) + (1 - 4 * k), k = (range - 1) / 16
+        k = (self.va_range - 1) / 16
+        self._va_ideal_scale = 22 * k / 65536
+        self._va_ideal_offset = 1 - 4 * k
+        self.version += 1
+
+    def _coefficients(self) -> dict:
+        """(kind, name) -> 채널별 계수 배열"""
+        return {
+            ("VA", "RANGE"): self.va_range,
+            ("VA", "PARAM_A"): self.va_a,
+            ("VA", "PARAM_B"): self.va_b,
+            ("TC", "PARAM_A"): self.tc_a,
+            ("TC", "PARAM_B"): self.tc_b,
+        }
+
+    def set_coefficient(self, kind: str, idx: int, name: str, value: float):
+        """
+        kind: "VA" / "TC", idx: 0부터 시작하는 채널 번호, name: "RANGE" / "PARAM_A" / "PARAM_B"
+        """
+        arrays = self._coefficients()
+        if (kind, name) not in arrays:
+            raise KeyError(f"Unknown calibration coefficient: {kind} {name}")
+        arrays[(kind, name)][idx] = value
+        if kind == "VA" and name == "RANGE":
+            self._update_va()
+        else:
+            self.version += 1
+
+    def to_profile(self) -> dict:
+        """보정 프로파일 (UI 입력 이름 -> 값), 예: {"LE_PNID_VA_1_RANGE": 10.0, "LE_PNID_TC_2_PARAM_B": -3.5, ...}"""
+        return {
+            f"LE_PNID_{kind}_{idx + 1}_{name}": float(value)
+            for (kind, name), values in self._coefficients().items()
+            for idx, value in enumerate(values)
+        }
+
+    @classmethod
+    def from_profile(cls, profile: dict) -> "Calibration":
+        """to_profile() 형식의 dict로 생성 (없는 항목은 기본값: RANGE 1, A 1, B 0)"""
+        calibration = cls()
+        for name, value in profile.items():
+            kind, idx, coefficient = parse_coefficient_name(name)
+            calibration.set_coefficient(kind, idx, coefficient, float(value))
+        return calibration
+
+    @classmethod
+    def load_profile(cls, path: str) -> "Calibration":
+        with open(path) as f:
+            return cls.from_profile(json.load(f))
+
+    def save_profile(self, path: str):
+        with open(path, 'w') as f:
+            json.dump(self.to_profile(), f, indent=2)
+
+    def va_ideal(self, va) -> np.ndarray:
+        return np.asarray(va, dtype=np.float64) * self._va_ideal_scale + self._va_ideal_offset
+
+    def va_calibrated(self, va) -> np.ndarray:
+        return np.asarray(va, dtype=np.float64) * self.va_a + self.va_b
+
+    def tc_calibrated(self, tc) -> np.ndarray:
+        return np.asarray(tc, dtype=np.float64) * self.tc_a + self.tc_b
+
+    def apply(self, va, tc) -> dict:
+        """한 패킷(채널 벡터) 또는 여러 패킷((N, 채널) 배열)의 보정값"""
+        return {
+            "va_ideal": self.va_ideal(va),
+            "va_calibrated": self.va_calibrated(va),
+            "tc_calibrated": self.tc_calibrated(tc),
+        }
+
+    def apply_history(self, history: DataHistory, n: int = None) -> dict:
+        """history의 최근 n개(기본: 전체) 창에 대한 보정값 (N, 채널) 배열"""
+        return self.apply(history.column("va", n), history.column("tc", n))
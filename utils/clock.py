@@ -0,0 +1,47 @@
+from datetime import datetime
+import time
+import numpy as np
+
+# ===== 세션 시계 =====
+# 파이프라인 안의 모든 시각은 time.monotonic_ns() 정수 (시리얼 도착 시 한 번 찍음)
+# 벽시계 시각이 필요할 때(로그 기록, 화면 표시)만 세션 시작 시 한 번 잡은 기준점으로 변환
+# - 정수 ns끼리의 차이이므로 속도/지연 계산에 부동소수점 오차가 없음
+# - 세션 중 시스템 시계가 바뀌어도(NTP 보정 등) 로그 시각이 뒤로 가지 않음
+
+SESSION_WALL_NS = time.time_ns()
+SESSION_MONO_NS = time.monotonic_ns()
+
+TIMESTAMP_FORMAT = "%Y-%m-%d %H:%M:%S.%f"
+
+
+def now_ns() -> int:
+    return time.monotonic_ns()
+
+
+def to_wall_ns(mono_ns):
+    """monotonic ns -> epoch ns (정수 또는 int64 배열)"""
+    if isinstance(mono_ns, np.ndarray):
+        return mono_ns.astype(np.int64) + np.int64(SESSION_WALL_NS - SESSION_MONO_NS)
+    return mono_ns - SESSION_MONO_NS + SESSION_WALL_NS
+
+
+def elapsed_s(since_ns: int, until_ns: int = None) -> float:
+    """두 monotonic ns 시각의 차이 (초), until_ns가 없으면 지금까지"""
+    return ((time.monotonic_ns() if until_ns is None else until_ns) - since_ns) / 1e9
+
+
+def format_wall_ns(wall_ns: int, fmt: str = TIMESTAMP_FORMAT) -> str:
+    """epoch ns -> 문자열 (표시/내보내기 시점에만 호출)"""
+    seconds, ns = divmod(int(wall_ns), 1_000_000_000)
+    return datetime.fromtimestamp(seconds).replace(microsecond=ns // 1000).strftime(fmt)
+
+
+def format_ns(mono_ns: int, fmt: str = TIMESTAMP_FORMAT) -> str:
+    """monotonic ns -> 벽시계 문자열"""
+    return format_wall_ns(to_wall_ns(mono_ns), fmt)
+
+
+def parse_wall_ns(text: str, fmt: str = TIMESTAMP_FORMAT) -> int:
+    """format_wall_ns 문자열 -> epoch ns (CSV 로그 timestamp 컬럼을 다시 읽을 때)"""
+    value = datetime.strptime(text, fmt)
+    return (int(time.mktime(value.timetuple())) * 1_000_000 + value.microsecond) * 1000
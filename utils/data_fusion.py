@@ -0,0 +1,179 @@
+import numpy as np
+
+from utils.data_history import DataHistory
+
+FUSION_SOURCES = ('UMB', 'TLM')
+
+# 이미 반영한 boot_time보다 이만큼(ms) 이상 과거 데이터만 들어오는 배치가
+# REBOOT_CONFIRM_BATCHES번 연속되면 기체 재부팅으로 보고 기준을 초기화
+# (한 번뿐이면 늦게 도착한 배치로 보고 지연 샘플로 처리)
+REBOOT_THRESHOLD_MS = 10000
+REBOOT_CONFIRM_BATCHES = 3
+
+# 기본 보류 시간(ms): TLM 주기 몇 개 분량, 느린 링크의 샘플이 확정 전에 도착해 빈 구간을 채울 수 있도록
+DEFAULT_HOLD_MS = 50.0
+
+# 중복/지연 판정을 위해 기억하는 최근 반영 boot_time 개수
+RECENT_BOOT_TIMES = 4096
+
+
+class DataFusion:
+    """
+    UMB/TLM 두 링크의 배치를 boot_time 기준으로 합쳐 하나의 단조 증가 history로 기록
+    - 두 링크에서 같은 boot_time이 오면 한 번만 기록 (preferred 링크 우선)
+    - 한 링크가 끊겨도(엄빌리컬 분리 등) 다른 링크 데이터로 끊김 없이 이어짐
+    - hold_ms > 0이면 최신 boot_time - hold_ms 이전 샘플만 확정하므로,
+      그 시간 안에 늦게 도착한 다른 링크 샘플로 빈 구간을 채움 (대신 표시 지연이 hold_ms만큼 늘어남)
+      hold_ms = 0이면 즉시 확정, 이미 확정된 시각보다 이전 샘플은 중복/지연으로 버림
+    """
+
+    def __init__(self, history: DataHistory, hold_ms: float = DEFAULT_HOLD_MS, preferred: str = 'UMB'):
+        self.history = history
+        self.hold_ms = hold_ms
+        self.preferred = preferred
+        self.reset()
+
+    def reset(self):
+        self._restart()
+
+        # 통계
+        self.committed = {source: 0 for source in FUSION_SOURCES}  # 링크별로 채택된 샘플 수
+        self.duplicates = 0  # 다른 링크(또는 같은 링크)에서 이미 받은 샘플
+        self.late = 0        # 확정 구간보다 늦게 도착해 채우지 못한 샘플
+        self.reboots = 0
+        self.resyncs = 0
+
+    def resync(self, source: str = None):
+        """
+        링크가 다른 boot_time 위치에서 다시 시작할 때(replay seek, 포트 재연결) 확정 기준을 초기화
+        - 이후 들어오는 샘플은 이전 확정 시각과 비교하지 않음 (되돌아간 구간도 중복/지연으로 버리지 않음)
+        - source를 지정하면 그 링크의 보류 샘플만 버리고 다른 링크의 보류 샘플은 유지
+        - history와 통계는 유지
+        """
+        self.resyncs += 1
+        if source is None:
+            self._restart()
+            return
+        rank = 0 if source == self.preferred else 1
+        keep = [ranks != rank for ranks in self.pending_rank]
+        self.pending_rows = [rows[k] for rows, k in zip(self.pending_rows, keep) if k.any()]
+        self.pending_recv = [recv[k] for recv, k in zip(self.pending_recv, keep) if k.any()]
+        self.pending_rank = [ranks[k] for ranks, k in zip(self.pending_rank, keep) if k.any()]
+        self.regressed = []
+        self.last_boot_time = None
+        self.recent = np.empty(0, dtype=np.int64)
+
+    def _restart(self):
+        """보류 샘플과 확정 기준 초기화"""
+        self.pending_rows, self.pending_recv, self.pending_rank = [], [], []
+        self.regressed = []  # 재부팅 확인 전까지 보류한 (rows, recv_ns, source) 배치
+        self.last_boot_time = None
+        self.recent = np.empty(0, dtype=np.int64)
+
+    def ingest(self, rows: np.ndarray, recv_ns: int, source: str) -> np.ndarray:
+        """
+        한 링크의 배치 추가 (recv_ns: 도착 시각 time.monotonic_ns)
+        이번에 history에 새로 기록된 행(boot_time 오름차순)을 반환
+        """
+        if len(rows) == 0:
+            return rows[:0]
+        boot_times = rows[:, 0].astype(np.int64)
+        if self.last_boot_time is not None and boot_times.max() < self.last_boot_time - REBOOT_THRESHOLD_MS:
+            # boot_time이 크게 되돌아감: 연속으로 이어질 때만 재부팅으로 보고 새로 시작 (history는 유지)
+            # replay seek / 재연결처럼 원인을 아는 경우는 resync()로 바로 초기화하므로 이 판정에 기대지 않음
+            self.regressed.append((rows, recv_ns, source))
+            if len(self.regressed) < REBOOT_CONFIRM_BATCHES:
+                return rows[:0]
+            regressed = self.regressed
+            self.reboots += 1
+            self._restart()
+            outs = [self._merge(*batch) for batch in regressed]
+            return np.concatenate(outs)
+
+        if self.regressed:
+            # 되돌아간 배치가 이어지지 않음: 늦게 도착한 배치였으므로 평소처럼 중복/지연으로 처리
+            regressed, self.regressed = self.regressed, []
+            for batch in regressed:
+                self._merge(*batch)
+        return self._merge(rows, recv_ns, source)
+
+    def flush(self) -> np.ndarray:
+        """보류 중인 샘플을 hold_ms와 관계없이 모두 확정 (더 들어올 데이터가 없을 때, 예: replay 종료)"""
+        if not self.pending_rows:
+            return np.empty((0, 0))
+        hold, self.hold_ms = self.hold_ms, 0.0
+        try:
+            return self._merge(self.pending_rows[0][:0], 0, self.preferred)
+        finally:
+            self.hold_ms = hold
+
+    def _merge(self, rows: np.ndarray, recv_ns: int, source: str) -> np.ndarray:
+        """보류 샘플과 합쳐 boot_time 순으로 정렬하고 hold_ms 이전 샘플을 history에 확정"""
+        rank = 0 if source == self.preferred else 1
+        self.pending_rows.append(rows)
+        self.pending_recv.append(np.full(len(rows), recv_ns, dtype=np.int64))
+        self.pending_rank.append(np.full(len(rows), rank, dtype=np.int8))
+
+        if len(self.pending_rows) == 1:
+            rows, recv, ranks = self.pending_rows[0], self.pending_recv[0], self.pending_rank[0]
+        else:
+            rows = np.concatenate(self.pending_rows)
+            recv = np.concatenate(self.pending_recv)
+            ranks = np.concatenate(self.pending_rank)
+        boot_times = rows[:, 0].astype(np.int64)
+
+        # boot_time 순, 같은 시각이면 preferred 링크 먼저 -> 첫 번째만 남김
+        order = np.lexsort((ranks, boot_times))
+        boot_times = boot_times[order]
+        first = np.ones(len(order), dtype=bool)
+        first[1:] = boot_times[1:] != boot_times[:-1]
+        self.duplicates += int(len(order) - first.sum())
+        order = order[first]
+        boot_times = boot_times[first]
+
+        # 이미 확정된 시각 이전 샘플: 최근 확정 목록에 있으면 중복, 없으면 지연
+        if self.last_boot_time is not None:
+            old = boot_times <= self.last_boot_time
+            if old.any():
+                seen = np.isin(boot_times[old], self.recent)
+                self.duplicates += int(seen.sum())
+                self.late += int(len(seen) - seen.sum())
+                order = order[~old]
+                boot_times = boot_times[~old]
+
+        # hold_ms 이내 샘플은 다음 배치까지 보류
+        if self.hold_ms > 0 and len(boot_times):
+            ready = boot_times <= boot_times[-1] - self.hold_ms
+        else:
+            ready = np.ones(len(boot_times), dtype=bool)
+
+        keep = order[~ready]
+        self.pending_rows = [rows[keep]] if len(keep) else []
+        self.pending_recv = [recv[keep]] if len(keep) else []
+        self.pending_rank = [ranks[keep]] if len(keep) else []
+
+        commit = order[ready]
+        if len(commit) == 0:
+            return rows[:0]
+        out = rows[commit]
+        self.history.extend(out, recv[commit])
+        committed_ranks = ranks[commit]
+        preferred_count = int(np.count_nonzero(committed_ranks == 0))
+        other = FUSION_SOURCES[1] if self.preferred == FUSION_SOURCES[0] else FUSION_SOURCES[0]
+        self.committed[self.preferred] += preferred_count
+        self.committed[other] += len(commit) - preferred_count
+
+        committed_times = boot_times[ready]
+        self.last_boot_time = int(committed_times[-1])
+        self.recent = np.concatenate((self.recent, committed_times))[-RECENT_BOOT_TIMES:]
+        return out
+
+    def stats(self) -> dict:
+        return {
+            "committed": dict(self.committed),
+            "duplicates": self.duplicates,
+            "late": self.late,
+            "reboots": self.reboots,
+            "resyncs": self.resyncs,
+            "pending": sum(len(rows) for rows in self.pending_rows) + sum(len(batch[0]) for batch in self.regressed),
+        }
@@ -0,0 +1,108 @@
+import numpy as np
+
+from utils.data_types import DataVehicle, CSV_FIELD_SLICES
+from utils.telemetry_schema import history_fields
+
+
+# 필드 이름 -> (dtype, 폭). 폭이 1이면 스칼라 컬럼, 그 외에는 (N, 폭) 배열 컬럼 (스키마에서 생성)
+HISTORY_FIELDS = history_fields()
+HISTORY_FIELDS["recv_ns"] = (np.int64, 1)  # 수신 시각 (time.monotonic_ns, 벽시계는 utils.clock.to_wall_ns)
+
+# 기본 보관 개수: 100Hz 기준 5분
+DEFAULT_HISTORY_CAPACITY = 100 * 60 * 5
+
+
+class DataHistory:
+    """
+    고정 용량 컬럼형 링버퍼
+    - 필드마다 NumPy 컬럼 하나씩 미리 할당 (패킷당 할당 없음)
+    - append는 O(1)
+    - 각 샘플을 i, i + capacity 두 위치에 기록(mirror)하므로
+      최근 N개(N <= capacity)는 항상 연속 구간 -> 복사 없는 view로 반환 가능
+    """
+
+    def __init__(self, capacity: int = DEFAULT_HISTORY_CAPACITY):
+        if capacity <= 0:
+            raise ValueError("capacity must be positive")
+        self.capacity = capacity
+        self.columns = {}
+        for name, (dtype, width) in HISTORY_FIELDS.items():
+            shape = (2 * capacity,) if width == 1 else (2 * capacity, width)
+            self.columns[name] = np.zeros(shape, dtype=dtype)
+
+        self._head = 0   # 다음에 기록할 위치 (0 ~ capacity-1)
+        self._size = 0   # 현재 보관 중인 샘플 수
+        self.total = 0   # 지금까지 append된 전체 샘플 수 (단조 증가)
+
+    def __len__(self):
+        return self._size
+
+    def clear(self):
+        self._head = 0
+        self._size = 0
+        self.total = 0
+
+    def append(self, data: DataVehicle, recv_ns: int = 0):
+        """DataVehicle 한 개를 기록"""
+        self.extend(data.row.reshape(1, -1), recv_ns)
+
+    def extend(self, rows: np.ndarray, recv_ns=0):
+        """
+        parse_csv_batch 결과(N x CSV_FIELD_COUNT)를 한 번에 기록
+        recv_ns(time.monotonic_ns)는 정수(배치 공통) 또는 길이 N 배열
+        """
+        n = len(rows)
+        if n == 0:
+            return
+        recv_ns = np.broadcast_to(np.asarray(recv_ns, dtype=np.int64), (n,))
+        skipped = 0
+        if n > self.capacity:
+            # 용량보다 많으면 최근 capacity개만 기록
+            skipped = n - self.capacity
+            rows = rows[skipped:]
+            recv_ns = recv_ns[skipped:]
+            n = self.capacity
+
+        # mirror 버퍼에 최대 두 구간으로 나누어 기록
+        first = min(n, self.capacity - self._head)
+        segments = [(self._head, 0, first)]
+        if first < n:
+            segments.append((0, first, n))
+
+        for name, col in self.columns.items():
+            src = recv_ns if name == "recv_ns" else rows[:, CSV_FIELD_SLICES[name]]
+            for dst, a, b in segments:
+                col[dst:dst + (b - a)] = src[a:b]
+                col[dst + self.capacity:dst + self.capacity + (b - a)] = src[a:b]
+
+        self.total += skipped
+        self._advance(n)
+
+    def _advance(self, n: int):
+        self._head = (self._head + n) % self.capacity
+        self._size = min(self._size + n, self.capacity)
+        self.total += n
+
+    def _window(self, n=None):
+        """최근 n개에 해당하는 mirror 버퍼 상의 [start, end) 구간"""
+        if n is None or n > self._size:
+            n = self._size
+        end = self._head + self.capacity
+        return end - n, end
+
+    def column(self, name: str, n=None) -> np.ndarray:
+        """최근 n개 샘플의 컬럼 view (복사 없음, 읽기 전용으로 사용할 것)"""
+        start, end = self._window(n)
+        return self.columns[name][start:end]
+
+    def last(self, n=None) -> dict:
+        """최근 n개 샘플의 모든 컬럼 view"""
+        start, end = self._window(n)
+        return {name: col[start:end] for name, col in self.columns.items()}
+
+    def since(self, total_index: int) -> dict:
+        """
+        전체 카운터 기준 total_index 이후에 추가된 샘플들의 view
+        (이미 밀려난 샘플은 제외)
+        """
+        return self.last(max(0, self.total - total_index))
@@ -1,71 +1,181 @@
-from dataclasses import dataclass, field
-from datetime import datetime
+from dataclasses import dataclass
+import time
 from typing import List, Tuple
+import numpy as np
+
+from utils.telemetry_schema import FIELDS, FIELD_COUNT, FIELD_SLICES, INT_COLUMNS
+
 
-@dataclass
 class DataVehicle:
-    boot_time: int = 0.0
-    temp:      float = 0.0
-    voltage:   float = 0.0
+    """
+    텔레메트리 한 패킷 (스키마 순서의 float64 배열 한 개를 감싸는 __slots__ 객체)
+    - 스칼라 필드는 읽을 때 int/float로 변환 (data.ir, data.boot_time)
+    - 배열 필드는 내부 배열의 view (data.va[3]), 정수 배열(sv, fault)은 int 배열로 변환해 반환
+    - 패킷당 객체는 DataVehicle + ndarray 두 개뿐, 필드별 Python 객체/리스트는 읽을 때만 생성
+    - DataVehicle(va=[...], ir=1.0)처럼 키워드로 만들면 나머지는 스키마 기본값
+    """
+    __slots__ = ("row",)
+
+    def __init__(self, **fields):
+        self.row = _DEFAULT_ROW.copy()
+        for name, value in fields.items():
+            if name not in CSV_FIELD_SLICES:
+                raise TypeError(f"DataVehicle got an unexpected field '{name}'")
+            self.row[CSV_FIELD_SLICES[name]] = value
+
+    @classmethod
+    def from_row(cls, row: np.ndarray) -> "DataVehicle":
+        """길이 CSV_FIELD_COUNT float64 배열을 복사 없이 감싸기"""
+        data = cls.__new__(cls)
+        data.row = row
+        return data
+
+    def __eq__(self, other):
+        if not isinstance(other, DataVehicle):
+            return NotImplemented
+        return bool(np.array_equal(self.row, other.row))
+
+    __hash__ = None
+
+    def __repr__(self):
+        values = ", ".join(f"{name}={_plain(getattr(self, name))}" for name in CSV_FIELD_SLICES)
+        return f"DataVehicle({values})"
 
-    sv: List[int]   = field(default_factory=lambda: [-1]   * 8)
-    mv: List[float] = field(default_factory=lambda: [-1.0] * 4)
-    va: List[float] = field(default_factory=lambda: [-1.0] * 8)
-    tc: List[float] = field(default_factory=lambda: [-1.0] * 6)
 
-    ir: float = 0.0
-    ip: float = 0.0
-    iy: float = 0.0
+def _plain(value):
+    return value.tolist() if isinstance(value, np.ndarray) else value
 
-    fault: List[int] = field(default_factory=lambda: [-1] * 5)
 
-    # TODO : implement another data
-    # TODO : optimize data structure
+def _field_property(item, col):
+    """스키마 필드 하나에 대한 DataVehicle 속성 (읽기: 변환, 쓰기: 내부 배열에 기록)"""
+    if item.count == 1:
+        convert = int if item.kind == "int" else float
 
-    # igx: float = 0.0
-    # igy: float = 0.0
-    # igz: float = 0.0
-    # iax: float = 0.0
-    # iay: float = 0.0
-    # iaz: float = 0.0
+        def get(self):
+            return convert(self.row[col])
+    elif item.kind == "int":
+        def get(self):
+            return self.row[col].astype(np.int64)
+    else:
+        def get(self):
+            return self.row[col]
 
-    # gps_fix_type: int = 0
-    # gps_sat: int = 0
-    # gps_time: str = ""
-    # gps_lat: float = 0.0
-    # gps_lon: float = 0.0
-    # gps_alt: float = 0.0
+    def set(self, value):
+        self.row[col] = value
+
+    return property(get, set, doc=f"{item.name} [{item.unit}]" if item.unit else item.name)
 
 
 @dataclass
 class ReceivedPacket:
     data: DataVehicle
-    timestamp: datetime
+    timestamp: int  # 수신 시각 (time.monotonic_ns, 표시할 때 utils.clock.format_ns로 변환)
     source: str
 
+# CSV 한 줄의 필드 수와 각 DataVehicle 필드가 차지하는 컬럼 위치 (스키마에서 생성)
+CSV_FIELD_COUNT = FIELD_COUNT
+CSV_FIELD_SLICES = FIELD_SLICES
+
+# DataVehicle 필드 속성/기본값 (필드 정의는 utils/telemetry_schema.py, IMU/GPS 필드도 스키마에서 활성화)
+_DEFAULT_ROW = np.array([item.default for item in FIELDS for _ in range(item.count)], dtype=np.float64)
+for _item in FIELDS:
+    setattr(DataVehicle, _item.name, _field_property(_item, CSV_FIELD_SLICES[_item.name]))
+
+
+def parse_csv_batch(lines: List[str]) -> Tuple[np.ndarray, List[str]]:
+    """
+    여러 줄의 CSV를 한 번에 파싱
+    - 반환: (rows, errors)
+        rows   : (N, CSV_FIELD_COUNT) float64 배열 (정상 행만, 입력 순서 유지)
+        errors : 거부된 행에 대한 에러 메시지 리스트
+    - 정상 행 전체를 하나의 문자열로 합쳐 NumPy 변환 1회로 처리하고,
+      변환 실패 시에만 행 단위로 다시 파싱하여 잘못된 행을 걸러냄
+    """
+    good = []
+    errors = []
+    for line in lines:
+        line = line.strip()
+        n_sep = line.count(',')
+        if n_sep == CSV_FIELD_COUNT - 1:
+            good.append(line)
+        elif n_sep >= CSV_FIELD_COUNT:
+            # 뒤에 붙은 여분 필드는 무시 (parse_csv_to_vehicle과 동일)
+            good.append(','.join(line.split(',', CSV_FIELD_COUNT)[:CSV_FIELD_COUNT]))
+        else:
+            errors.append(f"CSV parsing failed: Incomplete CSV data ({n_sep + 1} fields): {line}")
+
+    if not good:
+        return np.empty((0, CSV_FIELD_COUNT), dtype=np.float64), errors
+
+    try:
+        rows = np.array(','.join(good).split(','), dtype=np.float64).reshape(-1, CSV_FIELD_COUNT)
+        return _drop_non_integer_rows(rows, good, errors), errors
+    except ValueError:
+        pass
+
+    # 잘못된 값이 섞여 있음 -> 행 단위로 다시 파싱
+    parsed = []
+    parsed_lines = []
+    for line in good:
+        try:
+            parsed.append(np.array(line.split(','), dtype=np.float64))
+            parsed_lines.append(line)
+        except ValueError as e:
+            errors.append(f"CSV parsing failed: {e}: {line}")
+    if not parsed:
+        return np.empty((0, CSV_FIELD_COUNT), dtype=np.float64), errors
+    return _drop_non_integer_rows(np.vstack(parsed), parsed_lines, errors), errors
+
+
+def integer_fields_valid(rows: np.ndarray) -> np.ndarray:
+    """
+    행별로 정수 필드(boot_time, sv, fault)가 모두 유한한 정수 값인지 (N,) bool 배열
+    float64로 한 번에 변환하면 'nan', '1.5'도 통과하므로 parse_csv_to_vehicle의 int() 검사를 대신함
+    """
+    values = rows[:, INT_COLUMNS]
+    return (np.isfinite(values) & (values == np.floor(values))).all(axis=1)
+
+
+def _drop_non_integer_rows(rows: np.ndarray, lines: List[str], errors: List[str]) -> np.ndarray:
+    """정수 필드가 정수가 아닌 행을 errors에 기록하고 제외"""
+    valid = integer_fields_valid(rows)
+    if valid.all():
+        return rows
+    for line, ok in zip(lines, valid):
+        if not ok:
+            errors.append(f"CSV parsing failed: Non-integer value in integer field: {line}")
+    return rows[valid]
+
+
+def vehicle_from_row(row: np.ndarray) -> DataVehicle:
+    """parse_csv_batch 결과의 한 행을 DataVehicle로 변환 (행 하나만 복사, 배치 전체를 붙잡지 않음)"""
+    return DataVehicle.from_row(np.array(row, dtype=np.float64))
+
+
+def widen_float32(values: np.ndarray) -> np.ndarray:
+    """
+    float32 값을 가장 짧은 10진 표현 그대로 float64로 변환
+    (23.45f -> 23.45, 단순 astype이면 23.450000762939453이 되어 로그/표시가 지저분해짐)
+    """
+    return values.astype(str).astype(np.float64)
+
+
+def vehicle_to_row(data: DataVehicle) -> np.ndarray:
+    """DataVehicle을 parse_csv_batch와 같은 (1, CSV_FIELD_COUNT) 배열로 변환"""
+    return data.row.reshape(1, CSV_FIELD_COUNT).copy()
+
+
 def parse_csv_to_vehicle(line: str, source: str) -> ReceivedPacket:
     try:
         parts = line.strip().split(',')
-        if len(parts) < 10:
+        if len(parts) < CSV_FIELD_COUNT:
             raise ValueError("Incomplete CSV data")
 
-        data_vehicle = DataVehicle(
-            boot_time = int(parts[0]),
-            temp      = float(parts[1]),
-            voltage   = float(parts[2]),
-            sv        = [int(x) for x in parts[3:11]],
-            mv        = [float(x) for x in parts[11:15]],
-            va        = [float(x) for x in parts[15:23]],
-            tc        = [float(x) for x in parts[23:29]],
-            ir        = float(parts[29]),
-            ip        = float(parts[30]),
-            iy        = float(parts[31]),
-            fault     = [int(x) for x in parts[32:37]]
-        )
+        data_vehicle = DataVehicle.from_row(np.array(parts[:CSV_FIELD_COUNT], dtype=np.float64))
 
         return ReceivedPacket(
             data=data_vehicle,
-            timestamp=datetime.now(),
+            timestamp=time.monotonic_ns(),
             source=source
         )
     except Exception as e:
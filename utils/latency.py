@@ -0,0 +1,133 @@
+from datetime import datetime
+import json
+import math
+import threading
+import numpy as np
+
+# 수신 파이프라인 단계별 지연 (모두 시리얼 도착 시각 기준, time.monotonic_ns 차이를 초로 기록)
+# - decode:      readyRead -> 디코딩 완료 (수신 스레드)
+# - dispatch:    readyRead -> CorePipeline.on_batch_received (스레드 간 큐 대기 포함)
+# - log_enqueue: readyRead -> 로그 writer 큐에 넣은 시점
+# - log_write:   readyRead -> writer 스레드가 파일 객체에 기록한 시점
+# - log_flush:   readyRead -> flush로 OS에 넘어간 시점 (flush 구간의 가장 오래된 배치 기준)
+# - render:      readyRead -> 라벨/밸브 버튼 갱신 (마지막 수신 배치 기준)
+# - plot:        readyRead -> 그래프 갱신
+# - command_ack: 텔레커맨드 전송 -> 명령한 밸브 상태가 텔레메트리에 도착 (handler_command)
+LATENCY_STAGES = ("decode", "dispatch", "log_enqueue", "log_write", "log_flush", "render", "plot", "command_ack")
+
+# 로그 간격 히스토그램: 1us ~ 100s, decade당 20 구간 (구간 폭 약 12%)
+HISTOGRAM_MIN = 1e-6
+HISTOGRAM_DECADES = 8
+HISTOGRAM_BINS_PER_DECADE = 20
+
+
+class LatencyHistogram:
+    """
+    고정 크기 로그 스케일 히스토그램
+    - record는 O(1) (구간 인덱스 계산 + 카운트 증가), 샘플을 저장하지 않으므로 메모리 일정
+    - 백분위수는 해당 구간의 상한값으로 근사 (max는 정확한 값)
+    """
+
+    n_bins = HISTOGRAM_DECADES * HISTOGRAM_BINS_PER_DECADE + 2  # 양 끝 underflow/overflow
+    edges = HISTOGRAM_MIN * 10 ** (np.arange(n_bins - 1) / HISTOGRAM_BINS_PER_DECADE)
+
+    def __init__(self):
+        self.counts = np.zeros(self.n_bins, dtype=np.int64)
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def record(self, seconds: float, count: int = 1):
+        if seconds <= HISTOGRAM_MIN:
+            index = 0
+        else:
+            index = min(int(math.log10(seconds / HISTOGRAM_MIN) * HISTOGRAM_BINS_PER_DECADE) + 1, self.n_bins - 1)
+        self.counts[index] += count
+        self.count += count
+        self.total += seconds * count
+        if seconds > self.max:
+            self.max = seconds
+
+    def percentile(self, p: float) -> float:
+        """p(0~100) 백분위수 근사값 (초)"""
+        if self.count == 0:
+            return None
+        rank = math.ceil(self.count * p / 100.0)
+        index = int(np.searchsorted(np.cumsum(self.counts), max(rank, 1)))
+        if index >= len(self.edges):
+            return self.max
+        return min(float(self.edges[index]), self.max)
+
+    def summary(self) -> dict:
+        """ms 단위 요약"""
+        if self.count == 0:
+            return {"count": 0, "mean": None, "p50": None, "p95": None, "p99": None, "max": None}
+        return {
+            "count": self.count,
+            "mean": round(self.total / self.count * 1000.0, 4),
+            "p50": round(self.percentile(50) * 1000.0, 4),
+            "p95": round(self.percentile(95) * 1000.0, 4),
+            "p99": round(self.percentile(99) * 1000.0, 4),
+            "max": round(self.max * 1000.0, 4),
+        }
+
+
+class LatencyStats:
+    """
+    (source, stage)별 LatencyHistogram 모음
+    GUI 스레드와 로그 writer 스레드에서 서로 다른 stage를 기록하므로 히스토그램 생성만 잠금으로 보호
+    """
+
+    def __init__(self):
+        self.histograms = {}
+        self.started = datetime.now()
+        self._lock = threading.Lock()
+
+    def _histogram(self, source: str, stage: str) -> LatencyHistogram:
+        key = (source, stage)
+        histogram = self.histograms.get(key)
+        if histogram is None:
+            with self._lock:
+                histogram = self.histograms.setdefault(key, LatencyHistogram())
+        return histogram
+
+    def record(self, source: str, stage: str, seconds: float, count: int = 1):
+        """seconds: 도착 시각부터 해당 단계까지 걸린 시간, count: 같은 지연을 가진 패킷 수"""
+        self._histogram(source, stage).record(seconds, count)
+
+    def reset(self):
+        with self._lock:
+            self.histograms = {}
+        self.started = datetime.now()
+
+    def summary(self) -> dict:
+        """{source: {stage: {count, mean, p50, p95, p99, max}}} (ms)"""
+        def order(key):
+            source, stage = key
+            return source, LATENCY_STAGES.index(stage) if stage in LATENCY_STAGES else len(LATENCY_STAGES)
+
+        result = {}
+        for source, stage in sorted(list(self.histograms), key=order):
+            result.setdefault(source, {})[stage] = self.histograms[(source, stage)].summary()
+        return result
+
+    def format_table(self) -> str:
+        """진단 패널/콘솔 출력용 고정폭 표"""
+        lines = [f"{'source':<6} {'stage':<12} {'count':>9} {'p50':>9} {'p95':>9} {'p99':>9} {'max':>9}  (ms)"]
+        for source, stages in self.summary().items():
+            for stage, s in stages.items():
+                lines.append(f"{source:<6} {stage:<12} {s['count']:>9} {s['p50']:>9.3f} {s['p95']:>9.3f} "
+                             f"{s['p99']:>9.3f} {s['max']:>9.3f}")
+        return "\n".join(lines)
+
+    def dump(self, path: str):
+        """요약을 JSON 파일로 저장"""
+        data = {
+            "started": self.started.isoformat(timespec="seconds"),
+            "dumped": datetime.now().isoformat(timespec="seconds"),
+            "unit": "ms",
+            "latency": self.summary(),
+        }
+        with open(path, "w") as f:
+            json.dump(data, f, indent=2)
+            f.write("\n")
@@ -0,0 +1,143 @@
+import numpy as np
+
+# boot_time 간격으로 추정하는 링크 품질 지표
+# - 주기(period)는 처음 PERIOD_WARMUP개 간격의 중앙값으로 추정한 뒤, 정상 범위 간격으로 천천히 보정
+# - delta는 지금까지 받은 최대 boot_time 기준 (늦게 온 패킷 하나가 다음 간격을 깨뜨리지 않도록)
+# - delta == 0 : 중복, delta < 0 : 순서 뒤바뀜, delta > GAP_FACTOR * period : 누락 (round(delta / period) - 1개)
+PERIOD_WARMUP = 32
+GAP_FACTOR = 1.5
+JITTER_GAIN = 1 / 16  # RFC 3550 inter-arrival jitter와 같은 지수 평균 계수
+
+
+class LinkQuality:
+    """
+    소스별 링크 상태 (수신 스레드에서 갱신)
+    - add_bytes / add_errors / add_batch 모두 배치 단위로 호출, 패킷당 비용은 상수 (boot_time 차분만 사용)
+    - snapshot()은 직전 snapshot 이후 구간의 속도와 누적 카운터를 dict로 반환
+    """
+
+    def __init__(self, period_ms: float = None):
+        self.fixed_period = period_ms is not None
+        self.period_ms = period_ms
+        self.reset()
+
+    def reset(self):
+        if not self.fixed_period:
+            self.period_ms = None
+        self.warmup = []
+
+        # 누적 카운터
+        self.bytes = 0
+        self.packets = 0
+        self.errors = 0
+        self.duplicates = 0
+        self.out_of_order = 0
+        self.gaps = 0
+        self.missing = 0
+        self.jitter = 0.0  # ns
+
+        self.last_boot_time = None
+        self.last_transit = None
+
+        # snapshot 구간 계산용
+        self.last_snapshot = None
+
+    def add_bytes(self, n: int):
+        self.bytes += n
+
+    def add_errors(self, n: int):
+        """파싱 실패 행 / CRC 오류 프레임 수"""
+        self.errors += n
+
+    def add_batch(self, boot_times, arrival_ns: int):
+        """
+        boot_times: 배치 내 패킷의 boot_time(ms) 배열, arrival_ns: 배치 도착 시각 (time.monotonic_ns)
+        """
+        boot_times = np.asarray(boot_times, dtype=np.int64)
+        n = len(boot_times)
+        if n == 0:
+            return
+        self.packets += n
+
+        # 직전까지의 최대 boot_time(running max) 대비 간격: 순서가 뒤바뀐 패킷은 기준을 되돌리지 않음
+        if self.last_boot_time is not None:
+            boot_times = np.concatenate(([self.last_boot_time], boot_times))
+        running = np.maximum.accumulate(boot_times)
+        deltas = boot_times[1:] - running[:-1]
+
+        self.duplicates += int(np.count_nonzero(deltas == 0))
+        late = int(np.count_nonzero(deltas < 0))
+        if late:
+            # 늦게 도착한 패킷은 앞서 누락으로 센 자리를 채운 것으로 간주
+            self.out_of_order += late
+            self.missing -= min(late, self.missing)
+
+        positive = deltas[deltas > 0]
+        if self.period_ms is None:
+            self.warmup.extend(positive[:PERIOD_WARMUP - len(self.warmup)].tolist())
+            if len(self.warmup) >= PERIOD_WARMUP:
+                self.period_ms = float(np.median(self.warmup))
+                self.warmup = []
+        elif len(positive):
+            period = self.period_ms
+            gap_mask = positive > GAP_FACTOR * period
+            if gap_mask.any():
+                gap_deltas = positive[gap_mask]
+                self.gaps += len(gap_deltas)
+                self.missing += int(np.maximum(np.round(gap_deltas / period) - 1, 1).sum())
+            if not self.fixed_period:
+                normal = positive[~gap_mask & (positive > period / GAP_FACTOR)]
+                if len(normal):
+                    self.period_ms += (float(normal.mean()) - period) * 0.05
+
+        self.last_boot_time = int(running[-1])
+
+        # 도착 간격 지터: (도착 시각 차) - (boot_time 차)의 지수 평균
+        transit = arrival_ns - int(boot_times[-1]) * 1_000_000
+        if self.last_transit is not None:
+            self.jitter += (abs(transit - self.last_transit) - self.jitter) * JITTER_GAIN
+        self.last_transit = transit
+
+    def loss(self) -> float:
+        """누적 추정 손실률 (0~1)"""
+        expected = self.packets + self.missing
+        return self.missing / expected if expected else 0.0
+
+    def snapshot(self, now: float) -> dict:
+        """now: time.monotonic 초, 직전 snapshot 이후의 속도와 누적 카운터"""
+        counters = (now, self.bytes, self.packets, self.errors)
+        previous = self.last_snapshot or counters
+        self.last_snapshot = counters
+        elapsed = now - previous[0]
+
+        def rate(index):
+            return (counters[index] - previous[index]) / elapsed if elapsed > 0 else 0.0
+
+        packets = counters[2] - previous[2]
+        errors = counters[3] - previous[3]
+        return {
+            "bytes_per_s": rate(1),
+            "packets_per_s": rate(2),
+            "errors_per_s": rate(3),
+            "error_rate": errors / (packets + errors) if packets + errors else 0.0,
+            "period_ms": self.period_ms,
+            "packets": self.packets,
+            "errors": self.errors,
+            "duplicates": self.duplicates,
+            "out_of_order": self.out_of_order,
+            "gaps": self.gaps,
+            "missing": self.missing,
+            "loss": self.loss(),
+            "jitter_ms": self.jitter / 1e6,
+        }
+
+
+def format_link(stats: dict) -> str:
+    """한 줄 요약 (상태 출력/툴팁용)"""
+    if not stats:
+        return "no data"
+    period = "?" if stats["period_ms"] is None else f"{stats['period_ms']:.1f}"
+    return (f"{stats['packets_per_s']:.1f} pkt/s, {stats['bytes_per_s'] / 1024:.1f} KiB/s, "
+            f"err {stats['error_rate'] * 100:.2f}%, loss {stats['loss'] * 100:.2f}% "
+            f"({stats['missing']} missing / {stats['gaps']} gaps), dup {stats['duplicates']}, "
+            f"ooo {stats['out_of_order']}, jitter {stats['jitter_ms']:.2f} ms, period {period} ms")
@@ -0,0 +1,426 @@
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+import argparse
+import json
+import os
+import re
+import sys
+import time
+import numpy as np
+
+from utils.calibration import TC_CHANNELS, VA_CHANNELS, Calibration
+from utils.log_format import CALIBRATED_SUFFIX
+from utils.log_index import event_labels, event_states, find_transitions
+from utils.log_reader import open_log_reader
+from utils.telemetry_schema import FIELD_SLICES, FIELDS, column_names
+
+try:
+    import resource  # 최대 메모리 사용량 보고용 (Windows에는 없음)
+except ImportError:
+    resource = None
+
+# ===== 오프라인 로그 분석 =====
+# HandlerLog 로그(.csv / .bin, 압축 세그먼트, 세션 manifest)를 chunk 단위로 읽어
+# 채널별 통계(원시값 + HandlerLabelGroup과 같은 VA/TC 보정값), 밸브 타임라인, fault 요약을 계산
+# - 파일 전체를 메모리에 올리지 않음 (메모리 사용량은 chunk 크기 x 프로세스 수로 제한)
+# - 파일 단위로 프로세스 풀에 나누어 처리하고, 같은 소스의 세그먼트는 기록 순으로 이어 붙여 타임라인 구성
+# 예) python -m utils.log_analysis logs/20250101_120000_session.json --calibration cal.json
+#     python -m utils.log_analysis logs/*_UMB*.csv --jobs 4 --json report.json
+
+ANALYSIS_VERSION = 2
+
+VALVE_FIELDS = ("sv", "mv")
+# 통계에서 제외하는 컬럼 (boot_time, 상태 컬럼은 타임라인/fault 요약으로 따로 보고)
+STAT_EXCLUDE = ("boot_time", "sv", "fault")
+
+_STAT_FIELDS = [field for field in FIELDS if field.name not in STAT_EXCLUDE]
+_STAT_COLS = np.array([col for field in _STAT_FIELDS
+                       for col in (range(FIELD_SLICES[field.name].start, FIELD_SLICES[field.name].stop)
+                                   if field.count > 1 else [FIELD_SLICES[field.name]])], dtype=np.intp)
+_STAT_PRECALIBRATED = np.isin(_STAT_COLS, np.r_[FIELD_SLICES["va"], FIELD_SLICES["tc"]])
+STAT_NAMES = (column_names(_STAT_FIELDS)
+              + [f"va{i + 1}_ideal" for i in range(VA_CHANNELS)]
+              + [f"va{i + 1}_calibrated" for i in range(VA_CHANNELS)]
+              + [f"tc{i + 1}_calibrated" for i in range(TC_CHANNELS)])
+
+_SOURCE_PATTERN = re.compile(r"^(?P<session>.+)_(?P<source>UMB|TLM)(?:_\d{3})?\.")
+
+
+class ChannelStats:
+    """
+    컬럼별 개수/평균/분산/최소/최대를 chunk 단위로 누적 (병렬 분산 합치기 공식, NaN은 제외)
+    파일별 결과를 merge()로 합쳐도 전체를 한 번에 계산한 것과 같음
+    """
+
+    def __init__(self, names):
+        self.names = list(names)
+        k = len(self.names)
+        self.count = np.zeros(k, dtype=np.int64)
+        self.mean = np.zeros(k)
+        self.m2 = np.zeros(k)
+        self.min = np.full(k, np.inf)
+        self.max = np.full(k, -np.inf)
+
+    def update(self, values: np.ndarray):
+        if len(values) == 0:
+            return
+        if np.isnan(values).any():
+            count = np.count_nonzero(~np.isnan(values), axis=0)
+            with np.errstate(invalid="ignore", divide="ignore"):
+                mean = np.where(count > 0, np.nansum(values, axis=0) / count, 0.0)
+            m2 = np.nansum((values - mean) ** 2, axis=0)
+            low, high = np.nanmin(values, axis=0, initial=np.inf), np.nanmax(values, axis=0, initial=-np.inf)
+        else:
+            count = np.full(values.shape[1], len(values), dtype=np.int64)
+            mean = values.mean(axis=0)
+            m2 = ((values - mean) ** 2).sum(axis=0)
+            low, high = values.min(axis=0), values.max(axis=0)
+        self._combine(count, mean, m2, low, high)
+
+    def merge(self, other: "ChannelStats"):
+        self._combine(other.count, other.mean, other.m2, other.min, other.max)
+
+    def _combine(self, count, mean, m2, low, high):
+        total = self.count + count
+        with np.errstate(invalid="ignore", divide="ignore"):
+            delta = mean - self.mean
+            self.mean = np.where(total > 0, self.mean + delta * count / total, 0.0)
+            self.m2 = np.where(total > 0, self.m2 + m2 + delta ** 2 * self.count * count / total, 0.0)
+        self.count = total
+        self.min = np.minimum(self.min, low)
+        self.max = np.maximum(self.max, high)
+
+    def summary(self) -> dict:
+        result = {}
+        for i, name in enumerate(self.names):
+            n = int(self.count[i])
+            if n == 0:
+                continue
+            result[name] = {
+                "count": n,
+                "mean": float(self.mean[i]),
+                "std": float(np.sqrt(self.m2[i] / n)),
+                "min": float(self.min[i]),
+                "max": float(self.max[i]),
+            }
+        return result
+
+
+def stat_values(rows: np.ndarray, calibration: Calibration = None) -> np.ndarray:
+    """
+    통계 대상 컬럼 (N, len(STAT_NAMES)): 원시값 + VA ideal/calibrated + TC calibrated
+    calibration=None: VA/TC가 이미 보정된 로그(_cal.csv) -> 보정값 컬럼에 그대로 넣고 원시값/ideal은 NaN(통계 제외)
+    """
+    va = rows[:, FIELD_SLICES["va"]]
+    tc = rows[:, FIELD_SLICES["tc"]]
+    if calibration is None:
+        raw = rows[:, _STAT_COLS]
+        raw[:, _STAT_PRECALIBRATED] = np.nan
+        return np.hstack((raw, np.full(va.shape, np.nan), va, tc))
+    values = calibration.apply(va, tc)
+    return np.hstack((rows[:, _STAT_COLS], values["va_ideal"], values["va_calibrated"], values["tc_calibrated"]))
+
+
+def analyze_file(path: str, profile: dict = None, chunk_bytes: int = 1 << 22,
+                 start_boot_time: int = None, end_boot_time: int = None) -> dict:
+    """
+    한 로그 파일 분석 (프로세스 풀 worker, 결과는 merge_results로 합침)
+    - events: 상태 변화 목록 (boot_time, field, channel, old, new)
+    - fault_rows: (fault 채널, 코드) -> 행 수
+    """
+    started = time.perf_counter()
+    calibration = Calibration.from_profile(profile or {})
+    stats = ChannelStats(STAT_NAMES)
+    events = []
+    fault_rows = {}
+    first_state = last_state = None
+    first_boot_time = last_boot_time = None
+    rows_total = 0
+
+    reader = open_log_reader(path, chunk_bytes)
+    parse_errors = 0
+    try:
+        if start_boot_time is not None:
+            reader.seek_boot_time(start_boot_time)
+        while not reader.eof:
+            rows = reader.read()
+            if len(rows) == 0:
+                continue
+            done = end_boot_time is not None and rows[-1, 0] > end_boot_time
+            if done:
+                rows = rows[rows[:, 0] <= end_boot_time]
+                if len(rows) == 0:
+                    break
+
+            stats.update(stat_values(rows, None if reader.calibrated else calibration))
+
+            states = event_states(rows)
+            changed_rows, changed_cols, previous = find_transitions(states, last_state)
+            if len(changed_rows):
+                fields, channels = event_labels(changed_cols)
+                events.extend(zip(rows[changed_rows, 0].astype(np.int64).tolist(), fields.tolist(),
+                                  channels.tolist(), previous[changed_rows, changed_cols].tolist(),
+                                  states[changed_rows, changed_cols].tolist()))
+            if first_state is None:
+                first_state = states[0].tolist()
+                first_boot_time = int(rows[0, 0])
+            last_state = states[-1:]
+            last_boot_time = int(rows[-1, 0])
+
+            faults = rows[:, FIELD_SLICES["fault"]]
+            for channel in range(faults.shape[1]):
+                codes, counts = np.unique(faults[:, channel], return_counts=True)
+                for code, count in zip(codes.tolist(), counts.tolist()):
+                    if not np.isnan(code):
+                        key = (channel + 1, int(code))
+                        fault_rows[key] = fault_rows.get(key, 0) + count
+
+            rows_total += len(rows)
+            if done:
+                break
+        parse_errors = reader.parse_errors
+    finally:
+        reader.close()
+
+    match = _SOURCE_PATTERN.match(os.path.basename(path))
+    return {
+        "path": path,
+        "stream": f"{match['session']}_{match['source']}" if match else path,
+        "rows": rows_total,
+        "bytes": os.path.getsize(path),
+        "seconds": time.perf_counter() - started,
+        "parse_errors": parse_errors,
+        "calibrated": reader.calibrated,
+        "first_boot_time": first_boot_time,
+        "last_boot_time": last_boot_time,
+        "first_state": first_state,
+        "last_state": None if last_state is None else last_state[0].tolist(),
+        "events": events,
+        "fault_rows": fault_rows,
+        "stats": stats,
+    }
+
+
+def _stream_events(results: list) -> tuple:
+    """
+    같은 소스의 세그먼트 결과(기록 순)를 이어 붙인 상태 변화 목록과 시작 상태
+    세그먼트 경계에서 바뀐 상태(이전 세그먼트 마지막 행 -> 다음 세그먼트 첫 행)도 이벤트로 추가
+    """
+    results = [r for r in results if r["rows"]]
+    if not results:
+        return [], None, None, None
+    cols = np.arange(len(results[0]["first_state"]))
+    fields, channels = event_labels(cols)
+    events = []
+    previous = None
+    for result in results:
+        if previous is not None:
+            for col in np.nonzero(np.array(previous["last_state"]) != np.array(result["first_state"]))[0]:
+                events.append((result["first_boot_time"], str(fields[col]), int(channels[col]),
+                               previous["last_state"][col], result["first_state"][col]))
+        events.extend(result["events"])
+        previous = result
+    return events, results[0]["first_state"], results[0]["first_boot_time"], results[-1]["last_boot_time"]
+
+
+def valve_timeline(events: list, first_state: list, first_boot_time: int, last_boot_time: int) -> dict:
+    """밸브(sv/mv)별 열림 구간 [열린 boot_time, 닫힌 boot_time] 목록과 열림 횟수/총 열림 시간(ms)"""
+    cols = np.arange(len(first_state))
+    fields, channels = event_labels(cols)
+    opened = {}
+    timeline = {}
+    for col in cols:
+        if fields[col] in VALVE_FIELDS:
+            name = f"{fields[col]}{channels[col]}"
+            timeline[name] = {"opens": 0, "open_ms": 0, "intervals": []}
+            if first_state[col] == 1:
+                opened[name] = first_boot_time
+
+    for boot_time, field, channel, old, new in events:
+        if field not in VALVE_FIELDS:
+            continue
+        name = f"{field}{channel}"
+        if new == 1:
+            opened[name] = boot_time
+            timeline[name]["opens"] += 1
+        elif old == 1 and name in opened:
+            start = opened.pop(name)
+            timeline[name]["intervals"].append([start, boot_time])
+            timeline[name]["open_ms"] += boot_time - start
+
+    for name, start in opened.items():
+        # 로그 끝까지 열려 있음 (닫힌 시각 None)
+        timeline[name]["intervals"].append([start, None])
+        timeline[name]["open_ms"] += last_boot_time - start
+    return timeline
+
+
+def fault_summary(events: list, fault_rows: dict) -> dict:
+    """fault 채널별 코드 -> 행 수, 발생 횟수(해당 코드로 바뀐 횟수), 처음/마지막 발생 boot_time"""
+    summary = {}
+    for (channel, code), count in sorted(fault_rows.items()):
+        summary.setdefault(f"fault{channel}", {})[str(code)] = {
+            "rows": count, "onsets": 0, "first_boot_time": None, "last_boot_time": None}
+    for boot_time, field, channel, old, new in events:
+        if field != "fault":
+            continue
+        item = summary.get(f"fault{channel}", {}).get(str(new))
+        if item is None:
+            continue
+        item["onsets"] += 1
+        if item["first_boot_time"] is None:
+            item["first_boot_time"] = boot_time
+        item["last_boot_time"] = boot_time
+    return summary
+
+
+def merge_results(results: list) -> dict:
+    """
+    파일별 analyze_file 결과 -> 소스(스트림)별 통계/타임라인/fault 요약
+    UMB와 TLM은 같은 기체 샘플을 두 링크로 받은 것이므로 통계를 합치지 않음 (합치면 같은 샘플이 두 번 들어감)
+    """
+    streams = {}
+    for result in results:
+        streams.setdefault(result["stream"], []).append(result)
+
+    report = {}
+    for stream, items in streams.items():
+        items.sort(key=lambda r: r["path"])  # 세그먼트 번호 순 (_000, _001, ...)
+        events, first_state, first_boot_time, last_boot_time = _stream_events(items)
+        fault_rows = {}
+        stats = ChannelStats(STAT_NAMES)
+        for item in items:
+            stats.merge(item["stats"])
+            for key, count in item["fault_rows"].items():
+                fault_rows[key] = fault_rows.get(key, 0) + count
+        report[stream] = {
+            "files": [item["path"] for item in items],
+            "rows": sum(item["rows"] for item in items),
+            "stats": stats.summary(),
+            "first_boot_time": first_boot_time,
+            "last_boot_time": last_boot_time,
+            "valves": valve_timeline(events, first_state, first_boot_time, last_boot_time) if first_state else {},
+            "faults": fault_summary(events, fault_rows),
+            "events": len(events),
+        }
+    return {"streams": report}
+
+
+def expand_inputs(paths: list, skip_calibrated: bool = False) -> list:
+    """
+    세션 manifest(.json)는 세그먼트 파일 목록으로, 인덱스 sidecar(.idx.npz)는 제외
+    skip_calibrated: 보정값 CSV(utils.log_export의 {이름}_cal.csv)도 제외 (다시 보정하지 않도록)
+    """
+    files = []
+    for path in paths:
+        if path.endswith(".json"):
+            with open(path) as f:
+                manifest = json.load(f)
+            base = os.path.dirname(path)
+            for segments in manifest["sources"].values():
+                files.extend(os.path.join(base, segment["file"]) for segment in segments)
+        elif path.endswith(".idx.npz"):
+            continue
+        elif skip_calibrated and path.endswith(CALIBRATED_SUFFIX + ".csv"):
+            continue
+        else:
+            files.append(path)
+    return files
+
+
+def peak_rss_mb():
+    """이 프로세스와 (종료된) worker 중 가장 큰 최대 RSS (MB), 측정할 수 없으면 None"""
+    if resource is None:
+        return None
+    scale = 1 if sys.platform == "darwin" else 1024  # ru_maxrss: macOS bytes, Linux KB
+    peak = max(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+               resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss)
+    return round(peak * scale / 1e6, 1)
+
+
+def run(args) -> dict:
+    files = expand_inputs(args.files)
+    profile = Calibration.load_profile(args.calibration).to_profile() if args.calibration else {}
+    chunk_bytes = int(args.chunk_mb * (1 << 20))
+    jobs = max(1, min(args.jobs or os.cpu_count() or 1, len(files)))
+
+    started = time.perf_counter()
+    task_args = [(path, profile, chunk_bytes, args.start, args.end) for path in files]
+    if jobs == 1:
+        results = [analyze_file(*task) for task in task_args]
+    else:
+        with ProcessPoolExecutor(max_workers=jobs) as pool:
+            results = list(pool.map(analyze_file, *zip(*task_args)))
+    merged = merge_results(results)
+    elapsed = time.perf_counter() - started
+
+    rows = sum(result["rows"] for result in results)
+    size = sum(result["bytes"] for result in results)
+    return {
+        "analysis_version": ANALYSIS_VERSION,
+        "timestamp": datetime.now().isoformat(timespec="seconds"),
+        "config": {"files": len(files), "jobs": jobs, "chunk_mb": args.chunk_mb, "calibration": args.calibration,
+                   "start_boot_time": args.start, "end_boot_time": args.end},
+        **merged,
+        "throughput": {
+            "seconds": round(elapsed, 3),
+            "rows": rows,
+            "bytes": size,
+            "rows_per_s": round(rows / elapsed) if elapsed else None,
+            "mb_per_s": round(size / 1e6 / elapsed, 1) if elapsed else None,
+            "peak_rss_mb": peak_rss_mb(),
+            "files": [{"path": r["path"], "rows": r["rows"], "seconds": round(r["seconds"], 3),
+                       "parse_errors": r["parse_errors"]} for r in results],
+        },
+    }
+
+
+def print_report(report: dict, max_intervals: int = 5):
+    for stream, item in report["streams"].items():
+        print(f"[{stream}] {item['rows']} rows, boot_time {item['first_boot_time']} ~ {item['last_boot_time']}, "
+              f"{len(item['files'])} file(s)")
+        print(f"  {'channel':<16}{'count':>10}{'mean':>14}{'std':>12}{'min':>12}{'max':>12}")
+        for name, stat in item["stats"].items():
+            print(f"  {name:<16}{stat['count']:>10}{stat['mean']:>14.4f}{stat['std']:>12.4f}"
+                  f"{stat['min']:>12.4f}{stat['max']:>12.4f}")
+        for name, valve in item["valves"].items():
+            if not valve["intervals"]:
+                continue
+            intervals = ", ".join(f"{start}~{'end' if end is None else end}"
+                                  for start, end in valve["intervals"][:max_intervals])
+            more = f" (+{len(valve['intervals']) - max_intervals})" if len(valve["intervals"]) > max_intervals else ""
+            print(f"  {name}: {valve['opens']} opens, open {valve['open_ms'] / 1000:.1f} s: {intervals}{more}")
+        for name, codes in item["faults"].items():
+            active = {code: info for code, info in codes.items() if code not in ("0", "-1")}
+            for code, info in active.items():
+                print(f"  {name} = {code}: {info['rows']} rows, {info['onsets']} onsets, "
+                      f"first {info['first_boot_time']}, last {info['last_boot_time']}")
+        print()
+
+    t = report["throughput"]
+    print(f"{t['rows']} rows / {t['bytes'] / 1e6:.1f} MB in {t['seconds']} s "
+          f"({t['rows_per_s']} rows/s, {t['mb_per_s']} MB/s, {report['config']['jobs']} jobs, "
+          f"peak RSS {t['peak_rss_mb']} MB)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="HJ GCS offline log analysis")
+    parser.add_argument("files", nargs="+", help="log files (.csv / .bin, .gz / .zst segments) or session manifests (.json)")
+    parser.add_argument("--calibration", metavar="JSON", help="calibration profile (LE_PNID_*_RANGE / _PARAM_A / _PARAM_B)")
+    parser.add_argument("--jobs", type=int, default=0, help="worker processes (0 = CPU count)")
+    parser.add_argument("--chunk-mb", type=float, default=4, help="read chunk size per worker")
+    parser.add_argument("--start", type=int, help="first boot_time (ms) to analyze")
+    parser.add_argument("--end", type=int, help="last boot_time (ms) to analyze")
+    parser.add_argument("--json", metavar="PATH", help="write the full report (all intervals) as JSON")
+    args = parser.parse_args()
+
+    report = run(args)
+    print_report(report)
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(report, f, indent=2)
+            f.write("\n")
+
+
+if __name__ == "__main__":
+    main()
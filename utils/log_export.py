@@ -0,0 +1,212 @@
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+import argparse
+import json
+import os
+import time
+import numpy as np
+
+from utils.calibration import Calibration
+from utils.log_analysis import expand_inputs, peak_rss_mb
+from utils.log_format import (CALIBRATED_FIELDS, LOG_COMPRESSIONS, LOG_CSV_CALIBRATED_HEADER, LOG_RECORD_DTYPE,
+                              CsvLogWriter, log_is_calibrated)
+from utils.log_reader import iter_timed_chunks
+from utils.telemetry_schema import FIELD_SLICES, FIELDS, column_names
+
+# ===== 로그 일괄 재보정 / 내보내기 =====
+# 보정 계수가 시험 후에 수정되었을 때 원시 로그의 VA/TC 컬럼을 새 계수로 공학 단위 값으로 바꿔 다시 기록
+# - 출력 1: 컬럼별 고정 폭 배열 파일 ({이름}.columns/{컬럼}.bin + columns.json), np.memmap으로 필요한 컬럼만 읽음
+# - 출력 2: CSV 로그 형식 ({이름}_cal.csv, VA/TC 컬럼만 보정값, 헤더 이름은 va1_cal / tc1_cal ...)
+#   replay/분석 도구는 이 헤더를 보고 보정을 다시 적용하지 않음
+# - chunk 단위 벡터 연산, 파일 단위 프로세스 풀 (바이너리 로그 입력이 가장 빠름)
+# 예) python -m utils.log_export logs/XXXXXXXX_XXXXXX_session.json --calibration cal.json
+#     python -m utils.log_export logs/*_UMB*.bin --calibration cal.json --no-csv --jobs 8
+
+EXPORT_VERSION = 1
+
+# 컬럼 dtype: 바이너리 로그 레코드와 같음 (timestamp: 수신 시각 epoch ns, va/tc 보정값은 <f4)
+COLUMN_NAMES = ["timestamp"] + column_names()
+COLUMN_DTYPES = ["<i8"] + [LOG_RECORD_DTYPE[field.name].base.str for field in FIELDS for _ in range(field.count)]
+COLUMN_UNITS = [""] + [field.unit for field in FIELDS for _ in range(field.count)]
+
+
+def calibrate_rows(rows: np.ndarray, calibration: Calibration) -> np.ndarray:
+    """rows의 VA/TC 컬럼을 보정값(A * raw + B)으로 바꾼 사본"""
+    out = rows.copy()
+    out[:, FIELD_SLICES["va"]] = calibration.va_calibrated(rows[:, FIELD_SLICES["va"]])
+    out[:, FIELD_SLICES["tc"]] = calibration.tc_calibrated(rows[:, FIELD_SLICES["tc"]])
+    return out
+
+
+def export_name(path: str) -> str:
+    """로그 파일 이름에서 확장자(.csv / .bin + 압축)를 뗀 이름"""
+    name = os.path.basename(path)
+    for extension in LOG_COMPRESSIONS.values():
+        if extension and name.endswith(extension):
+            name = name[:-len(extension)]
+    return os.path.splitext(name)[0]
+
+
+class ColumnWriter:
+    """컬럼별 .bin 파일에 chunk를 이어 쓰고, 닫을 때 columns.json(컬럼 이름/dtype/단위/행 수) 기록"""
+
+    def __init__(self, directory: str, meta: dict):
+        os.makedirs(directory, exist_ok=True)
+        self.directory = directory
+        self.meta = meta
+        self.rows = 0
+        self.files = [open(os.path.join(directory, f"{name}.bin"), 'wb') for name in COLUMN_NAMES]
+
+    def write(self, rows: np.ndarray, wall_ns: np.ndarray):
+        self.files[0].write(wall_ns.astype("<i8").tobytes())
+        for col, (f, dtype) in enumerate(zip(self.files[1:], COLUMN_DTYPES[1:])):
+            f.write(rows[:, col].astype(dtype).tobytes())
+        self.rows += len(rows)
+
+    def close(self):
+        for f in self.files:
+            f.close()
+        meta = dict(self.meta, export_version=EXPORT_VERSION, rows=self.rows, columns=[
+            {"name": name, "dtype": dtype, "unit": unit}
+            for name, dtype, unit in zip(COLUMN_NAMES, COLUMN_DTYPES, COLUMN_UNITS)
+        ])
+        with open(os.path.join(self.directory, "columns.json"), 'w') as f:
+            json.dump(meta, f, indent=2)
+
+
+def open_columns(directory: str, names=None) -> dict:
+    """내보낸 컬럼 디렉토리 -> {컬럼 이름: np.memmap} (names: 읽을 컬럼만 지정)"""
+    with open(os.path.join(directory, "columns.json")) as f:
+        meta = json.load(f)
+    columns = {}
+    for column in meta["columns"]:
+        if names is not None and column["name"] not in names:
+            continue
+        path = os.path.join(directory, f"{column['name']}.bin")
+        if meta["rows"] == 0:
+            columns[column["name"]] = np.empty(0, dtype=column["dtype"])
+        else:
+            columns[column["name"]] = np.memmap(path, dtype=column["dtype"], mode='r', shape=(meta["rows"],))
+    return columns
+
+
+def export_file(path: str, out_dir: str, profile: dict = None, chunk_bytes: int = 1 << 22,
+                write_columns: bool = True, write_csv: bool = True) -> dict:
+    """한 로그 파일을 보정해 내보내기 (프로세스 풀 worker), 이미 보정된 CSV는 건너뜀"""
+    started = time.perf_counter()
+    if log_is_calibrated(path):
+        # VA/TC가 이미 보정값이므로 다시 보정하면 값이 이중으로 변환됨
+        return {"path": path, "rows": 0, "parse_errors": 0, "bytes": os.path.getsize(path), "seconds": 0.0,
+                "outputs": {}, "skipped": "already calibrated"}
+    calibration = Calibration.from_profile(profile or {})
+    name = export_name(path)
+    meta = {"source": os.path.abspath(path), "calibrated": list(CALIBRATED_FIELDS),
+            "calibration": calibration.to_profile(),
+            "created": datetime.now().isoformat(timespec="seconds")}
+
+    outputs = {}
+    columns = csv_writer = None
+    if write_columns:
+        outputs["columns"] = os.path.join(out_dir, f"{name}.columns")
+        columns = ColumnWriter(outputs["columns"], meta)
+    if write_csv:
+        outputs["csv"] = os.path.join(out_dir, f"{name}_cal.csv")
+        csv_writer = CsvLogWriter(outputs["csv"], header=LOG_CSV_CALIBRATED_HEADER)
+
+    rows_total = 0
+    stats = {"parse_errors": 0}
+    try:
+        # 컬럼 출력만 하면 float32 값을 10진 표현으로 정리할 필요 없음 (어차피 다시 <f4로 저장)
+        for rows, wall_ns in iter_timed_chunks(path, chunk_bytes, widen=write_csv, stats=stats):
+            rows = calibrate_rows(rows, calibration)
+            if columns is not None:
+                columns.write(rows, wall_ns)
+            if csv_writer is not None:
+                csv_writer.write(rows, wall_ns)
+            rows_total += len(rows)
+    finally:
+        if columns is not None:
+            columns.close()
+        if csv_writer is not None:
+            csv_writer.close()
+
+    return {
+        "path": path,
+        "rows": rows_total,
+        "parse_errors": stats["parse_errors"],
+        "bytes": os.path.getsize(path),
+        "seconds": round(time.perf_counter() - started, 3),
+        "outputs": outputs,
+    }
+
+
+def run(args) -> dict:
+    files = expand_inputs(args.files, skip_calibrated=True)
+    profile = Calibration.load_profile(args.calibration).to_profile()
+    out_dir = args.output_dir or os.path.join(os.path.dirname(files[0]) if files else ".", "export")
+    os.makedirs(out_dir, exist_ok=True)
+    chunk_bytes = int(args.chunk_mb * (1 << 20))
+    jobs = max(1, min(args.jobs or os.cpu_count() or 1, len(files)))
+
+    started = time.perf_counter()
+    task_args = [(path, out_dir, profile, chunk_bytes, not args.no_columns, not args.no_csv) for path in files]
+    if jobs == 1:
+        results = [export_file(*task) for task in task_args]
+    else:
+        with ProcessPoolExecutor(max_workers=jobs) as pool:
+            results = list(pool.map(export_file, *zip(*task_args)))
+    elapsed = time.perf_counter() - started
+
+    rows = sum(result["rows"] for result in results)
+    size = sum(result["bytes"] for result in results)
+    report = {
+        "export_version": EXPORT_VERSION,
+        "timestamp": datetime.now().isoformat(timespec="seconds"),
+        "config": {"files": len(files), "jobs": jobs, "chunk_mb": args.chunk_mb, "calibration": args.calibration,
+                   "columns": not args.no_columns, "csv": not args.no_csv},
+        "calibration": profile,
+        "files": results,
+        "throughput": {
+            "seconds": round(elapsed, 3),
+            "rows": rows,
+            "bytes": size,
+            "rows_per_s": round(rows / elapsed) if elapsed else None,
+            "mb_per_s": round(size / 1e6 / elapsed, 1) if elapsed else None,
+            "peak_rss_mb": peak_rss_mb(),
+        },
+    }
+    with open(os.path.join(out_dir, "export.json"), 'w') as f:
+        json.dump(report, f, indent=2)
+    return report
+
+
+def main():
+    parser = argparse.ArgumentParser(description="HJ GCS batch re-calibration / export of logs")
+    parser.add_argument("files", nargs="+", help="log files (.csv / .bin, .gz / .zst segments) or session manifests (.json)")
+    parser.add_argument("--calibration", metavar="JSON", required=True,
+                        help="calibration profile (LE_PNID_*_RANGE / _PARAM_A / _PARAM_B)")
+    parser.add_argument("--output-dir", metavar="DIR", help="default: export/ next to the first log")
+    parser.add_argument("--jobs", type=int, default=0, help="worker processes (0 = CPU count)")
+    parser.add_argument("--chunk-mb", type=float, default=4, help="read chunk size per worker")
+    parser.add_argument("--no-columns", action="store_true", help="skip the columnar output")
+    parser.add_argument("--no-csv", action="store_true", help="skip the calibrated CSV output")
+    args = parser.parse_args()
+    if args.no_columns and args.no_csv:
+        parser.error("nothing to write (--no-columns and --no-csv)")
+
+    report = run(args)
+    for result in report["files"]:
+        if result.get("skipped"):
+            print(f"{result['path']}: skipped ({result['skipped']})")
+            continue
+        errors = f", {result['parse_errors']} bad rows skipped" if result["parse_errors"] else ""
+        print(f"{result['path']}: {result['rows']} rows in {result['seconds']} s{errors} -> "
+              f"{', '.join(result['outputs'].values())}")
+    t = report["throughput"]
+    print(f"{t['rows']} rows / {t['bytes'] / 1e6:.1f} MB in {t['seconds']} s "
+          f"({t['rows_per_s']} rows/s, {t['mb_per_s']} MB/s, {report['config']['jobs']} jobs, "
+          f"peak RSS {t['peak_rss_mb']} MB)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,466 @@
+import argparse
+import csv
+import gzip
+import io
+import json
+import os
+import numpy as np
+
+from utils.clock import format_wall_ns
+from utils.data_types import CSV_FIELD_COUNT, CSV_FIELD_SLICES, widen_float32
+from utils.log_index import LogIndexBuilder
+from utils.telemetry_schema import build_function, column_names, format_row_source, record_dtype
+
+
+# CSV 로그 헤더 (HandlerLog가 기록하는 형식, 스키마에서 생성: ..., fault1, ..., fault5)
+# 이전 버전 로그는 헤더가 'fault' 한 컬럼이었지만 데이터 행은 같으므로 그대로 읽힘
+LOG_CSV_HEADER = ['timestamp'] + column_names()
+
+# 보정값 CSV (utils.log_export의 {이름}_cal.csv): VA/TC 컬럼 이름에 접미사를 붙여 원시 로그와 구분
+# reader는 헤더로 판별(log_is_calibrated)하고, replay/분석 도구는 보정을 다시 적용하지 않음
+CALIBRATED_SUFFIX = "_cal"
+CALIBRATED_FIELDS = ("va", "tc")
+LOG_CSV_CALIBRATED_HEADER = ['timestamp'] + [
+    name + CALIBRATED_SUFFIX if name.rstrip("0123456789") in CALIBRATED_FIELDS else name for name in column_names()
+]
+
+# ===== 바이너리 로그 형식 =====
+# | MAGIC(8) | HEADER_LEN(u32 LE) | HEADER(JSON, dtype descr) | RECORD * N |
+# 레코드는 고정 폭이므로 np.memmap / np.fromfile로 바로 읽을 수 있음
+LOG_MAGIC = b"HJGCSLOG"
+# version 1: timestamp <f8 epoch seconds, version 2: timestamp <i8 epoch ns
+LOG_VERSION = 2
+LOG_RECORD_DTYPE = record_dtype("log", prefix=[("timestamp", "<i8")])  # timestamp: 수신 시각 (epoch ns)
+
+# 스키마에서 생성한 CSV 행 구성 함수 (정수/실수 컬럼 구간별 slice)
+_format_row = build_function(format_row_source("_format_row"), "_format_row", {})
+
+# 바이너리 링크에서 float32로 전송되는 컬럼 (widen_rows 대상)
+_WIRE_DTYPE = record_dtype("wire")
+_WIRE_FLOAT32_SLICES = [(name, col) for name, col in CSV_FIELD_SLICES.items()
+                        if _WIRE_DTYPE[name].base == np.float32]
+
+
+def rows_to_records(rows: np.ndarray, timestamps) -> np.ndarray:
+    """(N, CSV_FIELD_COUNT) 배열 + 수신 시각(epoch ns)을 바이너리 로그 레코드로 변환"""
+    records = np.empty(len(rows), dtype=LOG_RECORD_DTYPE)
+    records["timestamp"] = timestamps
+    for name, col in CSV_FIELD_SLICES.items():
+        records[name] = rows[:, col]
+    return records
+
+
+def records_to_rows(records: np.ndarray, widen: bool = True) -> np.ndarray:
+    """
+    바이너리 로그 레코드를 (N, CSV_FIELD_COUNT) float64 배열로 변환
+    widen=False면 float32 값을 그대로 float64로 변환 (10진 표현 정리를 생략, 다시 float32로 저장할 때 등)
+    """
+    rows = np.empty((len(records), CSV_FIELD_COUNT), dtype=np.float64)
+    for name, col in CSV_FIELD_SLICES.items():
+        if name not in records.dtype.names:
+            # 필드를 추가하기 전에 기록된 로그
+            rows[:, col] = np.nan
+            continue
+        values = records[name]
+        rows[:, col] = widen_float32(values) if widen and values.dtype == np.float32 else values
+    return rows
+
+
+def widen_rows(rows: np.ndarray) -> np.ndarray:
+    """
+    float32로 수신한 배치(바이너리 링크)의 float32 컬럼을 가장 짧은 10진 표현으로 정리한 사본
+    CSV 로그 기록용 (writer 스레드에서 호출, 수신 경로의 디코딩은 단순 astype만 수행)
+    """
+    rows = rows.copy()
+    for name, col in _WIRE_FLOAT32_SLICES:
+        rows[:, col] = widen_float32(rows[:, col].astype(np.float32))
+    return rows
+
+
+def record_wall_ns(records: np.ndarray) -> np.ndarray:
+    """바이너리 로그 레코드의 수신 시각 (epoch ns, version 1 로그의 epoch seconds도 변환)"""
+    timestamps = records["timestamp"]
+    if timestamps.dtype.kind == "f":
+        return np.round(timestamps * 1e6).astype(np.int64) * 1000
+    return np.asarray(timestamps, dtype=np.int64)
+
+
+def format_csv_rows(rows: np.ndarray, timestamps) -> list:
+    """
+    (N, CSV_FIELD_COUNT) 배열을 CSV 로그 행 리스트로 변환
+    timestamps: 행별 epoch ns 정수 (같은 값이 연속되면 문자열 변환을 한 번만 수행, 보통 배치당 한 번)
+    """
+    floats = rows.tolist()
+    ints = rows.astype(np.int64).tolist()
+    times = np.broadcast_to(timestamps, (len(rows),)).tolist()
+
+    result = []
+    last_t, last_ts = None, ""
+    for t, f, i in zip(times, floats, ints):
+        if t != last_t:
+            last_t, last_ts = t, format_wall_ns(t)
+        # 스키마의 정수 필드(boot_time, sv, fault 등)는 정수로 기록
+        result.append(_format_row(last_ts, f, i))
+    return result
+
+
+# ===== 스트리밍 압축 =====
+# 압축은 파일에 쓰는 스레드(HandlerLog writer 스레드)에서 배치 단위로 수행
+# flush는 압축 블록을 닫아(gzip Z_SYNC_FLUSH / zstd FLUSH_BLOCK) 그 시점까지의 내용을 단독으로 풀 수 있게 함
+# -> 기록 중 비정상 종료되어도 마지막 flush까지는 읽힘
+LOG_COMPRESSIONS = {None: "", "gz": ".gz", "zst": ".zst"}
+GZIP_LEVEL = 6
+ZSTD_LEVEL = 3
+
+GZIP_MAGIC = b"\x1f\x8b"
+ZSTD_MAGIC = b"\x28\xb5\x2f\xfd"
+
+
+def _zstandard():
+    """zstd는 선택 의존성 (pip install zstandard)"""
+    try:
+        import zstandard
+    except ImportError:
+        raise ValueError("zst compression needs the 'zstandard' package (pip install zstandard)") from None
+    return zstandard
+
+
+def check_compression(compression: str):
+    """지원하는 압축 형식인지 확인 (zst는 zstandard 설치 여부까지), 아니면 ValueError"""
+    if compression not in LOG_COMPRESSIONS:
+        raise ValueError(f"Unknown log compression: {compression}")
+    if compression == "zst":
+        _zstandard()
+
+
+def detect_compression(path: str):
+    """파일 앞부분으로 압축 형식 판단 (None / "gz" / "zst")"""
+    with open(path, 'rb') as f:
+        magic = f.read(4)
+    if magic.startswith(GZIP_MAGIC):
+        return "gz"
+    if magic == ZSTD_MAGIC:
+        return "zst"
+    return None
+
+
+def open_log_input(path: str):
+    """로그 파일을 읽기용 바이너리 스트림으로 열기 (압축 파일은 스트리밍으로 해제)"""
+    compression = detect_compression(path)
+    if compression == "gz":
+        return gzip.open(path, 'rb')
+    if compression == "zst":
+        return _zstandard().ZstdDecompressor().stream_reader(open(path, 'rb'), closefd=True)
+    return open(path, 'rb')
+
+
+def log_is_calibrated(path: str) -> bool:
+    """VA/TC가 이미 보정된 CSV 로그인지 (LOG_CSV_CALIBRATED_HEADER), 바이너리 로그는 항상 원시값"""
+    with open_log_input(path) as f:
+        try:
+            line = f.readline(4096)
+        except EOFError:
+            return False
+    return f"va1{CALIBRATED_SUFFIX}".encode() in line.split(b",")
+
+
+class LogStream:
+    """로그 파일 출력 스트림 (compression: None / "gz" / "zst")"""
+
+    def __init__(self, path: str, compression: str = None):
+        check_compression(compression)
+        zstandard = _zstandard() if compression == "zst" else None
+        self.compression = compression
+        self.position = 0  # 압축 전 기준으로 쓴 바이트 수 (인덱스 바이트 위치)
+        self.raw = open(path, 'wb')
+        if compression == "gz":
+            self.stream = gzip.GzipFile(fileobj=self.raw, mode='wb', compresslevel=GZIP_LEVEL, mtime=0)
+        elif compression == "zst":
+            self.stream = zstandard.ZstdCompressor(level=ZSTD_LEVEL).stream_writer(self.raw, closefd=False)
+            self._flush_block = zstandard.FLUSH_BLOCK
+        else:
+            self.stream = self.raw
+
+    @property
+    def size(self) -> int:
+        """지금까지 파일에 쓴 바이트 수 (압축 후, 압축기 내부 버퍼는 제외)"""
+        return self.raw.tell()
+
+    def write(self, data: bytes):
+        self.stream.write(data)
+        self.position += len(data)
+
+    def flush(self):
+        if self.compression == "gz":
+            self.stream.flush()
+        elif self.compression == "zst":
+            self.stream.flush(self._flush_block)
+        self.raw.flush()
+
+    def sync(self):
+        """flush 후 OS 버퍼까지 디스크에 기록 (fsync)"""
+        self.flush()
+        os.fsync(self.raw.fileno())
+
+    def close(self):
+        if self.stream is not self.raw:
+            self.stream.close()
+        self.raw.close()
+
+
+class CsvLogWriter:
+    """기존 CSV 로그 형식 writer"""
+    extension = "csv"
+
+    def __init__(self, path: str, compression: str = None, header: list = LOG_CSV_HEADER):
+        self.file = LogStream(path, compression)
+        self._write_text([header])
+
+    def _write_text(self, rows: list):
+        buffer = io.StringIO()
+        csv.writer(buffer).writerows(rows)
+        self.file.write(buffer.getvalue().encode("utf-8"))
+
+    def write(self, rows: np.ndarray, timestamps, widen: bool = False):
+        """widen: float32로 수신한 배치면 True (widen_rows로 10진 표현 정리 후 기록)"""
+        if widen:
+            rows = widen_rows(rows)
+        self._write_text(format_csv_rows(rows, timestamps))
+
+    @property
+    def size(self) -> int:
+        return self.file.size
+
+    @property
+    def position(self) -> int:
+        return self.file.position
+
+    def flush(self):
+        self.file.flush()
+
+    def sync(self):
+        self.file.sync()
+
+    def close(self):
+        self.file.close()
+
+
+class BinaryLogWriter:
+    """고정 폭 레코드 바이너리 로그 writer"""
+    extension = "bin"
+
+    def __init__(self, path: str, compression: str = None):
+        self.file = LogStream(path, compression)
+        header = json.dumps({
+            "version": LOG_VERSION,
+            "dtype": LOG_RECORD_DTYPE.descr,
+        }).encode("utf-8")
+        self.file.write(LOG_MAGIC + len(header).to_bytes(4, "little") + header)
+
+    def write(self, rows: np.ndarray, timestamps, widen: bool = False):
+        """widen: 무시 (float32 값은 그대로 float32로 저장됨)"""
+        self.file.write(rows_to_records(rows, timestamps).tobytes())
+
+    @property
+    def size(self) -> int:
+        return self.file.size
+
+    @property
+    def position(self) -> int:
+        return self.file.position
+
+    def flush(self):
+        self.file.flush()
+
+    def sync(self):
+        self.file.sync()
+
+    def close(self):
+        self.file.close()
+
+
+LOG_WRITERS = {
+    "csv": CsvLogWriter,
+    "bin": BinaryLogWriter,
+}
+
+
+class SegmentedLogWriter:
+    """
+    한 소스의 로그를 세그먼트 파일로 나누어 기록 (HandlerLog writer 스레드에서 사용)
+    - segment_bytes(파일 크기) / segment_seconds(수신 시각 기준 길이) 중 먼저 도달하면 다음 파일로 넘어감
+    - 세그먼트마다 헤더를 새로 쓰므로 각 파일을 단독으로 읽고 재생할 수 있음
+    - 제한이 없으면 기존처럼 파일 하나 ({base}.csv), 있으면 {base}_000.csv, {base}_001.csv, ...
+    - segments: 세그먼트별 요약 (세션 manifest용), on_segment: 세그먼트를 열고 닫을 때 호출
+    - index_every: 지정하면 세그먼트를 닫을 때 sidecar 인덱스({파일}.idx.npz)도 기록 (utils.log_index)
+    """
+
+    def __init__(self, base_path: str, log_format: str = "csv", compression: str = None,
+                 segment_bytes: int = None, segment_seconds: float = None, sync_on_close: bool = False,
+                 on_segment=None, index_every: int = None):
+        self.base_path = base_path
+        self.writer_class = LOG_WRITERS[log_format]
+        self.compression = compression
+        self.segment_bytes = segment_bytes
+        self.segment_ns = int(segment_seconds * 1e9) if segment_seconds else None
+        self.sync_on_close = sync_on_close
+        self.on_segment = on_segment
+        self.index_every = index_every
+        self.index = None
+        self.segments = []
+        self.writer = None
+        self._open_segment()
+
+    @property
+    def segmented(self) -> bool:
+        return bool(self.segment_bytes or self.segment_ns)
+
+    def _open_segment(self):
+        suffix = f"_{len(self.segments):03d}" if self.segmented else ""
+        path = f"{self.base_path}{suffix}.{self.writer_class.extension}{LOG_COMPRESSIONS[self.compression]}"
+        self.writer = self.writer_class(path, self.compression)
+        self.path = path
+        if self.index_every:
+            self.index = LogIndexBuilder(self.index_every)
+        self.segments.append({
+            "file": os.path.basename(path),
+            "rows": 0,
+            "bytes": 0,
+            "first_boot_time": None,
+            "last_boot_time": None,
+            "start_ns": None,   # 첫 행 수신 시각 (epoch ns)
+            "end_ns": None,
+            "closed": False,
+            "index": None,
+        })
+        if self.on_segment:
+            self.on_segment()
+
+    def _close_segment(self):
+        if self.sync_on_close:
+            self.writer.sync()
+        self.writer.close()
+        segment = self.segments[-1]
+        segment["bytes"] = os.path.getsize(self.path)
+        segment["closed"] = True
+        self.writer = None
+        if self.index is not None:
+            segment["index"] = os.path.basename(self.index.save(self.path))
+            self.index = None
+
+    def write(self, rows: np.ndarray, timestamp: int, widen: bool = False):
+        """timestamp: 배치 수신 시각 (epoch ns), widen: float32로 수신한 배치 (CSV 기록 시 10진 표현 정리)"""
+        segment = self.segments[-1]
+        if segment["rows"] and (
+                (self.segment_bytes and self.writer.size >= self.segment_bytes)
+                or (self.segment_ns and timestamp - segment["start_ns"] >= self.segment_ns)):
+            self._close_segment()
+            self._open_segment()
+            segment = self.segments[-1]
+
+        if self.index is not None:
+            self.index.add(rows, self.writer.position, timestamp)
+        self.writer.write(rows, timestamp, widen)
+        if segment["rows"] == 0:
+            segment["first_boot_time"] = int(rows[0, 0])
+            segment["start_ns"] = int(timestamp)
+        segment["rows"] += len(rows)
+        segment["last_boot_time"] = int(rows[-1, 0])
+        segment["end_ns"] = int(timestamp)
+        segment["bytes"] = self.writer.size
+
+    def flush(self):
+        self.writer.flush()
+
+    def sync(self):
+        self.writer.sync()
+
+    def close(self):
+        if self.writer is not None:
+            self._close_segment()
+            if self.on_segment:
+                self.on_segment()
+
+
+def read_binary_header(f) -> np.dtype:
+    """바이너리 로그 헤더를 읽고 레코드 dtype 반환 (f는 헤더 바로 다음 위치가 됨)"""
+    if f.read(len(LOG_MAGIC)) != LOG_MAGIC:
+        raise ValueError(f"Not a GCS binary log: {getattr(f, 'name', f)}")
+    header_len = int.from_bytes(f.read(4), "little")
+    header = json.loads(f.read(header_len).decode("utf-8"))
+    return np.dtype([tuple(field) for field in header["dtype"]])
+
+
+def open_binary_log(path: str) -> np.ndarray:
+    """바이너리 로그를 memmap으로 열기 (파일 전체를 메모리에 올리지 않음, 비압축 파일만)"""
+    with open(path, 'rb') as f:
+        dtype = read_binary_header(f)
+        offset = f.tell()
+    count = (os.path.getsize(path) - offset) // dtype.itemsize
+    if count == 0:
+        return np.empty(0, dtype=dtype)
+    return np.memmap(path, dtype=dtype, mode='r', offset=offset, shape=(count,))
+
+
+def iter_binary_records(path: str, chunk_rows: int = 100000, start: int = 0):
+    """
+    바이너리 로그 레코드를 start 번째부터 chunk 단위로 순회 (압축 세그먼트 포함)
+    기록 중 끊긴 압축 파일은 마지막으로 완성된 레코드까지만 반환
+    """
+    if detect_compression(path) is None:
+        records = open_binary_log(path)
+        for begin in range(start, len(records), chunk_rows):
+            yield records[begin:begin + chunk_rows]
+        return
+
+    with open_log_input(path) as f:
+        dtype = read_binary_header(f)
+        size = chunk_rows * dtype.itemsize
+        tail = b""
+        skip = start * dtype.itemsize
+        while skip > 0:
+            # 압축 스트림은 임의 위치 접근이 안 되므로 해제만 하고 버림
+            try:
+                data = f.read(min(skip, 1 << 20))
+            except EOFError:
+                data = b""
+            if not data:
+                return
+            skip -= len(data)
+        while True:
+            try:
+                data = f.read(size)
+            except EOFError:
+                data = b""
+            if not data:
+                break
+            data = tail + data
+            count = len(data) // dtype.itemsize
+            tail = data[count * dtype.itemsize:]
+            if count:
+                yield np.frombuffer(data, dtype=dtype, count=count)
+
+
+def convert_binary_to_csv(src: str, dst: str = None, chunk_size: int = 100000) -> str:
+    """바이너리 로그를 기존 CSV 로그 형식으로 변환 (chunk 단위 처리)"""
+    if dst is None:
+        base = src
+        for extension in LOG_COMPRESSIONS.values():
+            if extension and base.endswith(extension):
+                base = base[:-len(extension)]
+        dst = os.path.splitext(base)[0] + ".csv"
+    writer = CsvLogWriter(dst)
+    try:
+        for chunk in iter_binary_records(src, chunk_size):
+            writer.write(records_to_rows(chunk), record_wall_ns(chunk))
+    finally:
+        writer.close()
+    return dst
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Convert GCS binary logs (.bin, .bin.gz, .bin.zst) to CSV")
+    parser.add_argument("files", nargs="+", help="binary log files")
+    args = parser.parse_args()
+    for path in args.files:
+        print(f"{path} -> {convert_binary_to_csv(path)}")
@@ -0,0 +1,238 @@
+import argparse
+import os
+import numpy as np
+
+from utils.clock import format_wall_ns
+from utils.telemetry_schema import FIELD_SLICES, FIELDS_BY_NAME
+
+# ===== 로그 sidecar 인덱스 =====
+# 세그먼트 파일마다 {파일 이름}.idx.npz
+# - checkpoints: 약 every 행마다 (행 번호, 바이트 위치, boot_time, 수신 시각) -> boot_time/시각으로 O(log n) 탐색
+#   바이트 위치는 압축 해제된 데이터 기준 (비압축 파일은 파일 위치와 같음)
+# - events: sv/mv/fault 상태가 바뀐 행 (mv는 HandlerButton과 같이 90도 기준 열림/닫힘)
+# HandlerLog는 세그먼트를 닫을 때 기록하고, 이전 로그나 비정상 종료된 세그먼트는
+# python -m utils.log_index logs/*.csv 로 나중에 만들 수 있음
+
+INDEX_VERSION = 1
+INDEX_SUFFIX = ".idx.npz"
+INDEX_EVERY_ROWS = 1000
+
+MV_OPEN_DEG = 90  # mv가 이 각도 이상이면 열림 (HandlerButton 색상 기준과 같음)
+EVENT_FIELDS = tuple(name for name in ("sv", "mv", "fault") if name in FIELDS_BY_NAME)
+
+CHECKPOINT_DTYPE = np.dtype([
+    ("row", "<i8"),
+    ("offset", "<i8"),
+    ("boot_time", "<i8"),
+    ("wall_ns", "<i8"),
+])
+EVENT_DTYPE = np.dtype([
+    ("row", "<i8"),
+    ("boot_time", "<i8"),
+    ("wall_ns", "<i8"),
+    ("field", "<U8"),
+    ("channel", "<i2"),   # 1부터 (sv3 -> 3, CSV 헤더와 같음)
+    ("old", "<i8"),
+    ("new", "<i8"),
+])
+
+
+def _event_columns():
+    """이벤트 판정 컬럼: (CSV 컬럼 번호, 필드 이름, 채널 번호)"""
+    columns = []
+    for name in EVENT_FIELDS:
+        col = FIELD_SLICES[name]
+        if isinstance(col, int):
+            columns.append((col, name, 1))
+        else:
+            columns.extend((c, name, i + 1) for i, c in enumerate(range(col.start, col.stop)))
+    return columns
+
+
+_EVENT_COLUMNS = _event_columns()
+_EVENT_COLS = np.array([col for col, _, _ in _EVENT_COLUMNS], dtype=np.intp)
+_EVENT_NAMES = np.array([name for _, name, _ in _EVENT_COLUMNS])
+_EVENT_CHANNELS = np.array([channel for _, _, channel in _EVENT_COLUMNS], dtype=np.int16)
+_EVENT_MV = _EVENT_NAMES == "mv"
+
+
+def event_states(rows: np.ndarray) -> np.ndarray:
+    """(N, CSV_FIELD_COUNT) -> 이벤트 컬럼 상태 (N, K) 정수 (mv는 0/1 열림 여부, NaN은 -1)"""
+    values = rows[:, _EVENT_COLS]
+    states = np.where(np.isnan(values), -1, values).astype(np.int64)
+    mv = values[:, _EVENT_MV]
+    states[:, _EVENT_MV] = np.where(np.isnan(mv), -1, mv >= MV_OPEN_DEG)
+    return states
+
+
+def find_transitions(states: np.ndarray, last_state: np.ndarray = None):
+    """
+    event_states 결과에서 상태가 바뀐 (행, 컬럼) 위치와 행별 이전 상태 반환
+    last_state: 이전 chunk의 마지막 상태 (1, K), 없으면 첫 행은 변화로 보지 않음
+    """
+    previous = np.vstack((states[:1] if last_state is None else last_state, states[:-1]))
+    changed_rows, changed_cols = np.nonzero(states != previous)
+    return changed_rows, changed_cols, previous
+
+
+def event_labels(cols: np.ndarray):
+    """이벤트 컬럼 번호 -> (필드 이름 배열, 채널 번호 배열)"""
+    return _EVENT_NAMES[cols], _EVENT_CHANNELS[cols]
+
+
+class LogIndexBuilder:
+    """
+    기록(또는 재구성)하는 순서대로 배치를 받아 인덱스를 만드는 클래스
+    - add(rows, offset, wall_ns): offset은 배치 첫 행의 바이트 위치
+      wall_ns는 배치 공통 수신 시각(epoch ns) 또는 배치 내 행 번호 배열 -> 시각 배열 함수
+    - checkpoint는 배치 경계에만 두므로 간격은 every 이상 (배치 크기만큼 차이)
+    """
+
+    def __init__(self, every: int = INDEX_EVERY_ROWS):
+        self.every = every
+        self.rows = 0
+        self.checkpoints = []
+        self.events = []
+        self.last_checkpoint = None
+        self.last_state = None
+
+    def add(self, rows: np.ndarray, offset: int, wall_ns):
+        if len(rows) == 0:
+            return
+        wall_of = wall_ns if callable(wall_ns) else (lambda idx: np.full(len(idx), wall_ns, dtype=np.int64))
+
+        if self.last_checkpoint is None or self.rows - self.last_checkpoint >= self.every:
+            self.checkpoints.append((self.rows, offset, int(rows[0, 0]), int(wall_of(np.zeros(1, np.intp))[0])))
+            self.last_checkpoint = self.rows
+
+        states = event_states(rows)
+        changed_rows, changed_cols, previous = find_transitions(states, self.last_state)
+        if len(changed_rows):
+            events = np.empty(len(changed_rows), dtype=EVENT_DTYPE)
+            events["row"] = self.rows + changed_rows
+            events["boot_time"] = rows[changed_rows, 0]
+            events["wall_ns"] = wall_of(changed_rows)
+            events["field"], events["channel"] = event_labels(changed_cols)
+            events["old"] = previous[changed_rows, changed_cols]
+            events["new"] = states[changed_rows, changed_cols]
+            self.events.append(events)
+
+        self.last_state = states[-1:]
+        self.rows += len(rows)
+
+    def build(self, log_file: str = "") -> "LogIndex":
+        checkpoints = np.array(self.checkpoints, dtype=CHECKPOINT_DTYPE)
+        events = np.concatenate(self.events) if self.events else np.empty(0, dtype=EVENT_DTYPE)
+        return LogIndex(checkpoints, events, rows=self.rows, every=self.every, log_file=log_file)
+
+    def save(self, log_path: str) -> str:
+        return self.build(os.path.basename(log_path)).save(index_path(log_path))
+
+
+def index_path(log_path: str) -> str:
+    return log_path + INDEX_SUFFIX
+
+
+class LogIndex:
+    """sidecar 인덱스 (checkpoints / events 구조체 배열)"""
+
+    def __init__(self, checkpoints: np.ndarray, events: np.ndarray, rows: int, every: int, log_file: str = ""):
+        self.checkpoints = checkpoints
+        self.events = events
+        self.rows = rows
+        self.every = every
+        self.log_file = log_file
+
+    def save(self, path: str) -> str:
+        # 임시 파일에 쓴 뒤 교체 (쓰는 도중 읽어도 이전 인덱스 또는 완성된 인덱스)
+        tmp_path = path + ".tmp"
+        with open(tmp_path, 'wb') as f:
+            np.savez(f, version=INDEX_VERSION, rows=self.rows, every=self.every, log_file=self.log_file,
+                     checkpoints=self.checkpoints, events=self.events)
+        os.replace(tmp_path, path)
+        return path
+
+    @classmethod
+    def load(cls, path: str) -> "LogIndex":
+        with np.load(path, allow_pickle=False) as data:
+            if int(data["version"]) != INDEX_VERSION:
+                raise ValueError(f"Unsupported log index version {int(data['version'])}: {path}")
+            return cls(data["checkpoints"], data["events"], int(data["rows"]), int(data["every"]),
+                       str(data["log_file"]))
+
+    def checkpoint_for_boot_time(self, boot_time: int):
+        """boot_time 이상인 첫 행 바로 앞의 checkpoint (없으면 None), boot_time이 단조 증가한다고 가정"""
+        i = int(np.searchsorted(self.checkpoints["boot_time"], boot_time)) - 1
+        return self.checkpoints[i] if i >= 0 else None
+
+    def checkpoint_for_wall_ns(self, wall_ns: int):
+        i = int(np.searchsorted(self.checkpoints["wall_ns"], wall_ns, side="right")) - 1
+        return self.checkpoints[i] if i >= 0 else None
+
+    def byte_range(self, boot_time: int, size: int):
+        """boot_time 행이 있을 수 있는 바이트 구간 [start, end) (checkpoint 사이)"""
+        times = self.checkpoints["boot_time"]
+        i = int(np.searchsorted(times, boot_time))
+        start = int(self.checkpoints["offset"][i - 1]) if i > 0 else None
+        end = int(self.checkpoints["offset"][i]) if i < len(times) else size
+        return start, end
+
+    def find_events(self, field: str = None, channel: int = None, new: int = None,
+                    start_boot_time: int = None, end_boot_time: int = None) -> np.ndarray:
+        """조건에 맞는 이벤트 (예: find_events("sv", 3, new=1) -> SV3가 열린 시점들)"""
+        events = self.events
+        mask = np.ones(len(events), dtype=bool)
+        if field is not None:
+            mask &= events["field"] == field
+        if channel is not None:
+            mask &= events["channel"] == channel
+        if new is not None:
+            mask &= events["new"] == new
+        if start_boot_time is not None:
+            mask &= events["boot_time"] >= start_boot_time
+        if end_boot_time is not None:
+            mask &= events["boot_time"] <= end_boot_time
+        return events[mask]
+
+
+def load_log_index(log_path: str):
+    """log_path의 sidecar 인덱스 (없거나 읽을 수 없으면 None)"""
+    path = index_path(log_path)
+    if not os.path.exists(path):
+        return None
+    try:
+        return LogIndex.load(path)
+    except (OSError, ValueError, KeyError):
+        return None
+
+
+def _parse_event_query(text: str):
+    """'sv3=1' / 'fault2' / 'mv' -> (field, channel, new)"""
+    name, _, new = text.partition("=")
+    field = name.rstrip("0123456789")
+    channel = name[len(field):]
+    return field, int(channel) if channel else None, int(new) if new else None
+
+
+if __name__ == "__main__":
+    from utils.log_reader import build_log_index
+
+    parser = argparse.ArgumentParser(description="Build or query sidecar indexes of GCS logs")
+    parser.add_argument("files", nargs="+", help="log files (.csv / .bin, optionally .gz / .zst)")
+    parser.add_argument("--every", type=int, default=INDEX_EVERY_ROWS, help="rows between checkpoints")
+    parser.add_argument("--force", action="store_true", help="rebuild even if an index already exists")
+    parser.add_argument("--find", metavar="EVENT", help="print matching events, e.g. sv3=1 (SV3 opened), fault2, mv")
+    args = parser.parse_args()
+
+    for path in args.files:
+        if path.endswith(INDEX_SUFFIX):
+            continue
+        index = None if args.force else load_log_index(path)
+        if index is None:
+            index = build_log_index(path, args.every)
+            print(f"{path} -> {index_path(path)}: {index.rows} rows, "
+                  f"{len(index.checkpoints)} checkpoints, {len(index.events)} events")
+        if args.find:
+            for event in index.find_events(*_parse_event_query(args.find)):
+                print(f"  {path}: {event['field']}{event['channel']} {event['old']} -> {event['new']} "
+                      f"at boot_time {event['boot_time']} ({format_wall_ns(event['wall_ns'])}), row {event['row']}")
@@ -0,0 +1,458 @@
+import mmap
+import os
+import numpy as np
+
+from utils.clock import parse_wall_ns
+from utils.data_types import CSV_FIELD_COUNT, integer_fields_valid, parse_csv_batch
+from utils.log_format import (LOG_MAGIC, LOG_RECORD_DTYPE, detect_compression, iter_binary_records, log_is_calibrated,
+                              open_binary_log, open_log_input, read_binary_header, record_wall_ns, records_to_rows)
+from utils.log_index import INDEX_EVERY_ROWS, LogIndexBuilder, load_log_index
+
+
+_DATA_COLUMNS = range(1, CSV_FIELD_COUNT + 1)
+
+
+def parse_log_block(block: bytes, timestamps: bool = False):
+    """
+    CSV 로그 데이터 행 묶음 -> ((N, CSV_FIELD_COUNT) 배열, 오류 행 수), 첫 컬럼(timestamp 문자열)은 제외
+    timestamps=True면 정상 행의 timestamp 문자열 목록도 함께 반환
+    - 정상 블록은 np.loadtxt(C 파서) 한 번으로 변환, 잘못된 행(정수 필드의 nan/소수 포함)이 있으면
+      parse_csv_batch로 다시 파싱해 걸러냄
+    """
+    lines = [line for line in block.decode("utf-8", errors="replace").splitlines() if line]
+    if not lines:
+        rows = np.empty((0, CSV_FIELD_COUNT), dtype=np.float64)
+        return (rows, 0, []) if timestamps else (rows, 0)
+    try:
+        rows = np.loadtxt(lines, delimiter=",", usecols=_DATA_COLUMNS, dtype=np.float64, ndmin=2)
+        if not integer_fields_valid(rows).all():
+            raise ValueError("non-integer value in integer field")
+        errors = 0
+    except ValueError:
+        bodies = [line[line.find(",") + 1:] for line in lines]
+        rows, errors = parse_csv_batch(bodies)
+        errors = len(errors)
+        if timestamps and errors:
+            lines = [line for line, body in zip(lines, bodies) if len(parse_csv_batch([body])[0])]
+    if not timestamps:
+        return rows, errors
+    return rows, errors, [line[:line.find(",")] for line in lines]
+
+
+class CsvLogReader:
+    """
+    HandlerLog CSV 로그를 mmap으로 열어 chunk 단위로 읽는 reader
+    - read(): 현재 위치부터 약 chunk_bytes 만큼의 완성된 행을 (N, CSV_FIELD_COUNT) 배열로 반환
+    - seek_boot_time(): 파일 전체를 읽지 않고 boot_time 기준 이진 탐색 (sidecar 인덱스가 있으면 checkpoint 사이만)
+    """
+
+    def __init__(self, path: str, chunk_bytes: int = 1 << 18):
+        self.path = path
+        self.chunk_bytes = chunk_bytes
+        self.file = open(path, 'rb')
+        size = os.path.getsize(path)
+        self.mm = mmap.mmap(self.file.fileno(), 0, access=mmap.ACCESS_READ) if size else b""
+        self.size = size
+
+        # 헤더 다음 줄부터 데이터
+        first_nl = self.mm.find(b"\n") if size else -1
+        self.data_start = first_nl + 1 if first_nl >= 0 else self.size
+        self.pos = self.data_start
+        self.parse_errors = 0
+        self.calibrated = log_is_calibrated(path)  # VA/TC가 이미 보정된 CSV (utils.log_export의 _cal.csv)
+        self.index = None  # utils.log_index.LogIndex (open_log_reader가 sidecar가 있으면 설정)
+
+    def close(self):
+        if self.size:
+            self.mm.close()
+        self.file.close()
+
+    @property
+    def eof(self) -> bool:
+        return self.pos >= self.size
+
+    def tell(self) -> int:
+        return self.pos
+
+    def rewind(self):
+        self.pos = self.data_start
+
+    def read(self) -> np.ndarray:
+        if self.eof:
+            return np.empty((0, CSV_FIELD_COUNT), dtype=np.float64)
+
+        end = min(self.pos + self.chunk_bytes, self.size)
+        if end < self.size:
+            nl = self.mm.rfind(b"\n", self.pos, end)
+            if nl < 0:
+                # 한 줄이 chunk보다 긴 경우 -> 다음 줄바꿈까지 확장
+                nl = self.mm.find(b"\n", end)
+                end = self.size if nl < 0 else nl + 1
+            else:
+                end = nl + 1
+        block = self.mm[self.pos:end]
+        self.pos = end
+        return self._parse_block(block)
+
+    def _parse_block(self, block: bytes) -> np.ndarray:
+        rows, errors = parse_log_block(block)
+        self.parse_errors += errors
+        return rows
+
+    def _boot_time_at(self, offset: int):
+        """
+        offset 이후에 시작하는 첫 (정상) 행의 (시작 위치, 다음 행 시작 위치, boot_time)
+        EOF면 boot_time은 None
+        """
+        if offset > self.data_start:
+            nl = self.mm.find(b"\n", offset - 1)
+            offset = self.size if nl < 0 else nl + 1
+        while offset < self.size:
+            nl = self.mm.find(b"\n", offset)
+            next_offset = self.size if nl < 0 else nl + 1
+            fields = self.mm[offset:next_offset].split(b",", 2)
+            try:
+                return offset, next_offset, int(float(fields[1]))
+            except (IndexError, ValueError):
+                offset = next_offset
+        return self.size, self.size, None
+
+    def seek_boot_time(self, boot_time: int):
+        """boot_time 이상인 첫 행으로 이동 (boot_time이 단조 증가한다고 가정, O(log n))"""
+        lo, hi = self.data_start, self.size
+        if self.index is not None:
+            start, hi = self.index.byte_range(boot_time, self.size)
+            lo = self.data_start if start is None else start
+        while lo < hi:
+            mid = (lo + hi) // 2
+            _, next_offset, value = self._boot_time_at(mid)
+            if value is None or value >= boot_time:
+                hi = mid
+            else:
+                lo = next_offset
+        self.pos = self._boot_time_at(lo)[0]
+
+
+class BinaryLogReader:
+    """HandlerLog 바이너리 로그(.bin)를 memmap으로 열어 chunk 단위로 읽는 reader"""
+
+    def __init__(self, path: str, chunk_rows: int = 4096):
+        self.path = path
+        self.chunk_rows = chunk_rows
+        self.records = open_binary_log(path)
+        self.pos = 0
+        self.parse_errors = 0
+        self.calibrated = False  # 바이너리 로그는 항상 원시값
+        self.index = None  # 고정 폭 레코드라 탐색에는 쓰지 않음 (이벤트 조회용)
+
+    def close(self):
+        self.records = None
+
+    @property
+    def eof(self) -> bool:
+        return self.pos >= len(self.records)
+
+    def tell(self) -> int:
+        return self.pos
+
+    def rewind(self):
+        self.pos = 0
+
+    def read(self) -> np.ndarray:
+        chunk = self.records[self.pos:self.pos + self.chunk_rows]
+        self.pos += len(chunk)
+        return records_to_rows(chunk)
+
+    def seek_boot_time(self, boot_time: int):
+        self.pos = int(np.searchsorted(self.records["boot_time"], boot_time))
+
+
+class StreamLogReader:
+    """
+    압축 세그먼트(.csv.gz / .bin.zst 등)를 스트리밍으로 해제하며 chunk 단위로 읽는 reader
+    - 임의 위치 접근이 안 되므로 seek_boot_time()은 순차 탐색
+      (sidecar 인덱스가 있으면 checkpoint까지는 파싱 없이 해제만 하고 건너뜀)
+    - 기록 중 끊긴 파일(비정상 종료)은 마지막 flush까지 완성된 행만 반환
+    """
+
+    def __init__(self, path: str, chunk_bytes: int = 1 << 18):
+        self.path = path
+        self.chunk_bytes = chunk_bytes
+        self.parse_errors = 0
+        self.calibrated = log_is_calibrated(path)
+        self.index = None
+        self.file = None
+        self.records = None
+        self.rewind()
+
+    def close(self):
+        if self.file is not None:
+            self.file.close()
+            self.file = None
+        self.records = None
+
+    @property
+    def eof(self) -> bool:
+        return self._eof and len(self.pending) == 0
+
+    def tell(self) -> int:
+        """지금까지 반환한 행 수"""
+        return self.pos
+
+    def rewind(self):
+        self.close()
+        self.pos = 0
+        self.pending = np.empty((0, CSV_FIELD_COUNT), dtype=np.float64)
+        self._eof = False
+        self.file = open_log_input(self.path)
+        head = self._read_raw(len(LOG_MAGIC))
+        self.binary = head == LOG_MAGIC
+        if self.binary:
+            self.file.close()
+            self.file = None
+            self.records = iter_binary_records(self.path, max(1, self.chunk_bytes // LOG_RECORD_DTYPE.itemsize))
+        self.tail = head
+        self.header = not self.binary  # CSV 헤더 줄을 아직 건너뛰지 않음
+
+    def _read_raw(self, size: int) -> bytes:
+        try:
+            return self.file.read(size)
+        except EOFError:
+            # 끝 표시 없이 끊긴 압축 스트림 -> 거기까지를 끝으로 봄
+            return b""
+
+    def _read_chunk(self) -> np.ndarray:
+        if self.binary:
+            chunk = next(self.records, None)
+            if chunk is None:
+                self._eof = True
+                return self.pending[:0]
+            return records_to_rows(chunk)
+
+        data = self._read_raw(self.chunk_bytes)
+        if not data:
+            # 마지막 줄에 줄바꿈이 없으면 기록 중 끊긴 행 -> 버림
+            self._eof = True
+            return self.pending[:0]
+        data = self.tail + data
+        if self.header:
+            nl = data.find(b"\n")
+            if nl < 0:
+                self.tail = data
+                return self.pending[:0]
+            data = data[nl + 1:]
+            self.header = False
+        nl = data.rfind(b"\n")
+        self.tail = data[nl + 1:]
+        rows, errors = parse_log_block(data[:nl + 1])
+        self.parse_errors += errors
+        return rows
+
+    def read(self) -> np.ndarray:
+        while not self._eof and len(self.pending) == 0:
+            self.pending = self._read_chunk()
+        rows, self.pending = self.pending, self.pending[:0]
+        self.pos += len(rows)
+        return rows
+
+    def _skip_to(self, checkpoint):
+        """checkpoint 행으로 이동 (rewind 직후에만 호출)"""
+        row, offset = int(checkpoint["row"]), int(checkpoint["offset"])
+        if self.binary:
+            self.records = iter_binary_records(self.path, max(1, self.chunk_bytes // LOG_RECORD_DTYPE.itemsize), row)
+        else:
+            remaining = offset - len(self.tail)
+            while remaining > 0:
+                data = self._read_raw(min(remaining, 1 << 20))
+                if not data:
+                    break
+                remaining -= len(data)
+            self.tail = b""
+            self.header = False
+        self.pos = row
+
+    def seek_boot_time(self, boot_time: int):
+        """boot_time 이상인 첫 행으로 이동"""
+        self.rewind()
+        checkpoint = self.index.checkpoint_for_boot_time(boot_time) if self.index is not None else None
+        if checkpoint is not None:
+            self._skip_to(checkpoint)
+        while not self._eof:
+            rows = self._read_chunk()
+            if len(rows) == 0:
+                continue
+            start = int(np.searchsorted(rows[:, 0], boot_time))
+            self.pos += start
+            if start < len(rows):
+                self.pending = rows[start:]
+                return
+
+
+def open_log_reader(path: str, chunk_bytes: int = 1 << 18):
+    """파일 내용으로 형식(CSV / 바이너리, 압축 여부)을 판단하여 reader 생성 (chunk_bytes: read() 한 번의 대략적인 크기)"""
+    if detect_compression(path):
+        reader = StreamLogReader(path, chunk_bytes)
+    else:
+        with open(path, 'rb') as f:
+            magic = f.read(len(LOG_MAGIC))
+        if magic == LOG_MAGIC:
+            reader = BinaryLogReader(path, max(1, chunk_bytes // LOG_RECORD_DTYPE.itemsize))
+        else:
+            reader = CsvLogReader(path, chunk_bytes)
+    reader.index = load_log_index(path)
+    return reader
+
+
+def read_window(path: str, start_boot_time: int, end_boot_time: int) -> np.ndarray:
+    """boot_time이 [start, end]인 행만 읽기 (seek 후 end를 넘을 때까지만 읽음)"""
+    reader = open_log_reader(path)
+    try:
+        reader.seek_boot_time(start_boot_time)
+        parts = []
+        while not reader.eof:
+            rows = reader.read()
+            if len(rows) and rows[-1, 0] > end_boot_time:
+                parts.append(rows[rows[:, 0] <= end_boot_time])
+                break
+            parts.append(rows)
+        return np.concatenate(parts) if parts else np.empty((0, CSV_FIELD_COUNT), dtype=np.float64)
+    finally:
+        reader.close()
+
+
+def _iter_csv_line_groups(f, group_rows: int, chunk_bytes: int = 1 << 20):
+    """CSV 로그 스트림 -> (첫 줄 바이트 위치, 줄 목록) 묶음 (헤더 제외, 줄바꿈 없는 마지막 줄은 버림)"""
+    offset = 0
+    tail = b""
+    header = True
+    group, group_offset = [], 0
+    while True:
+        try:
+            data = f.read(chunk_bytes)
+        except EOFError:
+            data = b""
+        if not data:
+            break
+        data = tail + data
+        end = data.rfind(b"\n") + 1
+        tail = data[end:]
+        position = offset
+        offset += end
+        for line in data[:end].splitlines(keepends=True):
+            if header:
+                header = False
+            elif line.strip():
+                if not group:
+                    group_offset = position
+                group.append(line)
+                if len(group) >= group_rows:
+                    yield group_offset, group
+                    group = []
+            position += len(line)
+    if group:
+        yield group_offset, group
+
+
+def build_log_index(path: str, every: int = INDEX_EVERY_ROWS):
+    """
+    기존 로그(또는 인덱스 없이 끝난 세그먼트)의 sidecar 인덱스를 만들어 저장 후 반환
+    checkpoint를 정확히 every 행마다 둠 (HandlerLog 기록 중에는 배치 경계)
+    """
+    builder = LogIndexBuilder(every)
+    with open_log_input(path) as f:
+        binary = f.read(len(LOG_MAGIC)) == LOG_MAGIC
+
+    if binary:
+        with open_log_input(path) as f:
+            read_binary_header(f)
+            data_start = f.tell()
+        row = 0
+        for chunk in iter_binary_records(path, every):
+            builder.add(records_to_rows(chunk), data_start + row * chunk.dtype.itemsize,
+                        lambda idx, chunk=chunk: record_wall_ns(chunk[idx]))
+            row += len(chunk)
+    else:
+        with open_log_input(path) as f:
+            for offset, lines in _iter_csv_line_groups(f, every):
+                block = b"".join(lines)
+                rows, errors = parse_log_block(block)
+                if errors:
+                    # 잘못된 행이 섞인 묶음: 정상 행의 timestamp만 남김
+                    lines = [line for line in lines if len(parse_log_block(line)[0])]
+                stamps = [line[:line.find(b",")].decode() for line in lines]
+                builder.add(rows, offset, lambda idx, stamps=stamps: np.array(
+                    [parse_wall_ns(stamps[i]) for i in idx], dtype=np.int64))
+    builder.save(path)
+    return builder.build(os.path.basename(path))
+
+
+def _iter_csv_blocks(f, chunk_bytes: int):
+    """CSV 로그 스트림 -> 완성된 줄로 끝나는 바이트 블록 (헤더 제외, 줄바꿈 없는 마지막 줄은 버림)"""
+    tail = b""
+    header = True
+    while True:
+        try:
+            data = f.read(chunk_bytes)
+        except EOFError:
+            data = b""
+        if not data:
+            break
+        data = tail + data
+        end = data.rfind(b"\n") + 1
+        tail = data[end:]
+        block = data[:end]
+        if header and end:
+            block = block[block.find(b"\n") + 1:]
+            header = False
+        if block:
+            yield block
+
+
+def iter_timed_chunks(path: str, chunk_bytes: int = 1 << 22, widen: bool = True, stats: dict = None):
+    """
+    로그 전체를 chunk 단위로 (rows, 행별 수신 시각 epoch ns) 순회 (CSV / 바이너리, 압축 세그먼트 모두)
+    CSV timestamp 문자열은 배치마다 같은 값이 반복되므로 서로 다른 문자열만 한 번씩 변환
+    widen: 바이너리 로그의 float32 값 변환 방식 (records_to_rows 참고)
+    stats: 지정하면 stats["parse_errors"]에 버린 행 수를 더함 (값이나 timestamp를 읽을 수 없는 행)
+    """
+    if stats is not None:
+        stats.setdefault("parse_errors", 0)
+    with open_log_input(path) as f:
+        binary = f.read(len(LOG_MAGIC)) == LOG_MAGIC
+    if binary:
+        for chunk in iter_binary_records(path, max(1, chunk_bytes // LOG_RECORD_DTYPE.itemsize)):
+            yield records_to_rows(chunk, widen), record_wall_ns(chunk)
+        return
+
+    cache = {}
+    with open_log_input(path) as f:
+        for block in _iter_csv_blocks(f, chunk_bytes):
+            rows, errors, stamps = parse_log_block(block, timestamps=True)
+            if len(rows) == 0:
+                if stats is not None:
+                    stats["parse_errors"] += errors
+                continue
+            unique, inverse = np.unique(np.array(stamps), return_inverse=True)
+            wall = np.empty(len(unique), dtype=np.int64)
+            valid = np.ones(len(unique), dtype=bool)
+            for i, text in enumerate(unique.tolist()):
+                if text not in cache:
+                    if len(cache) > 4096:
+                        cache.clear()
+                    try:
+                        cache[text] = parse_wall_ns(text)
+                    except ValueError:
+                        cache[text] = None  # 깨진 timestamp: 해당 행은 버림
+                if cache[text] is None:
+                    valid[i] = False
+                else:
+                    wall[i] = cache[text]
+            inverse = inverse.reshape(-1)
+            if not valid.all():
+                keep = valid[inverse]
+                errors += int(len(keep) - keep.sum())
+                rows, inverse = rows[keep], inverse[keep]
+            if stats is not None:
+                stats["parse_errors"] += errors
+            if len(rows):
+                yield rows, wall[inverse]
@@ -0,0 +1,110 @@
+from binascii import crc_hqx
+from typing import List
+import numpy as np
+
+from utils.data_types import DataVehicle, CSV_FIELD_COUNT, CSV_FIELD_SLICES, vehicle_to_row
+from utils.telemetry_schema import record_dtype
+
+
+# ===== 바이너리 프레임 구조 =====
+# | SYNC(2) 0xAA 0x55 | LEN(1) | PAYLOAD(LEN) | CRC16(2, LE) |
+# - CRC16 : CRC-16/XMODEM (poly 0x1021, init 0x0000), LEN + PAYLOAD 대상
+# - PAYLOAD : 텔레메트리 스키마(utils/telemetry_schema.py) 순서의 little-endian 고정 레이아웃
+FRAME_SYNC = b"\xAA\x55"
+
+PAYLOAD_DTYPE = record_dtype("wire")
+PAYLOAD_SIZE = PAYLOAD_DTYPE.itemsize
+FRAME_SIZE = len(FRAME_SYNC) + 1 + PAYLOAD_SIZE + 2
+
+
+def payloads_to_rows(payloads: bytes) -> np.ndarray:
+    """
+    연속된 payload 바이트를 parse_csv_batch와 같은 (N, CSV_FIELD_COUNT) float64 배열로 변환
+    float32 값은 그대로 float64로 변환 (10진 표현 정리는 CSV 로그 writer 스레드에서 widen_rows로 수행)
+    """
+    records = np.frombuffer(payloads, dtype=PAYLOAD_DTYPE)
+    rows = np.empty((len(records), CSV_FIELD_COUNT), dtype=np.float64)
+    for name, col in CSV_FIELD_SLICES.items():
+        rows[:, col] = records[name]
+    return rows
+
+
+def encode_rows(rows: np.ndarray) -> bytes:
+    """(N, CSV_FIELD_COUNT) 배열을 바이너리 프레임들로 인코딩 (시뮬레이터/테스트용)"""
+    records = np.zeros(len(rows), dtype=PAYLOAD_DTYPE)
+    for name, col in CSV_FIELD_SLICES.items():
+        records[name] = rows[:, col]
+    frames = []
+    for record in records:
+        body = bytes([PAYLOAD_SIZE]) + record.tobytes()
+        frames.append(FRAME_SYNC + body + crc_hqx(body, 0).to_bytes(2, "little"))
+    return b"".join(frames)
+
+
+def encode_vehicle(data: DataVehicle) -> bytes:
+    """DataVehicle 한 개를 바이너리 프레임으로 인코딩"""
+    return encode_rows(vehicle_to_row(data))
+
+
+def find_frame(buffer: bytes) -> bool:
+    """버퍼 안에 CRC가 맞는 완전한 프레임이 하나라도 있는지 확인 (프로토콜 자동 감지용)"""
+    start = buffer.find(FRAME_SYNC)
+    while 0 <= start <= len(buffer) - FRAME_SIZE:
+        body = buffer[start + 2:start + 3 + PAYLOAD_SIZE]
+        crc = int.from_bytes(buffer[start + 3 + PAYLOAD_SIZE:start + FRAME_SIZE], "little")
+        if body[0] == PAYLOAD_SIZE and crc_hqx(body, 0) == crc:
+            return True
+        start = buffer.find(FRAME_SYNC, start + 1)
+    return False
+
+
+class BinaryFrameDecoder:
+    """
+    바이트 스트림에서 프레임을 찾아 payload를 모은 뒤 한 번에 frombuffer로 디코딩
+    - crc_errors : CRC 불일치로 버린 프레임 수
+    - resyncs    : SYNC를 다시 찾기 위해 바이트를 건너뛴 횟수
+    """
+
+    def __init__(self):
+        self.buffer = b""
+        self.frames_ok = 0
+        self.crc_errors = 0
+        self.resyncs = 0
+        self.bytes_skipped = 0
+
+    def reset(self):
+        self.buffer = b""
+
+    def feed(self, data: bytes) -> np.ndarray:
+        buffer = self.buffer + data
+        payloads: List[bytes] = []
+        pos = 0
+        end = len(buffer)
+
+        while end - pos >= FRAME_SIZE:
+            if buffer[pos:pos + 2] != FRAME_SYNC:
+                nxt = buffer.find(FRAME_SYNC, pos + 1)
+                if nxt < 0:
+                    # 마지막 1바이트는 SYNC의 앞부분일 수 있으므로 남겨둠
+                    nxt = end - 1
+                self.resyncs += 1
+                self.bytes_skipped += nxt - pos
+                pos = nxt
+                continue
+
+            body = buffer[pos + 2:pos + 3 + PAYLOAD_SIZE]
+            crc = int.from_bytes(buffer[pos + 3 + PAYLOAD_SIZE:pos + FRAME_SIZE], "little")
+            if body[0] != PAYLOAD_SIZE or crc_hqx(body, 0) != crc:
+                # 손상된 프레임 -> SYNC 다음 바이트부터 다시 탐색
+                self.crc_errors += 1
+                pos += 1
+                continue
+
+            payloads.append(body[1:])
+            pos += FRAME_SIZE
+
+        self.buffer = buffer[pos:]
+        self.frames_ok += len(payloads)
+        if not payloads:
+            return np.empty((0, CSV_FIELD_COUNT), dtype=np.float64)
+        return payloads_to_rows(b"".join(payloads))
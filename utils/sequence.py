@@ -0,0 +1,186 @@
+import operator
+import re
+import numpy as np
+
+from utils.data_types import CSV_FIELD_SLICES
+
+# GCS 측 타이밍 시퀀스 스크립트 (*.seq)
+#
+#   # 주석
+#   T+0.000   SV 1 1                      솔레노이드 밸브 1 열기 (번호는 UI와 같은 1부터)
+#   T+0.250   MV 2 180                    메인 밸브 2를 180도로
+#   T+0.500   HOLD TC1 > 800 TIMEOUT 3    TC1이 800을 넘을 때까지 대기 (이후 단계는 대기 시간만큼 밀림)
+#   T+0.500   HOLD VA3.CAL >= 12.5        .CAL: 보정값(A * raw + B) 기준, TIMEOUT 생략 시 무한 대기
+#   T+1.000   SEQ IGNITE                  펌웨어 SEQ 명령 그대로 전송
+#   ABORT     SV 1 0                      중단(HOLD 타임아웃/수동 중지) 시 즉시 전송할 명령
+#
+# 같은 시각의 단계는 파일 순서대로 실행
+
+COMPARATORS = {
+    "<": operator.lt,
+    "<=": operator.le,
+    ">": operator.gt,
+    ">=": operator.ge,
+    "==": operator.eq,
+    "!=": operator.ne,
+}
+
+# 조건에 쓸 수 있는 필드: 이름 -> (CSV_FIELD_SLICES 키, 채널 수)
+CONDITION_FIELDS = {
+    "TEMP": ("temp", 1),
+    "VOLTAGE": ("voltage", 1),
+    "SV": ("sv", 8),
+    "MV": ("mv", 4),
+    "VA": ("va", 8),
+    "TC": ("tc", 6),
+    "IR": ("ir", 1),
+    "IP": ("ip", 1),
+    "IY": ("iy", 1),
+}
+
+_STEP_RE = re.compile(r"^T\+(\d+(?:\.\d*)?)\s+(.*)$", re.IGNORECASE)
+_CONDITION_RE = re.compile(
+    r"^([A-Z]+)(\d*)(\.CAL)?\s*(<=|>=|==|!=|<|>)\s*(-?\d+(?:\.\d*)?)(?:\s+TIMEOUT\s+(\d+(?:\.\d*)?))?$",
+    re.IGNORECASE)
+
+
+class HoldCondition:
+    """텔레메트리 대기 조건 (예: TC1 > 800)"""
+
+    def __init__(self, field: str, channel: int, calibrated: bool, op: str, threshold: float, timeout: float = None):
+        self.field = field            # CONDITION_FIELDS 키 (대문자)
+        self.channel = channel        # 0부터
+        self.calibrated = calibrated
+        self.op = op
+        self.threshold = threshold
+        self.timeout = timeout
+
+        key, _ = CONDITION_FIELDS[field]
+        column = CSV_FIELD_SLICES[key]
+        self.column = column.start + channel if isinstance(column, slice) else column
+
+    def values(self, rows, calibration=None) -> np.ndarray:
+        """rows (N x CSV_FIELD_COUNT)에서 조건 대상 값 배열"""
+        values = rows[:, self.column]
+        if self.calibrated and calibration is not None:
+            if self.field == "VA":
+                values = values * calibration.va_a[self.channel] + calibration.va_b[self.channel]
+            elif self.field == "TC":
+                values = values * calibration.tc_a[self.channel] + calibration.tc_b[self.channel]
+        return values
+
+    def satisfied(self, rows, calibration=None) -> bool:
+        """배치 중 한 행이라도 조건을 만족하면 True"""
+        return bool(COMPARATORS[self.op](self.values(rows, calibration), self.threshold).any())
+
+    def describe(self) -> str:
+        channel = f"{self.channel + 1}" if CONDITION_FIELDS[self.field][1] > 1 else ""
+        text = f"{self.field}{channel}{'.CAL' if self.calibrated else ''} {self.op} {self.threshold:g}"
+        return text if self.timeout is None else f"{text} (timeout {self.timeout:g} s)"
+
+
+class SequenceStep:
+    __slots__ = ("offset", "kind", "idx", "value", "condition", "line_no")
+
+    def __init__(self, offset: float, kind: str, idx: int = 0, value=None, condition: HoldCondition = None,
+                 line_no: int = 0):
+        self.offset = offset        # T+ 초
+        self.kind = kind            # "SV" / "MV" / "SEQ" / "HOLD"
+        self.idx = idx              # 밸브 번호 (0부터)
+        self.value = value
+        self.condition = condition
+        self.line_no = line_no
+
+    def command(self):
+        """(kind, idx, value) 텔레커맨드, HOLD이면 None"""
+        return None if self.kind == "HOLD" else (self.kind, self.idx, self.value)
+
+    def describe(self) -> str:
+        if self.kind == "HOLD":
+            return f"HOLD {self.condition.describe()}"
+        if self.kind == "SEQ":
+            return f"SEQ {self.value}"
+        return f"{self.kind}{self.idx + 1}={self.value}"
+
+
+class Sequence:
+    def __init__(self, steps: list, abort_steps: list, name: str = ""):
+        self.steps = steps
+        self.abort_steps = abort_steps
+        self.name = name
+
+    @property
+    def duration(self) -> float:
+        """HOLD 대기를 제외한 계획 길이 (초)"""
+        return self.steps[-1].offset if self.steps else 0.0
+
+
+def _parse_action(text: str, offset: float, line_no: int) -> SequenceStep:
+    parts = text.split(None, 1)
+    kind = parts[0].upper()
+    args = parts[1].strip() if len(parts) > 1 else ""
+
+    if kind in ("SV", "MV"):
+        fields = args.split()
+        if len(fields) != 2:
+            raise ValueError(f"line {line_no}: expected '{kind} <number> <value>'")
+        number, value = int(fields[0]), int(float(fields[1]))
+        limit = CONDITION_FIELDS[kind][1]
+        if not 1 <= number <= limit:
+            raise ValueError(f"line {line_no}: {kind} number must be 1..{limit}")
+        if kind == "SV" and value not in (0, 1):
+            raise ValueError(f"line {line_no}: SV value must be 0 or 1")
+        return SequenceStep(offset, kind, number - 1, value, line_no=line_no)
+
+    if kind == "SEQ":
+        if not args:
+            raise ValueError(f"line {line_no}: SEQ needs a value")
+        return SequenceStep(offset, "SEQ", 0, args, line_no=line_no)
+
+    if kind == "HOLD":
+        match = _CONDITION_RE.match(args)
+        if not match:
+            raise ValueError(f"line {line_no}: expected 'HOLD <FIELD><n> <op> <value> [TIMEOUT <s>]'")
+        field, number, cal, op, threshold, timeout = match.groups()
+        field = field.upper()
+        if field not in CONDITION_FIELDS:
+            raise ValueError(f"line {line_no}: unknown field {field}")
+        channels = CONDITION_FIELDS[field][1]
+        number = int(number) if number else 1
+        if not 1 <= number <= channels:
+            raise ValueError(f"line {line_no}: {field} channel must be 1..{channels}")
+        condition = HoldCondition(field, number - 1, bool(cal), op, float(threshold),
+                                  float(timeout) if timeout else None)
+        return SequenceStep(offset, "HOLD", condition=condition, line_no=line_no)
+
+    raise ValueError(f"line {line_no}: unknown action {kind}")
+
+
+def parse_sequence(text: str, name: str = "") -> Sequence:
+    """스크립트 문자열을 Sequence로 변환 (문법 오류는 줄 번호와 함께 ValueError)"""
+    steps = []
+    abort_steps = []
+    for line_no, line in enumerate(text.splitlines(), start=1):
+        line = line.split("#", 1)[0].strip()
+        if not line:
+            continue
+        if line.upper().startswith("ABORT"):
+            abort_steps.append(_parse_action(line[5:].strip(), 0.0, line_no))
+            if abort_steps[-1].kind == "HOLD":
+                raise ValueError(f"line {line_no}: HOLD is not allowed in ABORT steps")
+            continue
+        match = _STEP_RE.match(line)
+        if not match:
+            raise ValueError(f"line {line_no}: expected 'T+<seconds> <action>' or 'ABORT <action>'")
+        steps.append(_parse_action(match.group(2), float(match.group(1)), line_no))
+
+    if not steps:
+        raise ValueError("sequence has no steps")
+    # 같은 시각은 파일 순서 유지 (stable sort)
+    steps.sort(key=lambda step: step.offset)
+    return Sequence(steps, abort_steps, name)
+
+
+def load_sequence(path: str) -> Sequence:
+    with open(path, "r", encoding="utf-8") as f:
+        return parse_sequence(f.read(), name=path)
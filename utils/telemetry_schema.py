@@ -0,0 +1,119 @@
+from typing import NamedTuple
+import numpy as np
+
+# ===== 텔레메트리 스키마 =====
+# 기체가 보내는 한 패킷의 필드 정의 (CSV 컬럼 순서 = 바이너리 payload 순서 = 이 목록 순서)
+# DataVehicle, CSV 컬럼 위치, 로그 헤더, 바이너리 프레임/로그 dtype, history 컬럼, 라벨이 모두 여기서 만들어짐
+# 필드를 추가/활성화하면 기체 펌웨어의 CSV/바이너리 출력도 같은 순서로 맞춰야 함
+
+
+class TelemetryField(NamedTuple):
+    name: str
+    kind: str                 # "int" / "float" (CSV 로그에 정수로 쓸지, DataVehicle에서 int로 변환할지)
+    count: int = 1            # 1이면 스칼라, 그 외에는 채널 배열 (sv1..sv8)
+    unit: str = ""
+    wire: str = "<f4"         # 바이너리 프레임 payload dtype
+    log: str = None           # 바이너리 로그 레코드 dtype (None이면 wire와 같음)
+    history: str = "<f8"      # DataHistory 컬럼 dtype
+    default: float = 0.0      # DataVehicle 기본값
+    label: str = None         # 표시 라벨 이름 (HandlerLabelGroup, 예: LB_PNID_VA -> LB_PNID_VA_1_RAW)
+    fmt: str = "{:.2f}"       # 라벨 표시 포맷
+    enabled: bool = True      # False면 모든 형식에서 제외 (기체가 아직 보내지 않는 필드)
+
+
+TELEMETRY_SCHEMA = (
+    TelemetryField("boot_time", "int",   unit="ms", wire="<u4", log="<i8", history="<i8"),
+    TelemetryField("temp",      "float", unit="degC"),
+    TelemetryField("voltage",   "float", unit="V"),
+    TelemetryField("sv",        "int",   8, wire="<i1", history="<i4", default=-1),
+    TelemetryField("mv",        "float", 4, unit="deg", default=-1.0),
+    TelemetryField("va",        "float", 8, default=-1.0, label="LB_PNID_VA"),
+    TelemetryField("tc",        "float", 6, default=-1.0, label="LB_PNID_TC"),
+    TelemetryField("ir",        "float", unit="deg"),
+    TelemetryField("ip",        "float", unit="deg"),
+    TelemetryField("iy",        "float", unit="deg"),
+    TelemetryField("fault",     "int",   5, wire="<i1", history="<i4", default=-1),
+
+    # IMU 자이로/가속도, GPS (기체 펌웨어 출력이 준비되면 enabled=True)
+    TelemetryField("igx", "float", unit="deg/s", enabled=False),
+    TelemetryField("igy", "float", unit="deg/s", enabled=False),
+    TelemetryField("igz", "float", unit="deg/s", enabled=False),
+    TelemetryField("iax", "float", unit="g", enabled=False),
+    TelemetryField("iay", "float", unit="g", enabled=False),
+    TelemetryField("iaz", "float", unit="g", enabled=False),
+    TelemetryField("gps_fix_type", "int", wire="<u1", history="<i4", enabled=False),
+    TelemetryField("gps_sat",      "int", wire="<u1", history="<i4", enabled=False),
+    TelemetryField("gps_time",     "float", unit="hhmmss.ss", wire="<f8", enabled=False),  # UTC hhmmss.ss
+    TelemetryField("gps_lat",      "float", unit="deg", wire="<f8", enabled=False),
+    TelemetryField("gps_lon",      "float", unit="deg", wire="<f8", enabled=False),
+    TelemetryField("gps_alt",      "float", unit="m", enabled=False),
+)
+
+FIELDS = tuple(field for field in TELEMETRY_SCHEMA if field.enabled)
+FIELDS_BY_NAME = {field.name: field for field in FIELDS}
+
+
+def _layout(fields):
+    """필드별 CSV 컬럼 위치 (스칼라는 int, 배열은 slice)와 전체 컬럼 수"""
+    slices = {}
+    col = 0
+    for field in fields:
+        slices[field.name] = col if field.count == 1 else slice(col, col + field.count)
+        col += field.count
+    return slices, col
+
+
+FIELD_SLICES, FIELD_COUNT = _layout(FIELDS)
+
+# 컬럼별 정수 여부 (CSV 로그에 정수로 기록할 컬럼)
+INT_COLUMNS = np.array([field.kind == "int" for field in FIELDS for _ in range(field.count)])
+
+
+def column_names(fields=FIELDS) -> list:
+    """CSV 로그 헤더용 컬럼 이름 (배열 필드는 sv1..sv8처럼 채널 번호를 붙임)"""
+    names = []
+    for field in fields:
+        if field.count == 1:
+            names.append(field.name)
+        else:
+            names.extend(f"{field.name}{i + 1}" for i in range(field.count))
+    return names
+
+
+def record_dtype(attr: str, fields=FIELDS, prefix=()) -> np.dtype:
+    """필드별 attr("wire" / "log") dtype으로 구조체 dtype 생성 (prefix: 앞에 붙일 (이름, dtype) 목록)"""
+    items = list(prefix)
+    for field in fields:
+        dtype = getattr(field, attr) or field.wire
+        items.append((field.name, dtype) if field.count == 1 else (field.name, dtype, (field.count,)))
+    return np.dtype(items)
+
+
+def history_fields(fields=FIELDS) -> dict:
+    """DataHistory 컬럼 정의: 필드 이름 -> (dtype, 폭)"""
+    return {field.name: (np.dtype(field.history).type, field.count) for field in fields}
+
+
+# ===== 코드 생성 =====
+# 스키마를 매 패킷마다 해석하지 않도록, 시작 시 한 번 필드가 풀어 쓰인 함수를 만들어 사용
+# (collections.namedtuple / dataclasses와 같은 방식)
+
+def format_row_source(name: str, fields=FIELDS) -> str:
+    """
+    CSV 로그 한 행을 만드는 함수 소스: (timestamp 문자열, float 리스트, int 리스트) -> 행 리스트
+    정수/실수 컬럼이 연속된 구간끼리 묶어 slice 몇 번으로 이어 붙임
+    """
+    ints = [field.kind == "int" for field in fields for _ in range(field.count)]
+    parts = ["[ts]"]
+    start = 0
+    for col in range(1, len(ints) + 1):
+        if col == len(ints) or ints[col] != ints[start]:
+            parts.append(f"{'i' if ints[start] else 'f'}[{start}:{col}]")
+            start = col
+    return f"def {name}(ts, f, i):\n    return {' + '.join(parts)}"
+
+
+def build_function(source: str, name: str, namespace: dict):
+    """생성된 소스를 namespace 안에서 실행해 함수 객체 반환"""
+    exec(compile(source, f"<telemetry_schema {name}>", "exec"), namespace)
+    return namespace[name]